@@ -0,0 +1,58 @@
+"""Benchmark ParallelExecutor scaling from 1 to N workers.
+
+Times per-row statistical_analysis and per-signal rfft over a stack of
+independent signals with thread and process pools. Process pools pass
+inputs and outputs through shared memory. Run from the repository root:
+
+    python -m benchmarks.bench_parallel --rows 20000 --length 4096
+"""
+import argparse
+import functools
+import os
+import time
+import numpy as np
+from src.data_processing.numpy_utils import NumpyProcessor
+from src.data_processing.parallel import ParallelExecutor
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--length', type=int, default=4096)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    signals = np.random.default_rng(0).standard_normal((args.rows, args.length))
+    workloads = {
+        'statistics': lambda ex: NumpyProcessor.statistical_analysis(signals, axis=1, executor=ex),
+        'rfft': lambda ex: NumpyProcessor.complex_transformations(
+            signals, ['rfft'], axis=1, executor=ex
+        ),
+    }
+    counts = sorted({1, *range(2, args.max_workers + 1, 2), args.max_workers})
+
+    print(f"{args.rows}x{args.length} float64, {os.cpu_count()} CPUs")
+    print(f"{'workload':>10} {'kind':>8} {'workers':>7} {'seconds':>8} {'speedup':>8}")
+    for name, run in workloads.items():
+        baseline = best_of(lambda: run(None), args.repeat)
+        print(f"{name:>10} {'serial':>8} {1:>7} {baseline:>8.3f} {1.0:>7.2f}x")
+        for kind in ('thread', 'process'):
+            for workers in counts:
+                with ParallelExecutor(workers=workers, kind=kind) as executor:
+                    run(executor)  # start the pool outside the timing
+                    elapsed = best_of(functools.partial(run, executor), args.repeat)
+                print(f"{name:>10} {kind:>8} {workers:>7} {elapsed:>8.3f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark NumpyProcessor.statistical_analysis on tall and wide matrices.
+
+Compares the fused moment pass (float64 and float32 accumulation) with the
+previous implementation, which looped over rows in Python to compute
+skewness. Run from the repository root:
+
+    python -m benchmarks.bench_statistical_analysis --repeat 5
+"""
+import argparse
+import time
+from typing import Callable, Dict
+import numpy as np
+from src.data_processing.numpy_utils import NumpyProcessor
+
+SHAPES = {
+    'tall': (1_000_000, 8),
+    'square': (2_000, 2_000),
+    'wide': (8, 1_000_000),
+    'medium': (20_000, 200),
+}
+
+
+def legacy_statistical_analysis(arr: np.ndarray, axis=None) -> Dict[str, np.ndarray]:
+    """The pre-vectorization implementation, kept for comparison."""
+    return {
+        "mean": np.mean(arr, axis=axis),
+        "std": np.std(arr, axis=axis),
+        "percentiles": np.percentile(arr, [25, 50, 75], axis=axis),
+        "skewness": (
+            np.array([
+                np.sum((x - np.mean(x)) ** 3) / (len(x) * np.std(x) ** 3)
+                for x in np.atleast_2d(arr)
+            ])
+            if axis is not None
+            else None
+        ),
+    }
+
+
+def best_of(func: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'shape':>18} {'axis':>4} {'legacy':>9} {'fused64':>9} {'fused32':>9} {'speedup':>8}")
+    for name, shape in SHAPES.items():
+        arr = rng.standard_normal(shape)
+        arr32 = arr.astype(np.float32)
+        # The legacy skewness always iterated over rows, i.e. axis=1.
+        legacy = best_of(lambda: legacy_statistical_analysis(arr, axis=1), args.repeat)
+        fused = best_of(lambda: NumpyProcessor.statistical_analysis(arr, axis=1), args.repeat)
+        fused32 = best_of(
+            lambda: NumpyProcessor.statistical_analysis(arr32, axis=1, dtype=np.float32),
+            args.repeat
+        )
+        label = f"{name} {shape[0]}x{shape[1]}"
+        print(f"{label:>18} {1:>4} {legacy:>9.4f} {fused:>9.4f} {fused32:>9.4f} {legacy / fused:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
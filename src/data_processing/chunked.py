@@ -0,0 +1,167 @@
+import os
+import numpy as np
+from typing import Callable, Dict, Iterator, Optional, Sequence, Tuple, Union
+from .streaming_stats import StreamingStats
+
+ArraySource = Union[np.ndarray, str, os.PathLike]
+OutputTarget = Optional[Union[np.ndarray, str, os.PathLike]]
+
+
+class ChunkedProcessor:
+    """Out-of-core counterparts of NumpyProcessor operations.
+
+    Inputs are arrays, memmaps or ``.npy`` paths (opened memory-mapped);
+    they are walked in blocks of whole rows sized so that a block, its
+    result and NumPy's temporaries fit in ``memory_budget`` bytes. Results go
+    to ``out``: an existing array or memmap, a path for a new ``.npy``
+    memmap, or None for an in-memory array. Operations along axis 0 carry
+    state across blocks (a running total for cumsum, halo rows for
+    gradient); row-wise work needs none.
+    """
+
+    # Input block, output block and one temporary of the same size.
+    BUFFERS = 3
+    # float64 arrays of a block alive at once while StreamingStats folds it
+    # in: the concatenated, sorted and bucketed centroids and samples.
+    STATS_BUFFERS = 8
+
+    def __init__(self, memory_budget: int = 256 * 2 ** 20):
+        if memory_budget < 1:
+            raise ValueError("memory_budget must be positive")
+        self.memory_budget = memory_budget
+
+    @staticmethod
+    def open(source: ArraySource) -> np.ndarray:
+        """Return source as an array, memory-mapping ``.npy`` paths read-only."""
+        if isinstance(source, (str, os.PathLike)):
+            return np.load(source, mmap_mode='r')
+        return source if isinstance(source, np.ndarray) else np.asarray(source)
+
+    def chunk_rows(self, arr: np.ndarray, itemsize: Optional[int] = None) -> int:
+        """Rows per block for arr under the memory budget."""
+        row_items = int(np.prod(arr.shape[1:], dtype=np.int64)) or 1
+        row_bytes = row_items * max(arr.dtype.itemsize, itemsize or 0)
+        return max(1, self.memory_budget // (self.BUFFERS * row_bytes))
+
+    def blocks(self, arr: np.ndarray, itemsize: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+        """Yield ``(start, stop)`` row ranges covering arr."""
+        step = self.chunk_rows(arr, itemsize)
+        for start in range(0, arr.shape[0], step):
+            yield start, min(start + step, arr.shape[0])
+
+    @staticmethod
+    def _output(out: OutputTarget, shape: Tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+        if out is None:
+            return np.empty(shape, dtype=dtype)
+        if isinstance(out, (str, os.PathLike)):
+            return np.lib.format.open_memmap(out, mode='w+', dtype=dtype, shape=shape)
+        if out.shape != shape:
+            raise ValueError(f"Output has shape {out.shape}, expected {shape}")
+        return out
+
+    @staticmethod
+    def _finish(result: np.ndarray) -> np.ndarray:
+        if isinstance(result, np.memmap):
+            result.flush()
+        return result
+
+    def cumsum(self, source: ArraySource, axis: int = 0, out: OutputTarget = None) -> np.ndarray:
+        """Cumulative sum along axis, carrying the running total between blocks."""
+        arr = self.open(source)
+        axis = _normalize_axis(axis, arr.ndim)
+        dtype = np.cumsum(np.zeros(1, dtype=arr.dtype)).dtype
+        result = self._output(out, arr.shape, dtype)
+        carry = None
+        for start, stop in self.blocks(arr, dtype.itemsize):
+            block = result[start:stop]
+            np.cumsum(arr[start:stop], axis=axis, dtype=dtype, out=block)
+            if axis == 0:
+                if carry is not None:
+                    block += carry
+                carry = block[-1].copy()
+        return self._finish(result)
+
+    def gradient(
+        self,
+        source: ArraySource,
+        axis: int = 0,
+        spacing: float = 1.0,
+        out: OutputTarget = None
+    ) -> np.ndarray:
+        """np.gradient along one axis; blocks read one halo row on each side."""
+        arr = self.open(source)
+        axis = _normalize_axis(axis, arr.ndim)
+        if arr.shape[axis] < 2:
+            raise ValueError("gradient needs at least two samples along axis")
+        result = self._output(out, arr.shape, np.dtype(np.float64))
+        rows = arr.shape[0]
+        for start, stop in self.blocks(arr, 8):
+            if axis != 0:
+                result[start:stop] = np.gradient(arr[start:stop], spacing, axis=axis)
+                continue
+            # Central differences at block edges need the neighbouring rows;
+            # at the ends of the array np.gradient falls back to one-sided ones.
+            lo, hi = max(start - 1, 0), min(stop + 1, rows)
+            grad = np.gradient(arr[lo:hi], spacing, axis=0)
+            result[start:stop] = grad[start - lo:stop - lo]
+        return self._finish(result)
+
+    def statistics(
+        self,
+        source: ArraySource,
+        axis: Optional[int] = 0,
+        percentiles: Sequence[float] = (25, 50, 75)
+    ) -> Dict[str, np.ndarray]:
+        """Per-column (or, with axis=None, global) statistics from mergeable accumulators.
+
+        Half of the budget goes to the percentile sketch, whose compression
+        is lowered for wide inputs, and the rest to blocks of rows.
+        """
+        arr = self.open(source)
+        row_items = int(np.prod(arr.shape[1:], dtype=np.int64)) or 1
+        columns = 1 if axis is None else row_items
+        unit = 8 * self.STATS_BUFFERS
+        compression = int(np.clip(self.memory_budget // (2 * unit * columns) - 1, 10, 200))
+        sketch = unit * (compression + 1) * columns
+        rows = max(1, (self.memory_budget - sketch) // (unit * row_items))
+        stats = StreamingStats(percentiles, axis, compression)
+        for start in range(0, arr.shape[0], rows):
+            stats.update(arr[start:start + rows])
+        return stats.result()
+
+    def apply(
+        self,
+        source: ArraySource,
+        func: Callable[[np.ndarray], np.ndarray],
+        out: OutputTarget = None,
+        dtype: Optional[np.dtype] = None
+    ) -> np.ndarray:
+        """Apply a row-independent transform block by block.
+
+        func receives a block of rows and must return an array of the same
+        shape, e.g. an elementwise ufunc or a per-column scaling.
+        """
+        arr = self.open(source)
+        dtype = np.dtype(dtype) if dtype is not None else None
+        result = None
+        for start, stop in self.blocks(arr, dtype.itemsize if dtype else 8):
+            transformed = func(arr[start:stop])
+            if result is None:
+                result = self._output(out, arr.shape, dtype or transformed.dtype)
+            result[start:stop] = transformed
+        if result is None:
+            result = self._output(out, arr.shape, dtype or arr.dtype)
+        return self._finish(result)
+
+    def standardize(self, source: ArraySource, out: OutputTarget = None) -> np.ndarray:
+        """Scale every column to zero mean and unit variance in two passes."""
+        stats = self.statistics(source, axis=0, percentiles=())
+        mean, std = stats['mean'], stats['std']
+        scale = np.where(std > 0, std, 1.0)
+        return self.apply(source, lambda block: (block - mean) / scale, out=out, dtype=np.float64)
+
+
+def _normalize_axis(axis: int, ndim: int) -> int:
+    if not -ndim <= axis < ndim:
+        raise ValueError(f"axis {axis} is out of bounds for an array of dimension {ndim}")
+    return axis % ndim
@@ -1,70 +1,330 @@
+import logging
 import numpy as np
-from typing import Optional, Tuple, Union, List, Dict
-from functools import wraps
+from collections import Counter
+from typing import Callable, Optional, Tuple, Union, List, Dict, Iterable, Sequence
+from functools import partial, wraps
+from .streaming_stats import streaming_statistics
 
+logger = logging.getLogger(__name__)
 
-def validate_array(func):
-    """Decorator to validate numpy array inputs."""
+_MATRIX_OPERATIONS = ("eigenvalues", "inverse", "determinant", "trace")
+# Dtypes LAPACK works in directly; anything else is cast once on entry
+# rather than by each linalg call. Layout is left alone: the linalg gufuncs
+# copy every operand into their own working buffer regardless.
+_LINALG_DTYPES = (np.float64, np.complex128, np.float32, np.complex64)
 
-    @wraps(func)
-    def wrapper(arr, *args, **kwargs):
-        if not isinstance(arr, np.ndarray):
-            arr = np.array(arr)
-        return func(arr, *args, **kwargs)
+# Input copies made by validate_array, keyed by function qualified name.
+array_copies: Counter = Counter()
 
-    return wrapper
+
+def validate_array(
+    func: Optional[Callable] = None,
+    *,
+    dtype: Optional[Union[np.dtype, Sequence[np.dtype]]] = None,
+    ndim: Optional[Union[int, Sequence[int], range]] = None,
+    order: Optional[str] = None,
+    log_copies: bool = False
+):
+    """Decorator to validate numpy array inputs.
+
+    Usable bare or with a contract. The first argument is turned into an
+    ndarray without copying where possible: arrays and memmaps pass through,
+    buffer-protocol objects are viewed with ``np.asarray`` and DataFrames or
+    Series go through ``to_numpy(copy=False)``. ``dtype`` lists accepted
+    dtypes (other inputs are cast to the first), ``ndim`` the accepted
+    dimensionalities and ``order`` the required ``'C'`` or ``'F'``
+    contiguity. Every copy made on the way is counted in ``array_copies``
+    under the function's qualified name, and logged when ``log_copies`` is set.
+    """
+    if order not in (None, 'C', 'F'):
+        raise ValueError(f"Unknown memory order: {order}")
+    if dtype is not None and not isinstance(dtype, (list, tuple)):
+        dtype = [dtype]
+    accepted = None if dtype is None else [np.dtype(d) for d in dtype]
+    if ndim is None or isinstance(ndim, range):
+        ndims = ndim
+    else:
+        ndims = {ndim} if isinstance(ndim, int) else set(ndim)
+
+    def decorator(func):
+        name = func.__qualname__
+
+        @wraps(func)
+        def wrapper(arr, *args, **kwargs):
+            arr, copies = _coerce_array(arr, accepted, ndims, order)
+            if copies:
+                array_copies[name] += len(copies)
+                if log_copies:
+                    logger.warning(f"{name} copied its input: {', '.join(copies)}")
+            return func(arr, *args, **kwargs)
+
+        return wrapper
+
+    return decorator(func) if func is not None else decorator
+
+
+def _coerce_array(value, accepted, ndims, order) -> Tuple[np.ndarray, List[str]]:
+    """Apply a validate_array contract, returning the array and the copies made."""
+    copies = []
+    if isinstance(value, np.ndarray):
+        arr = value
+    else:
+        if hasattr(value, 'to_numpy'):
+            arr = value.to_numpy(copy=False)
+        else:
+            arr = np.asarray(value)
+        # Views of existing buffers do not own their data; conversions do.
+        if arr.flags.owndata:
+            copies.append(f"converted {type(value).__name__}")
+    if ndims is not None and arr.ndim not in ndims:
+        expected = ndims if isinstance(ndims, range) else sorted(ndims)
+        raise ValueError(f"Expected an array with ndim in {expected}, got {arr.ndim}")
+    if accepted is not None and arr.dtype not in accepted:
+        copies.append(f"cast {arr.dtype} to {accepted[0]}")
+        arr = arr.astype(accepted[0], order=order or 'K')
+    if order == 'C' and not arr.flags.c_contiguous:
+        copies.append("made C-contiguous")
+        arr = np.ascontiguousarray(arr)
+    elif order == 'F' and not arr.flags.f_contiguous:
+        copies.append("made F-contiguous")
+        arr = np.asfortranarray(arr)
+    return arr, copies
+
+
+def _fused_moments(
+    arr: np.ndarray, axis: Optional[int], dtype: np.dtype
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Mean, population variance, skewness and excess kurtosis along axis.
+
+    The array is centred once; the second, third and fourth powers are then
+    built in place in two scratch buffers, so no per-moment pass re-reads or
+    re-centres the input.
+    """
+    mean = np.mean(arr, axis=axis, dtype=dtype, keepdims=True)
+    count = arr.size // max(mean.size, 1)
+    centred = np.subtract(arr, mean, dtype=dtype)
+    powers = np.multiply(centred, centred)
+    m2 = np.sum(powers, axis=axis, dtype=dtype) / count
+    m3 = np.sum(np.multiply(powers, centred, out=centred), axis=axis, dtype=dtype) / count
+    m4 = np.sum(np.multiply(powers, powers, out=powers), axis=axis, dtype=dtype) / count
+    with np.errstate(divide="ignore", invalid="ignore"):
+        skewness = m3 / m2 ** 1.5
+        kurtosis = m4 / (m2 * m2) - 3.0
+    mean = np.squeeze(mean, axis=axis) if axis is not None else mean.reshape(())[()]
+    return mean, m2, skewness, kurtosis
+
+
+def _batched_inverse(arr: np.ndarray, singular: Optional[np.ndarray] = None) -> np.ndarray:
+    """Invert a stack of matrices, leaving NaN where an item is singular."""
+    if singular is None:
+        singular = np.linalg.slogdet(arr)[0] == 0
+    result = np.full(arr.shape, np.nan, dtype=np.result_type(arr.dtype, np.float64))
+    regular = ~singular
+    if np.all(regular):
+        return np.linalg.inv(arr)
+    if np.any(regular):
+        result[regular] = np.linalg.inv(arr[regular])
+    return result
+
+
+def _row_statistics(block: np.ndarray, axis: int, dtype: np.dtype) -> np.ndarray:
+    """statistical_analysis of a row block packed as (..., mean, var, skew, kurt, p25, p50, p75)."""
+    moments = np.stack(_fused_moments(block, axis, dtype), axis=-1)
+    percentiles = np.moveaxis(np.percentile(block, [25, 50, 75], axis=axis), 0, -1)
+    return np.concatenate([moments, percentiles], axis=-1)
 
 
 class NumpyProcessor:
     """Complex numpy operations demonstrator."""
 
     @staticmethod
-    @validate_array
-    def matrix_operations(arr: np.ndarray, operation: str) -> Union[np.ndarray, float]:
-        """Perform various matrix operations."""
-        if operation == "eigenvalues":
-            return np.linalg.eigvals(arr)
-        elif operation == "inverse":
-            return np.linalg.inv(arr)
-        elif operation == "determinant":
-            return np.linalg.det(arr)
-        elif operation == "trace":
-            return np.trace(arr)
-        raise ValueError(f"Unknown operation: {operation}")
+    @validate_array(dtype=_LINALG_DTYPES, ndim=range(2, 65))
+    def matrix_operations(
+        arr: np.ndarray, operation: Union[str, Sequence[str]]
+    ) -> Union[np.ndarray, float, Dict[str, np.ndarray]]:
+        """Perform various matrix operations.
+
+        ``arr`` may be one matrix or a stack of shape ``(..., k, k)``; every
+        operation runs as a single batched LAPACK call. Inverting a stack
+        fills singular items with NaN instead of failing the whole batch.
+        Passing a list of operations returns a dict of results plus a
+        per-item ``"singular"`` mask, with the determinant and singularity
+        taken from one LU factorization. Integer and boolean inputs are cast
+        to float64 once on entry.
+        """
+        if isinstance(operation, str):
+            if operation == "eigenvalues":
+                return np.linalg.eigvals(arr)
+            elif operation == "inverse":
+                return _batched_inverse(arr) if arr.ndim > 2 else np.linalg.inv(arr)
+            elif operation == "determinant":
+                return np.linalg.det(arr)
+            elif operation == "trace":
+                return np.trace(arr, axis1=-2, axis2=-1)
+            raise ValueError(f"Unknown operation: {operation}")
+
+        for op in operation:
+            if op not in _MATRIX_OPERATIONS:
+                raise ValueError(f"Unknown operation: {op}")
+        sign, logdet = np.linalg.slogdet(arr)
+        singular = sign == 0
+        results = {}
+        for op in operation:
+            if op == "eigenvalues":
+                results[op] = np.linalg.eigvals(arr)
+            elif op == "inverse":
+                results[op] = _batched_inverse(arr, singular)
+            elif op == "determinant":
+                results[op] = sign * np.exp(logdet)
+            else:
+                results[op] = np.trace(arr, axis1=-2, axis2=-1)
+        results["singular"] = singular
+        return results
 
     @staticmethod
     @validate_array
     def statistical_analysis(
-        arr: np.ndarray, axis: Optional[int] = None
+        arr: np.ndarray,
+        axis: Optional[int] = None,
+        dtype: np.dtype = np.float64,
+        executor: Optional["ParallelExecutor"] = None
     ) -> Dict[str, np.ndarray]:
-        """Perform comprehensive statistical analysis."""
+        """Perform comprehensive statistical analysis.
+
+        Moments are reduced along ``axis`` (all elements when None) from one
+        shared mean-centred pass; ``dtype=np.float32`` halves the memory
+        traffic at the cost of precision. With an ``executor`` and an axis
+        other than 0, row blocks are analysed in parallel.
+        """
+        if executor is not None and axis is not None and arr.ndim > 1 and axis % arr.ndim:
+            packed = executor.map_rows(
+                partial(_row_statistics, axis=axis % arr.ndim, dtype=dtype), arr
+            )
+            mean, variance, skewness, kurtosis = (packed[..., i] for i in range(4))
+            percentiles = np.moveaxis(packed[..., 4:], -1, 0)
+        else:
+            mean, variance, skewness, kurtosis = _fused_moments(arr, axis, dtype)
+            percentiles = np.percentile(arr, [25, 50, 75], axis=axis)
         return {
-            "mean": np.mean(arr, axis=axis),
-            "std": np.std(arr, axis=axis),
-            "percentiles": np.percentile(arr, [25, 50, 75], axis=axis),
-            "skewness": (
-                np.array(
-                    [
-                        np.sum((x - np.mean(x)) ** 3) / (len(x) * np.std(x) ** 3)
-                        for x in np.atleast_2d(arr)
-                    ]
-                )
-                if axis is not None
-                else None
-            ),
+            "mean": mean,
+            "std": np.sqrt(variance),
+            "percentiles": percentiles,
+            "skewness": skewness,
+            "kurtosis": kurtosis,
         }
 
     @staticmethod
+    def streaming_statistical_analysis(
+        source: Union[np.ndarray, Iterable[np.ndarray]],
+        axis: Optional[int] = 0,
+        chunk_rows: int = 65536,
+        percentiles: Tuple[float, ...] = (25, 50, 75)
+    ) -> Dict[str, np.ndarray]:
+        """Statistical analysis of an array, memmap or chunk iterator in bounded memory.
+
+        Moments are exact; percentiles come from a t-digest and are approximate.
+        """
+        return streaming_statistics(source, percentiles, axis, chunk_rows)
+
+    @staticmethod
+    def chunked(memory_budget: int = 256 * 2 ** 20) -> "ChunkedProcessor":
+        """Out-of-core mode for memmaps and .npy files larger than RAM."""
+        from .chunked import ChunkedProcessor
+        return ChunkedProcessor(memory_budget)
+
+    @staticmethod
+    @validate_array
     def complex_transformations(
-        arr: np.ndarray, transformations: List[str]
+        arr: np.ndarray,
+        transformations: List[str],
+        axis: Optional[int] = None,
+        half_spectrum: bool = False,
+        backend: str = "numpy",
+        workers: Optional[int] = None,
+        plan: Optional["FFTPlan"] = None,
+        executor: Optional["ParallelExecutor"] = None
     ) -> Dict[str, np.ndarray]:
-        """Apply multiple complex transformations."""
+        """Apply multiple complex transformations.
+
+        ``axis`` selects the axis for a stack of signals (the FFT defaults
+        to the last axis, gradient and cumsum to their NumPy defaults). With
+        ``half_spectrum`` a real input takes the rfft path and returns only
+        the ``n // 2 + 1`` non-negative frequencies; ``"rfft"`` requests it
+        explicitly. ``backend="scipy"`` uses scipy.fft with ``workers``
+        threads. A prepared ``plan`` overrides these FFT options. With an
+        ``executor``, signals stacked along axis 0 are transformed in parallel.
+        """
         results = {}
         for transform in transformations:
-            if transform == "fft":
-                results["fft"] = np.fft.fft(arr)
+            if transform in ("fft", "rfft"):
+                real = transform == "rfft" or (half_spectrum and np.isrealobj(arr))
+                fft_plan = plan or FFTPlan(
+                    arr.shape[-1 if axis is None else axis],
+                    axis=-1 if axis is None else axis,
+                    real=real, backend=backend, workers=workers
+                )
+                if executor is not None and arr.ndim > 1 and fft_plan.axis % arr.ndim:
+                    results[transform] = executor.map_rows(fft_plan, arr)
+                else:
+                    results[transform] = fft_plan(arr)
             elif transform == "gradient":
-                results["gradient"] = np.gradient(arr)
+                results["gradient"] = np.gradient(arr) if axis is None else np.gradient(arr, axis=axis)
             elif transform == "cumsum":
-                results["cumsum"] = np.cumsum(arr)
+                results["cumsum"] = np.cumsum(arr, axis=axis)
         return results
+
+
+class FFTPlan:
+    """Reusable FFT for repeated transforms of one length along one axis.
+
+    Resolves the backend function and its options once, checks every input
+    against the planned length and caches the matching frequency bins. Both
+    backends keep twiddle factors for recently used lengths, so a plan
+    applied to many windows (or to one ``(windows, n)`` stack) pays the
+    setup cost once. ``real`` selects rfft, which returns the half spectrum
+    and does roughly half the work for real signals.
+    """
+
+    def __init__(
+        self,
+        n: int,
+        axis: int = -1,
+        real: bool = True,
+        backend: str = "numpy",
+        workers: Optional[int] = None
+    ):
+        if n < 1:
+            raise ValueError("n must be positive")
+        self.n = n
+        self.axis = axis
+        self.real = real
+        self.backend = backend
+        if backend == "numpy":
+            if workers not in (None, 1):
+                raise ValueError("workers requires the scipy backend")
+            module, self._options = np.fft, {}
+        elif backend == "scipy":
+            import scipy.fft as module
+            self._options = {"workers": workers}
+        else:
+            raise ValueError(f"Unknown FFT backend: {backend}")
+        self._transform = module.rfft if real else module.fft
+        self._frequencies = None
+
+    def __call__(self, arr: np.ndarray) -> np.ndarray:
+        arr = np.asarray(arr)
+        if arr.shape[self.axis] != self.n:
+            raise ValueError(
+                f"Plan expects length {self.n} along axis {self.axis}, got {arr.shape[self.axis]}"
+            )
+        if self.real and np.iscomplexobj(arr):
+            raise ValueError("A real FFT plan cannot transform complex input")
+        return self._transform(arr, n=self.n, axis=self.axis, **self._options)
+
+    def frequencies(self, d: float = 1.0) -> np.ndarray:
+        """Frequency bins of the planned output for sample spacing d."""
+        if self._frequencies is None or self._frequencies[0] != d:
+            freqs = np.fft.rfftfreq(self.n, d) if self.real else np.fft.fftfreq(self.n, d)
+            freqs.flags.writeable = False
+            self._frequencies = (d, freqs)
+        return self._frequencies[1]
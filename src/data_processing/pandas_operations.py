@@ -30,6 +30,49 @@ class PandasProcessor:
         """Perform complex groupby aggregation."""
         return df.groupby(group_cols).agg(agg_dict).reset_index()
 
+    @staticmethod
+    def optimize_dtypes(
+        df: pd.DataFrame,
+        downcast_floats: bool = False,
+        categorical_threshold: Optional[float] = 0.5,
+        exclude: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """Shrink a DataFrame's memory footprint.
+
+        Integer columns are downcast to the smallest dtype that holds their
+        values; float columns only when ``downcast_floats`` is set, since
+        float32 loses precision. String columns whose share of distinct
+        values is at most ``categorical_threshold`` become categoricals;
+        columns holding unhashable values such as parsed JSON lists or dicts
+        are left alone. Columns are handled by position, so duplicate labels
+        are kept.
+        """
+        exclude = set(exclude or [])
+        result = {}
+        for position, column in enumerate(df.columns):
+            series = df.iloc[:, position]
+            if column in exclude:
+                pass
+            elif pd.api.types.is_bool_dtype(series):
+                pass
+            elif pd.api.types.is_integer_dtype(series):
+                kind = 'unsigned' if len(series) and series.min() >= 0 else 'integer'
+                series = pd.to_numeric(series, downcast=kind)
+            elif pd.api.types.is_float_dtype(series) and downcast_floats:
+                series = pd.to_numeric(series, downcast='float')
+            elif (categorical_threshold is not None and len(series)
+                  and (pd.api.types.is_string_dtype(series) or series.dtype == object)):
+                try:
+                    distinct = series.nunique(dropna=False)
+                except TypeError:
+                    distinct = None
+                if distinct is not None and distinct <= categorical_threshold * len(series):
+                    series = series.astype('category')
+            result[position] = series
+        optimized = pd.DataFrame(result, index=df.index)
+        optimized.columns = df.columns
+        return optimized
+
     @staticmethod
     def apply_rolling_calculations(
         df: pd.DataFrame,
@@ -0,0 +1,172 @@
+import concurrent.futures
+import mmap
+import os
+import threading
+import weakref
+import numpy as np
+from multiprocessing import shared_memory
+from typing import Callable, Optional, Tuple
+
+# (shared memory name, shape, dtype) or (file name, offset, shape, dtype, order).
+_BufferSpec = Tuple
+
+
+class ParallelExecutor:
+    """Run a row-independent array function over row blocks on a pool.
+
+    ``func`` receives consecutive blocks of rows and must return one output
+    row per input row; outputs are written in place into a single result
+    array. With ``kind='thread'`` blocks are views and NumPy releases the
+    GIL inside its kernels. With ``kind='process'`` inputs and outputs live
+    in ``multiprocessing.shared_memory`` (``.npy`` memmaps are reopened by
+    file name), so workers never receive pickled arrays; ``func`` itself
+    must be picklable, e.g. a module-level function or a
+    ``functools.partial`` of one.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        kind: str = 'thread',
+        blocks_per_worker: int = 4
+    ):
+        if kind not in ('thread', 'process'):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        self.workers = workers or os.cpu_count() or 1
+        self.kind = kind
+        self.blocks_per_worker = blocks_per_worker
+        self._pool: Optional[concurrent.futures.Executor] = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    @property
+    def pool(self) -> concurrent.futures.Executor:
+        """Worker pool, created on first use and reused across calls."""
+        with self._lock:
+            if self._pool is None:
+                if self.kind == 'thread':
+                    self._pool = concurrent.futures.ThreadPoolExecutor(self.workers)
+                else:
+                    self._pool = concurrent.futures.ProcessPoolExecutor(self.workers)
+            return self._pool
+
+    def _bounds(self, rows: int):
+        step = max(1, -(-rows // (self.workers * self.blocks_per_worker)))
+        return [(start, min(start + step, rows)) for start in range(0, rows, step)]
+
+    def map_rows(self, func: Callable[[np.ndarray], np.ndarray], arr: np.ndarray) -> np.ndarray:
+        """Apply func to row blocks of arr in parallel and return the stacked result."""
+        arr = np.asarray(arr) if not isinstance(arr, np.ndarray) else arr
+        bounds = self._bounds(arr.shape[0])
+        if not bounds:
+            return func(arr)
+        # The first block runs here to learn the output row shape and dtype.
+        start, stop = bounds[0]
+        first = np.asarray(func(arr[start:stop]))
+        if first.shape[0] != stop - start:
+            raise ValueError("func must return one output row per input row")
+        shape = (arr.shape[0],) + first.shape[1:]
+        if self.workers == 1 or len(bounds) == 1:
+            result = np.empty(shape, dtype=first.dtype)
+            result[start:stop] = first
+            for start, stop in bounds[1:]:
+                result[start:stop] = func(arr[start:stop])
+            return result
+        if self.kind == 'thread':
+            return self._map_threads(func, arr, bounds, first, shape)
+        return self._map_processes(func, arr, bounds, first, shape)
+
+    def _map_threads(self, func, arr, bounds, first, shape) -> np.ndarray:
+        result = np.empty(shape, dtype=first.dtype)
+        result[:first.shape[0]] = first
+
+        def run(start: int, stop: int) -> None:
+            result[start:stop] = func(arr[start:stop])
+
+        futures = [self.pool.submit(run, start, stop) for start, stop in bounds[1:]]
+        for future in futures:
+            future.result()
+        return result
+
+    def _map_processes(self, func, arr, bounds, first, shape) -> np.ndarray:
+        segments = []
+        output = None
+        try:
+            if isinstance(arr, np.memmap) and isinstance(arr.base, mmap.mmap):
+                source = ('file', arr.filename, arr.offset, arr.shape, arr.dtype.str,
+                          'F' if arr.flags.f_contiguous and not arr.flags.c_contiguous else 'C')
+            else:
+                data = np.ascontiguousarray(arr)
+                segment = shared_memory.SharedMemory(create=True, size=max(data.nbytes, 1))
+                segments.append(segment)
+                np.ndarray(data.shape, data.dtype, buffer=segment.buf)[...] = data
+                source = ('shm', segment.name, data.shape, data.dtype.str)
+
+            out_segment = shared_memory.SharedMemory(
+                create=True, size=max(int(np.prod(shape)) * first.dtype.itemsize, 1)
+            )
+            segments.append(out_segment)
+            target = ('shm', out_segment.name, shape, first.dtype.str)
+            output = np.ndarray(shape, first.dtype, buffer=out_segment.buf)
+            output[:first.shape[0]] = first
+
+            futures = [
+                self.pool.submit(_run_block, func, source, target, start, stop)
+                for start, stop in bounds[1:]
+            ]
+            for future in futures:
+                future.result()
+        except BaseException:
+            del output
+            for segment in segments:
+                _release(segment)
+            raise
+        # Workers wrote straight into the result; it stays backed by shared
+        # memory, which is released once the array is garbage collected.
+        for segment in segments[:-1]:
+            _release(segment)
+        weakref.finalize(output, _release, out_segment)
+        return output
+
+
+def _release(segment: shared_memory.SharedMemory) -> None:
+    segment.close()
+    segment.unlink()
+
+
+def _attach(spec: _BufferSpec):
+    """Open a buffer described by spec in a worker; returns (array, handle)."""
+    if spec[0] == 'file':
+        _, filename, offset, shape, dtype, order = spec
+        arr = np.memmap(filename, dtype=np.dtype(dtype), mode='r', offset=offset,
+                        shape=shape, order=order)
+        return arr, None
+    _, name, shape, dtype = spec
+    # Pool workers share the parent's resource tracker, so attaching only
+    # re-registers a name the parent already owns and unlinks on release.
+    segment = shared_memory.SharedMemory(name=name)
+    return np.ndarray(shape, np.dtype(dtype), buffer=segment.buf), segment
+
+
+def _run_block(func, source: _BufferSpec, target: _BufferSpec, start: int, stop: int) -> None:
+    arr, source_handle = _attach(source)
+    out, target_handle = _attach(target)
+    try:
+        out[start:stop] = func(arr[start:stop])
+    finally:
+        del arr, out
+        for handle in (source_handle, target_handle):
+            if handle is not None:
+                handle.close()
@@ -0,0 +1,277 @@
+import numpy as np
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Union
+
+
+class MomentAccumulator:
+    """Running count, mean and central moments up to the fourth order.
+
+    Each chunk's moments are computed in one vectorized, mean-centred pass
+    and folded in with Pébay's pairwise update formulas, which are exact
+    and numerically stable regardless of chunk size. ``merge`` uses the same
+    formulas, so states built in separate processes (accumulators pickle)
+    can be combined in any order. Statistics are per column: chunks are
+    reduced along axis 0.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = None
+        self._m2 = None
+        self._m3 = None
+        self._m4 = None
+        self.min = None
+        self.max = None
+
+    def update(self, chunk: np.ndarray) -> "MomentAccumulator":
+        """Fold the rows of chunk into the running moments."""
+        chunk = np.asarray(chunk, dtype=np.float64)
+        if chunk.shape[0] == 0:
+            return self
+        other = MomentAccumulator()
+        other.count = chunk.shape[0]
+        other.mean = chunk.mean(axis=0)
+        centred = chunk - other.mean
+        squared = centred * centred
+        other._m2 = squared.sum(axis=0)
+        other._m3 = (squared * centred).sum(axis=0)
+        other._m4 = (squared * squared).sum(axis=0)
+        other.min = chunk.min(axis=0)
+        other.max = chunk.max(axis=0)
+        return self.merge(other)
+
+    def merge(self, other: "MomentAccumulator") -> "MomentAccumulator":
+        """Combine another accumulator's state into this one."""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean = other.count, other.mean
+            self._m2, self._m3, self._m4 = other._m2, other._m3, other._m4
+            self.min, self.max = other.min, other.max
+            return self
+
+        na, nb = self.count, other.count
+        n = na + nb
+        delta = other.mean - self.mean
+        delta2 = delta * delta
+        m2a, m3a = self._m2, self._m3
+
+        self.mean = self.mean + delta * (nb / n)
+        self._m4 = (
+            self._m4 + other._m4
+            + delta2 * delta2 * (na * nb * (na * na - na * nb + nb * nb) / n ** 3)
+            + 6 * delta2 * (na * na * other._m2 + nb * nb * m2a) / n ** 2
+            + 4 * delta * (na * other._m3 - nb * m3a) / n
+        )
+        self._m3 = (
+            m3a + other._m3
+            + delta2 * delta * (na * nb * (na - nb) / n ** 2)
+            + 3 * delta * (na * other._m2 - nb * m2a) / n
+        )
+        self._m2 = m2a + other._m2 + delta2 * (na * nb / n)
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        self.count = n
+        return self
+
+    def variance(self, ddof: int = 0) -> np.ndarray:
+        return self._m2 / (self.count - ddof)
+
+    def std(self, ddof: int = 0) -> np.ndarray:
+        return np.sqrt(self.variance(ddof))
+
+    def skewness(self) -> np.ndarray:
+        """Population (biased) skewness, matching statistical_analysis."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.sqrt(self.count) * self._m3 / self._m2 ** 1.5
+
+    def kurtosis(self) -> np.ndarray:
+        """Population excess kurtosis."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.count * self._m4 / (self._m2 * self._m2) - 3.0
+
+
+class ColumnDigests:
+    """One t-digest per column, compressed for all columns in a single pass.
+
+    Centroids live in ``(compression + 1, columns)`` arrays padded with
+    zero weights, so sorting, bucketing and merging are vectorized across
+    columns. Each column is compressed with the arcsine scale function,
+    which keeps centroids small near the tails so extreme quantiles stay
+    accurate. Every ``update`` compresses immediately; the state is the
+    centroids alone.
+    """
+
+    def __init__(self, columns: int, compression: int = 200):
+        if compression < 10:
+            raise ValueError("compression must be at least 10")
+        self.compression = compression
+        self.means = np.zeros((compression + 1, columns))
+        self.weights = np.zeros((compression + 1, columns))
+        self.min = np.full(columns, np.inf)
+        self.max = np.full(columns, -np.inf)
+
+    @property
+    def count(self) -> np.ndarray:
+        return self.weights.sum(axis=0)
+
+    def update(self, chunk: np.ndarray) -> "ColumnDigests":
+        """Add a ``(rows, columns)`` block; NaNs are ignored."""
+        values = np.asarray(chunk, dtype=np.float64)
+        if not values.shape[0]:
+            return self
+        present = ~np.isnan(values)
+        # fmin/fmax skip NaNs; all-NaN columns leave the bounds untouched.
+        self.min = np.fmin(self.min, np.fmin.reduce(values, axis=0))
+        self.max = np.fmax(self.max, np.fmax.reduce(values, axis=0))
+        self._compress(
+            np.concatenate([self.means, np.where(present, values, 0.0)]),
+            np.concatenate([self.weights, present.astype(np.float64)])
+        )
+        return self
+
+    def merge(self, other: "ColumnDigests") -> "ColumnDigests":
+        """Absorb another batch of digests over the same columns."""
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        self._compress(
+            np.concatenate([self.means, other.means]),
+            np.concatenate([self.weights, other.weights])
+        )
+        return self
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray) -> None:
+        slots, columns = self.compression + 1, means.shape[1]
+        order = np.argsort(means, axis=0, kind='stable')
+        means = np.take_along_axis(means, order, axis=0)
+        weights = np.take_along_axis(weights, order, axis=0)
+        del order
+        cumulative = np.cumsum(weights, axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            q = (cumulative - weights / 2) / cumulative[-1]
+        del cumulative
+        # Empty columns give NaN positions; their weights are all zero anyway.
+        k = np.nan_to_num(_scale(q, self.compression), copy=False)
+        del q
+        bins = (k.astype(np.intp) + np.arange(columns) * slots).ravel()
+        del k
+        size = slots * columns
+        merged = np.bincount(bins, weights.ravel(), minlength=size)
+        totals = np.bincount(bins, (means * weights).ravel(), minlength=size)
+        self.weights = merged.reshape(columns, slots).T.copy()
+        self.means = np.divide(
+            totals, merged, out=np.zeros(size), where=merged > 0
+        ).reshape(columns, slots).T.copy()
+
+    def quantile(self, q: Union[float, Sequence[float]]) -> np.ndarray:
+        """Approximate quantiles, shaped ``q.shape + (columns,)``."""
+        q = np.asarray(q, dtype=np.float64)
+        result = np.full(q.shape + (self.means.shape[1],), np.nan)
+        for column in range(self.means.shape[1]):
+            weights = self.weights[:, column]
+            used = weights > 0
+            if not used.any():
+                continue
+            weights = weights[used]
+            centres = np.cumsum(weights) - weights / 2
+            total = weights.sum()
+            positions = np.r_[0.0, centres, total]
+            values = np.r_[self.min[column], self.means[used, column], self.max[column]]
+            result[..., column] = np.interp(q * total, positions, values)
+        return result
+
+
+class StreamingStats:
+    """Chunk-by-chunk equivalent of NumpyProcessor.statistical_analysis.
+
+    Combines a MomentAccumulator with a ColumnDigests sketch. Feed row
+    chunks (e.g. slices of a memmap or frames from a paginated fetch) with
+    ``update`` and merge partial states from other workers with ``merge``.
+    With ``axis=None`` every chunk is flattened and scalar statistics are
+    reported. Percentiles are approximate; all moments are exact.
+
+    Digests are compressed at the end of every ``update``, so between chunks
+    the state is ``O(columns * compression)`` and peak memory is bounded by
+    the chunk size rather than by the number of rows seen. Lower
+    ``compression`` shrinks that state at some cost in percentile accuracy.
+    """
+
+    def __init__(
+        self,
+        percentiles: Sequence[float] = (25, 50, 75),
+        axis: Optional[int] = 0,
+        compression: int = 200
+    ):
+        if axis not in (0, None):
+            raise ValueError("StreamingStats reduces along axis 0 or over all elements")
+        self.percentiles = tuple(percentiles)
+        self.axis = axis
+        self.compression = compression
+        self.moments = MomentAccumulator()
+        self.digests = None
+
+    def update(self, chunk: np.ndarray) -> "StreamingStats":
+        chunk = np.asarray(chunk)
+        if self.axis is None:
+            chunk = chunk.reshape(-1)
+        self.moments.update(chunk)
+        columns = chunk.reshape(chunk.shape[0], -1)
+        if self.digests is None:
+            self.digests = ColumnDigests(columns.shape[1], self.compression)
+        self.digests.update(columns)
+        return self
+
+    def merge(self, other: "StreamingStats") -> "StreamingStats":
+        self.moments.merge(other.moments)
+        if other.digests is not None:
+            if self.digests is None:
+                self.digests = ColumnDigests(other.digests.means.shape[1], self.compression)
+            self.digests.merge(other.digests)
+        return self
+
+    def result(self) -> Dict[str, np.ndarray]:
+        """Statistics in the same layout as statistical_analysis."""
+        if not self.moments.count:
+            raise ValueError("No data has been accumulated")
+        shape = np.shape(self.moments.mean)
+        quantiles = np.asarray(self.percentiles) / 100
+        percentiles = self.digests.quantile(quantiles).reshape(
+            (len(self.percentiles),) + shape
+        )
+        return {
+            'mean': self.moments.mean,
+            'std': self.moments.std(),
+            'percentiles': percentiles,
+            'skewness': self.moments.skewness(),
+            'kurtosis': self.moments.kurtosis(),
+            'min': self.moments.min,
+            'max': self.moments.max,
+            'count': self.moments.count
+        }
+
+
+def _scale(q: np.ndarray, compression: int) -> np.ndarray:
+    """Arcsine t-digest scale: the centroid index for quantile position q."""
+    return np.floor(compression * (np.arcsin(2 * q - 1) / np.pi + 0.5))
+
+
+def iter_row_chunks(arr: np.ndarray, chunk_rows: int = 65536) -> Iterator[np.ndarray]:
+    """Yield consecutive row blocks of an array or memmap without copying."""
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be positive")
+    for start in range(0, arr.shape[0], chunk_rows):
+        yield arr[start:start + chunk_rows]
+
+
+def streaming_statistics(
+    chunks: Union[np.ndarray, Iterable[np.ndarray]],
+    percentiles: Sequence[float] = (25, 50, 75),
+    axis: Optional[int] = 0,
+    chunk_rows: int = 65536
+) -> Dict[str, np.ndarray]:
+    """Statistics over an array, memmap or iterable of row chunks in bounded memory."""
+    if isinstance(chunks, np.ndarray):
+        chunks = iter_row_chunks(chunks, chunk_rows)
+    stats = StreamingStats(percentiles, axis)
+    for chunk in chunks:
+        stats.update(chunk)
+    return stats.result()
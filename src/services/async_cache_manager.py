@@ -0,0 +1,314 @@
+import asyncio
+import logging
+import time
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Union
+import redis.asyncio as aioredis
+from redis.exceptions import LockError
+from .cache_keys import KeyBuilder
+from .cache_manager import BaseCacheManager
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncCacheManager(BaseCacheManager):
+    """Non-blocking counterpart of CacheManager built on redis.asyncio.
+
+    Shares configuration, key generation, serializers and the optional local
+    tier with CacheManager; every Redis call goes through a connection pool
+    so concurrent tasks never stall the event loop.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        default_ttl: int = 3600,
+        local_cache_size: Optional[int] = None,
+        local_ttl: Optional[int] = None,
+        batch_size: int = 500,
+        serializer: str = 'pickle',
+        compress_threshold: Optional[int] = None,
+        key_builder: Optional[KeyBuilder] = None,
+        max_connections: int = 50,
+        local_copy: bool = False
+    ):
+        super().__init__(
+            default_ttl, local_cache_size, local_ttl,
+            batch_size, serializer, compress_threshold, key_builder, local_copy
+        )
+        self.pool = aioredis.ConnectionPool.from_url(
+            redis_url, max_connections=max_connections
+        )
+        self.redis_client = aioredis.Redis(connection_pool=self.pool)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._background: Set[asyncio.Task] = set()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """Wait for background refreshes and release pooled connections."""
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+        # aclose() arrived in redis-py 5.0.1; older clients only have close().
+        close = getattr(self.redis_client, 'aclose', None) or self.redis_client.close
+        await close()
+        await self.pool.disconnect()
+
+    async def get(
+        self,
+        key: str,
+        deserialize: bool = True
+    ) -> Optional[Any]:
+        """Retrieve data from cache."""
+        found = await self.get_many([key], deserialize=deserialize)
+        return found.get(key)
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        serialize: bool = True,
+        serializer: Optional[str] = None
+    ) -> bool:
+        """Store data in cache."""
+        ttl = ttl or self.default_ttl
+        payload = self._dumps(value, serializer) if serialize else value
+        result = await self.redis_client.setex(key, ttl, payload)
+        if self.local_cache is not None:
+            self._fill_local_after_set({key: value}, {key: payload}, {}, ttl, serialize)
+        return result
+
+    async def delete(self, key: str) -> bool:
+        """Remove data from cache."""
+        return bool(await self.delete_many([key]))
+
+    async def get_many(
+        self,
+        keys: Iterable[str],
+        deserialize: bool = True
+    ) -> Dict[str, Any]:
+        """Retrieve several keys, one MGET round trip per batch.
+
+        Missing keys are omitted from the returned mapping.
+        """
+        pending = list(dict.fromkeys(keys))
+        use_local = deserialize and self.local_cache is not None
+        results = {}
+        if use_local:
+            results, pending = self._lookup_local(pending)
+
+        raw = {}
+        for chunk in self._chunks(pending):
+            if use_local:
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.mget(chunk)
+                for key in chunk:
+                    pipe.pttl(key)
+                values, *pttls = await pipe.execute()
+            else:
+                values, pttls = await self.redis_client.mget(chunk), [None] * len(chunk)
+            for key, data, pttl in zip(chunk, values, pttls):
+                if data is not None:
+                    raw[key] = (data, pttl)
+
+        results.update(self._decode_many(raw, len(pending), deserialize))
+        return results
+
+    async def set_many(
+        self,
+        mapping: Dict[str, Any],
+        ttl: Optional[Union[int, Dict[str, int]]] = None,
+        serialize: bool = True,
+        serializer: Optional[str] = None
+    ) -> bool:
+        """Store several keys with pipelined SETEX calls, one round trip per batch."""
+        ttls = ttl if isinstance(ttl, dict) else {}
+        default = ttl if not isinstance(ttl, dict) and ttl else self.default_ttl
+        payloads = {
+            key: self._dumps(value, serializer) if serialize else value
+            for key, value in mapping.items()
+        }
+        ok = True
+        for chunk in self._chunks(list(payloads)):
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in chunk:
+                pipe.setex(key, ttls.get(key) or default, payloads[key])
+            ok = all(await pipe.execute()) and ok
+
+        if self.local_cache is not None:
+            self._fill_local_after_set(mapping, payloads, ttls, default, serialize)
+        return ok
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """Remove several keys, one DEL per batch."""
+        keys = list(keys)
+        if self.local_cache is not None:
+            for key in keys:
+                self.local_cache.delete(key)
+        deleted = 0
+        for chunk in self._chunks(keys):
+            deleted += await self.redis_client.delete(*chunk)
+        return deleted
+
+    async def invalidate_pattern(
+        self,
+        pattern: str,
+        batch_size: Optional[int] = None,
+        progress: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """Invalidate all keys matching pattern with SCAN and batched UNLINK."""
+        if self.local_cache is not None:
+            self.local_cache.invalidate_pattern(pattern)
+        batch_size = batch_size or self.batch_size
+        deleted = 0
+        batch = []
+        async for key in self.redis_client.scan_iter(match=pattern, count=batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                deleted += await self.redis_client.unlink(*batch)
+                batch = []
+                if progress:
+                    progress(deleted)
+        if batch:
+            deleted += await self.redis_client.unlink(*batch)
+            if progress:
+                progress(deleted)
+        return deleted
+
+    def cache_decorator(
+        self,
+        prefix: str,
+        ttl: Optional[int] = None,
+        serializer: Optional[str] = None,
+        distributed_lock: bool = False,
+        early_refresh: Optional[float] = None
+    ):
+        """Decorator for automatic caching of coroutine functions."""
+        def decorator(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                cache_key = self.key_builder.build(prefix, args, kwargs)
+                return await self.get_or_compute(
+                    cache_key,
+                    lambda: func(*args, **kwargs),
+                    ttl=ttl,
+                    serializer=serializer,
+                    distributed_lock=distributed_lock,
+                    early_refresh=early_refresh
+                )
+            return wrapper
+        return decorator
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute_func: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        serializer: Optional[str] = None,
+        distributed_lock: bool = False,
+        lock_timeout: float = 30.0,
+        early_refresh: Optional[float] = None
+    ) -> Any:
+        """Get from cache or await compute_func and store.
+
+        Options match CacheManager.get_or_compute; concurrent misses on the
+        same key within the event loop await a single computation.
+        """
+        def compute(refresh: bool = False) -> Awaitable[Any]:
+            return self._compute_and_store(
+                key, compute_func, ttl, serializer,
+                distributed_lock, lock_timeout, early_refresh, refresh
+            )
+
+        if early_refresh is None:
+            result = await self.get(key)
+        else:
+            found = await self.get_many([key, self._refresh_key(key)])
+            result = found.get(key)
+            meta = found.get(self._refresh_key(key))
+            if result is not None and meta and self._should_refresh(*meta, early_refresh):
+                self._start_flight(key, lambda: compute(refresh=True))
+        if result is not None:
+            return result
+        return await asyncio.shield(self._start_flight(key, compute))
+
+    def _start_flight(self, key: str, compute: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        """Return the in-flight computation for key, starting one if needed."""
+        flight = self._inflight.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(compute())
+            self._inflight[key] = flight
+            self._background.add(flight)
+            flight.add_done_callback(lambda f: self._finish_flight(key, f))
+        return flight
+
+    def _finish_flight(self, key: str, flight: asyncio.Future) -> None:
+        self._background.discard(flight)
+        if self._inflight.get(key) is flight:
+            del self._inflight[key]
+        if not flight.cancelled() and flight.exception() is not None:
+            logger.error(f"Computing cache key {key} failed: {flight.exception()}")
+
+    async def _compute_and_store(
+        self,
+        key: str,
+        compute_func: Callable[[], Awaitable[Any]],
+        ttl: Optional[int],
+        serializer: Optional[str],
+        distributed_lock: bool,
+        lock_timeout: float,
+        early_refresh: Optional[float],
+        refresh: bool = False
+    ) -> Any:
+        if distributed_lock:
+            lock = self.redis_client.lock(f"{key}:lock", timeout=lock_timeout)
+            if not await lock.acquire(blocking=False):
+                result = await self._wait_for_value(key, lock_timeout)
+                if result is not None:
+                    return result
+                logger.warning(f"Timed out waiting for {key}; computing locally")
+                return await self._compute_and_store(
+                    key, compute_func, ttl, serializer, False, lock_timeout, early_refresh
+                )
+            try:
+                if not refresh:
+                    # Another process may have stored the value between our
+                    # miss and the acquire; an early refresh recomputes anyway.
+                    result = await self.get(key)
+                    if result is not None:
+                        return result
+                return await self._compute_and_store(
+                    key, compute_func, ttl, serializer, False, lock_timeout, early_refresh
+                )
+            finally:
+                try:
+                    await lock.release()
+                except LockError:
+                    # Lock expired while computing; another process may own it.
+                    pass
+
+        ttl = ttl or self.default_ttl
+        start = time.monotonic()
+        result = await compute_func()
+        delta = time.monotonic() - start
+        await self.set(key, result, ttl=ttl, serializer=serializer)
+        if early_refresh is not None:
+            await self.set(self._refresh_key(key), (delta, time.time() + ttl), ttl=ttl, serializer='pickle')
+        return result
+
+    async def _wait_for_value(self, key: str, timeout: float) -> Optional[Any]:
+        """Poll the cache with capped backoff until a value appears."""
+        deadline = time.monotonic() + timeout
+        interval = 0.01
+        while time.monotonic() < deadline:
+            await asyncio.sleep(min(interval, max(deadline - time.monotonic(), 0)))
+            result = await self.get(key)
+            if result is not None:
+                return result
+            interval = min(interval * 2, 0.5)
+        return None
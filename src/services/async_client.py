@@ -1,20 +1,167 @@
 import aiohttp
 import asyncio
-from typing import Dict, List, Optional, Union, Any
+import codecs
+import json
+import os
+import weakref
+from contextlib import asynccontextmanager
+from typing import (
+    Any, AsyncIterable, AsyncIterator, BinaryIO, Dict, Iterable, List, Optional, Tuple,
+    Union
+)
 from functools import wraps
+from urllib.parse import urlsplit
 import logging
+from .http_cache import HTTPCache
+from .rate_limiter import RateLimiter
+from .resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
 
 logger = logging.getLogger(__name__)
 
+RequestSpec = Union[str, Dict[str, Any], Tuple]
+
+class PoolStats:
+    """Connection pool counters collected through aiohttp trace hooks."""
+
+    def __init__(self):
+        self.waiting = 0
+        self.waits = 0
+        self.created = 0
+        self.reused = 0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Build a TraceConfig that updates these counters."""
+        trace = aiohttp.TraceConfig()
+
+        async def queued_start(session, ctx, params):
+            self.waits += 1
+            self.waiting += 1
+
+        async def queued_end(session, ctx, params):
+            self.waiting -= 1
+
+        async def created(session, ctx, params):
+            self.created += 1
+
+        async def reused(session, ctx, params):
+            self.reused += 1
+
+        trace.on_connection_queued_start.append(queued_start)
+        trace.on_connection_queued_end.append(queued_end)
+        trace.on_connection_create_end.append(created)
+        trace.on_connection_reuseconn.append(reused)
+        return trace
+
+
+class JSONArrayParser:
+    """Incrementally decode the items of a top-level JSON array."""
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._started = False
+        self._finished = False
+        # Between items: either a ',' or the closing ']' must come next.
+        self._after_item = False
+        self._after_comma = False
+
+    def feed(self, data: bytes, final: bool = False) -> List[Any]:
+        """Consume raw bytes and return the items completed so far."""
+        self._buffer += self._text.decode(data, final)
+        items = []
+        pos = 0
+        buf = self._buffer
+        while not self._finished:
+            while pos < len(buf) and buf[pos] in ' \t\r\n':
+                pos += 1
+            if pos >= len(buf):
+                break
+            char = buf[pos]
+            if not self._started:
+                if char != '[':
+                    raise ValueError("Expected '[' at start of JSON array")
+                self._started = True
+                pos += 1
+                continue
+            if self._after_item:
+                if char not in ',]':
+                    raise ValueError("Expected ',' or ']' after JSON array item")
+                self._after_item = False
+                self._after_comma = char == ','
+                self._finished = char == ']'
+                pos += 1
+                continue
+            if char == ']' and not self._after_comma:
+                self._finished = True
+                pos += 1
+                break
+            if char in ',]':
+                raise ValueError("Expected a value in JSON array")
+            try:
+                item, end = self._decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                break
+            # Only accept a value once its delimiter has arrived: "3." decodes
+            # as 3 but may continue as "3.5" in the next chunk.
+            delim = end
+            while delim < len(buf) and buf[delim] in ' \t\r\n':
+                delim += 1
+            if delim == len(buf) or buf[delim] not in ',]':
+                if final:
+                    raise ValueError("Malformed JSON array")
+                break
+            items.append(item)
+            self._after_item = True
+            self._after_comma = False
+            pos = end
+        self._buffer = buf[pos:]
+        if final and not self._finished:
+            raise ValueError("Truncated JSON array")
+        return items
+
+
 class AsyncClient:
     """Asynchronous HTTP client with advanced features."""
     
-    def __init__(self, base_url: str, timeout: int = 30):
+    # Sessions shared by clients with shared_session=True, keyed by base URL
+    # and event loop: [session, stats, reference count, weakref to the loop].
+    # Entries whose loop has closed are pruned, so a later loop that reuses
+    # the same id never inherits a dead session.
+    _shared_sessions: Dict[Tuple[str, int], list] = {}
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: int = 30,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 15.0,
+        ttl_dns_cache: Optional[int] = 300,
+        shared_session: bool = False,
+        retry_policy: Optional[RetryPolicy] = None,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        rate_limiter: Optional[RateLimiter] = None,
+        http_cache: Optional[HTTPCache] = None
+    ):
         self.base_url = base_url
         self.timeout = timeout
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.shared_session = shared_session
         self._session: Optional[aiohttp.ClientSession] = None
-        self._retry_count = 3
-        self._retry_delay = 1
+        self._stats = PoolStats()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.rate_limiter = rate_limiter
+        self.http_cache = http_cache
 
     async def __aenter__(self):
         await self.create_session()
@@ -23,19 +170,81 @@ class AsyncClient:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self.close_session()
 
+    def _shared_key(self) -> Tuple[str, int]:
+        return self.base_url, id(asyncio.get_running_loop())
+
+    @classmethod
+    def _prune_shared_sessions(cls) -> None:
+        """Forget shared sessions left behind by closed or collected event loops."""
+        for key, entry in list(cls._shared_sessions.items()):
+            loop = entry[3]()
+            if loop is None or loop.is_closed():
+                cls._shared_sessions.pop(key, None)
+
     async def create_session(self):
         """Create aiohttp session with custom settings."""
+        if self._session:
+            return
+        if self.shared_session:
+            self._prune_shared_sessions()
+            entry = self._shared_sessions.get(self._shared_key())
+            if entry and not entry[0].closed:
+                entry[2] += 1
+                self._session, self._stats = entry[0], entry[1]
+                return
+
         timeout = aiohttp.ClientTimeout(total=self.timeout)
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
+            use_dns_cache=self.ttl_dns_cache is not None
+        )
+        self._stats = PoolStats()
         self._session = aiohttp.ClientSession(
+            connector=connector,
             timeout=timeout,
-            headers={'User-Agent': 'AsyncClient/1.0'}
+            headers={'User-Agent': 'AsyncClient/1.0'},
+            trace_configs=[self._stats.trace_config()]
         )
+        if self.shared_session:
+            self._shared_sessions[self._shared_key()] = [
+                self._session, self._stats, 1, weakref.ref(asyncio.get_running_loop())
+            ]
 
     async def close_session(self):
         """Close the aiohttp session."""
-        if self._session:
-            await self._session.close()
-            self._session = None
+        if not self._session:
+            return
+        session, self._session = self._session, None
+        if self.shared_session:
+            key = self._shared_key()
+            entry = self._shared_sessions.get(key)
+            if entry and entry[0] is session:
+                entry[2] -= 1
+                if entry[2] > 0:
+                    return
+                del self._shared_sessions[key]
+        await session.close()
+
+    def pool_stats(self) -> Dict[str, int]:
+        """Return connection pool usage for this client's session."""
+        connector = self._session.connector if self._session else None
+        # aiohttp exposes no public gauges; acquired and keep-alive
+        # connections are tracked in the connector's _acquired and _conns.
+        in_use = len(getattr(connector, '_acquired', ()))
+        idle = sum(len(conns) for conns in getattr(connector, '_conns', {}).values())
+        return {
+            'limit': self.limit,
+            'limit_per_host': self.limit_per_host,
+            'in_use': in_use,
+            'idle': idle,
+            'waiting': self._stats.waiting,
+            'waits': self._stats.waits,
+            'created': self._stats.created,
+            'reused': self._stats.reused
+        }
 
     async def _make_request(
         self,
@@ -48,24 +257,84 @@ class AsyncClient:
             await self.create_session()
 
         url = f"{self.base_url}{endpoint}"
-        retries = 0
+        breaker = self._breaker_for(url)
+        policy = self.retry_policy
+        attempt = 0
+        slept = 0.0
 
-        while retries < self._retry_count:
+        entry = None
+        if self.http_cache and method == 'GET':
+            cache_key = self.http_cache.key(url, kwargs.get('params'))
+            entry = self.http_cache.lookup(cache_key)
+            if entry is not None:
+                kwargs['headers'] = {
+                    **(kwargs.get('headers') or {}),
+                    **HTTPCache.conditional_headers(entry)
+                }
+
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(urlsplit(url).netloc, breaker.retry_in())
+            retry_after = None
             try:
+                if self.rate_limiter:
+                    await self.rate_limiter.acquire_async(url)
                 async with self._session.request(method, url, **kwargs) as response:
-                    response.raise_for_status()
-                    return await response.json()
-            except aiohttp.ClientError as e:
-                logger.error(f"Request failed: {e}")
-                retries += 1
-                if retries < self._retry_count:
-                    await asyncio.sleep(self._retry_delay * retries)
+                    if response.status in policy.retry_statuses:
+                        retry_after = policy.parse_retry_after(
+                            response.headers.get('Retry-After')
+                        )
+                    if self.rate_limiter:
+                        self.rate_limiter.on_response(url, response.status, retry_after)
+                    if entry is not None and response.status == 304:
+                        result = json.loads(self.http_cache.revalidated(entry))
+                    else:
+                        response.raise_for_status()
+                        if self.http_cache and method == 'GET':
+                            body = await response.read()
+                            self.http_cache.store_response(cache_key, body, response.headers)
+                            result = json.loads(body)
+                        else:
+                            result = await response.json()
+                breaker.record_success()
+                return result
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status = e.status if isinstance(e, aiohttp.ClientResponseError) else None
+                # Only server-side trouble counts against the circuit.
+                if status is None or status >= 500:
+                    breaker.record_failure()
                 else:
+                    breaker.record_success()
+                retryable = status is None or status in policy.retry_statuses
+                delay = policy.next_delay(attempt, slept, retry_after) if retryable else None
+                logger.error(f"Request failed: {e}")
+                if delay is None:
                     raise
+            except BaseException:
+                # Cancelled, or failed before an outcome was known (e.g. a
+                # corrupt cached body): a half-open trial must not stay reserved.
+                breaker.release_trial()
+                raise
+            await asyncio.sleep(delay)
+            slept += delay
+            attempt += 1
 
-    async def get(self, endpoint: str, params: Optional[Dict] = None) -> Any:
+    def _breaker_for(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(
+                self.failure_threshold, self.recovery_timeout
+            )
+        return breaker
+
+    def circuit_stats(self) -> Dict[str, Dict[str, Union[str, int]]]:
+        """Return circuit breaker state and trip counts per host."""
+        return {host: breaker.stats() for host, breaker in self._breakers.items()}
+
+    async def get(self, endpoint: str, params: Optional[Dict] = None, **kwargs) -> Any:
         """Perform GET request."""
-        return await self._make_request('GET', endpoint, params=params)
+        return await self._make_request('GET', endpoint, params=params, **kwargs)
 
     async def post(self, endpoint: str, data: Optional[Dict] = None) -> Any:
         """Perform POST request."""
@@ -78,3 +347,208 @@ class AsyncClient:
     async def delete(self, endpoint: str) -> Any:
         """Perform DELETE request."""
         return await self._make_request('DELETE', endpoint)
+
+    @staticmethod
+    def _parse_spec(spec: RequestSpec) -> Tuple[str, str, Dict[str, Any]]:
+        """Normalise a request spec to (method, endpoint, request kwargs).
+
+        A spec is an endpoint string (GET), a ``(method, endpoint[, kwargs])``
+        tuple, or a dict with ``endpoint``, optional ``method`` and any other
+        keyword arguments accepted by ``aiohttp.ClientSession.request``.
+        """
+        if isinstance(spec, str):
+            return 'GET', spec, {}
+        if isinstance(spec, dict):
+            kwargs = dict(spec)
+            method = kwargs.pop('method', 'GET')
+            return method, kwargs.pop('endpoint'), kwargs
+        method, endpoint, *rest = spec
+        return method, endpoint, dict(rest[0]) if rest else {}
+
+    async def map(
+        self,
+        requests: Union[Iterable[RequestSpec], AsyncIterable[RequestSpec]],
+        concurrency: int = 10,
+        ordered: bool = True,
+        on_error: str = 'raise'
+    ) -> AsyncIterator[Tuple[int, Any]]:
+        """Run many requests with bounded concurrency, streaming (index, result).
+
+        Specs are pulled from ``requests`` lazily, so at most ``concurrency``
+        requests are in flight and inputs need not fit in memory. With
+        ``ordered`` results come back in input order (completed results wait
+        for slower predecessors, bounded to ``2 * concurrency`` outstanding);
+        otherwise as they complete. ``on_error`` is ``'raise'`` (cancel the
+        rest and re-raise), ``'collect'`` (yield the exception as the result)
+        or ``'skip'`` (drop failed items).
+        """
+        if on_error not in ('raise', 'collect', 'skip'):
+            raise ValueError(f"Unknown error policy: {on_error}")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        if isinstance(requests, AsyncIterable):
+            source = requests.__aiter__()
+        else:
+            source = _aiter_sync(requests)
+        window = 2 * concurrency
+        pending: Dict[asyncio.Task, int] = {}
+        buffered: Dict[int, Any] = {}
+        started = next_index = 0
+        exhausted = False
+        skipped = object()
+
+        try:
+            while True:
+                while (
+                    not exhausted
+                    and len(pending) < concurrency
+                    and (not ordered or started - next_index < window)
+                ):
+                    try:
+                        spec = await source.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    method, endpoint, kwargs = self._parse_spec(spec)
+                    task = asyncio.ensure_future(self._make_request(method, endpoint, **kwargs))
+                    pending[task] = started
+                    started += 1
+
+                if not pending:
+                    break
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=pending.get):
+                    index = pending.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        outcome = task.result()
+                    elif on_error == 'raise':
+                        raise error
+                    elif on_error == 'collect':
+                        outcome = error
+                    else:
+                        outcome = skipped
+
+                    if not ordered:
+                        if outcome is not skipped:
+                            yield index, outcome
+                        continue
+                    buffered[index] = outcome
+                    while next_index in buffered:
+                        outcome = buffered.pop(next_index)
+                        if outcome is not skipped:
+                            yield next_index, outcome
+                        next_index += 1
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def gather_many(
+        self,
+        requests: Union[Iterable[RequestSpec], AsyncIterable[RequestSpec]],
+        concurrency: int = 10,
+        on_error: str = 'raise'
+    ) -> List[Any]:
+        """Collect the results of map() in input order."""
+        return [
+            result async for _, result in self.map(
+                requests, concurrency=concurrency, ordered=True, on_error=on_error
+            )
+        ]
+
+
+    @asynccontextmanager
+    async def _open_stream(self, method: str, endpoint: str, **kwargs):
+        if not self._session:
+            await self.create_session()
+        url = f"{self.base_url}{endpoint}"
+        breaker = self._breaker_for(url)
+        if not breaker.allow():
+            raise CircuitOpenError(urlsplit(url).netloc, breaker.retry_in())
+        try:
+            if self.rate_limiter:
+                await self.rate_limiter.acquire_async(url)
+            async with self._session.request(method, url, **kwargs) as response:
+                if self.rate_limiter:
+                    self.rate_limiter.on_response(
+                        url, response.status,
+                        RetryPolicy.parse_retry_after(response.headers.get('Retry-After'))
+                    )
+                if response.status >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                response.raise_for_status()
+                yield response
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled before the status arrived: free a half-open trial.
+            breaker.release_trial()
+            raise
+
+    async def stream(
+        self,
+        endpoint: str,
+        method: str = 'GET',
+        mode: str = 'chunks',
+        chunk_size: int = 64 * 1024,
+        **kwargs
+    ) -> AsyncIterator[Any]:
+        """Stream a response body without buffering it.
+
+        ``mode`` is ``'chunks'`` (raw bytes), ``'ndjson'`` (one decoded record
+        per line) or ``'json_array'`` (items of a top-level JSON array, parsed
+        incrementally). Streams are not retried because a partially consumed
+        body cannot be replayed.
+        """
+        if mode not in ('chunks', 'ndjson', 'json_array'):
+            raise ValueError(f"Unknown stream mode: {mode}")
+        async with self._open_stream(method, endpoint, **kwargs) as response:
+            chunks = response.content.iter_chunked(chunk_size)
+            if mode == 'chunks':
+                async for chunk in chunks:
+                    yield chunk
+            elif mode == 'ndjson':
+                pending = b''
+                async for chunk in chunks:
+                    lines = (pending + chunk).split(b'\n')
+                    pending = lines.pop()
+                    for line in lines:
+                        if line.strip():
+                            yield json.loads(line)
+                if pending.strip():
+                    yield json.loads(pending)
+            else:
+                parser = JSONArrayParser()
+                async for chunk in chunks:
+                    for item in parser.feed(chunk):
+                        yield item
+                for item in parser.feed(b'', final=True):
+                    yield item
+
+    async def download(
+        self,
+        endpoint: str,
+        destination: Union[str, os.PathLike, BinaryIO],
+        method: str = 'GET',
+        chunk_size: int = 64 * 1024,
+        **kwargs
+    ) -> int:
+        """Write a response body to a path or binary file object; return bytes written."""
+        written = 0
+        if isinstance(destination, (str, os.PathLike)):
+            with open(destination, 'wb') as handle:
+                return await self.download(endpoint, handle, method, chunk_size, **kwargs)
+        async for chunk in self.stream(endpoint, method, 'chunks', chunk_size, **kwargs):
+            destination.write(chunk)
+            written += len(chunk)
+        return written
+
+async def _aiter_sync(items: Iterable) -> AsyncIterator:
+    for item in items:
+        yield item
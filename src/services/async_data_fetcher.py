@@ -0,0 +1,246 @@
+import asyncio
+import io
+from collections import deque
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+import pandas as pd
+from ..data_processing.pandas_operations import PandasProcessor
+from .async_client import AsyncClient
+from .frame_reader import check_format, read_frames
+from .http_cache import HTTPCache
+from .pagination import Paginator
+from .rate_limiter import RateLimiter
+from .resilience import RetryPolicy
+
+
+class AsyncDataFetcher:
+    """DataFetcher's interface on top of AsyncClient.
+
+    Requests share one aiohttp connection pool and go through AsyncClient's
+    retry policy, circuit breakers, rate limiter and HTTP cache, so bulk and
+    paginated fetches run as tasks on a single event loop instead of one
+    thread per request. URLs are absolute.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        http_cache: Optional[HTTPCache] = None,
+        concurrency: int = 100,
+        retry_policy: Optional[RetryPolicy] = None,
+        timeout: int = 30
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.api_key = api_key
+        self.concurrency = concurrency
+        self.headers = {'Authorization': f'Bearer {api_key}'} if api_key else {}
+        self.client = AsyncClient(
+            '',
+            timeout=timeout,
+            limit=concurrency,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            http_cache=http_cache
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """Close the underlying connection pool."""
+        await self.client.close_session()
+
+    async def fetch_json_data(
+        self,
+        url: str,
+        params: Optional[Dict] = None
+    ) -> Any:
+        """Fetch JSON data from API."""
+        return await self.client.get(url, params=params, headers=self.headers)
+
+    async def iter_bulk_data(
+        self,
+        urls: List[str],
+        concurrency: Optional[int] = None,
+        return_exceptions: bool = False
+    ) -> AsyncIterator[Tuple[int, Any]]:
+        """Yield ``(index, data)`` for each URL as soon as its fetch completes."""
+        specs = ({'endpoint': url, 'headers': self.headers} for url in urls)
+        async for index, result in self.client.map(
+            specs,
+            concurrency=concurrency or self.concurrency,
+            ordered=False,
+            on_error='collect' if return_exceptions else 'raise'
+        ):
+            yield index, result
+
+    async def fetch_bulk_data(
+        self,
+        urls: List[str],
+        concurrency: Optional[int] = None,
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """Fetch data from multiple URLs, results in input order."""
+        return await self.client.gather_many(
+            [{'endpoint': url, 'headers': self.headers} for url in urls],
+            concurrency=concurrency or self.concurrency,
+            on_error='collect' if return_exceptions else 'raise'
+        )
+
+    async def fetch_paginated_data(
+        self,
+        url: str,
+        page_param: str = 'page',
+        limit_param: str = 'limit',
+        limit: int = 100,
+        prefetch: int = 0
+    ) -> List[Dict]:
+        """Fetch paginated data."""
+        return [
+            record async for record in self.iter_paginated_data(
+                url, page_param=page_param, limit_param=limit_param,
+                limit=limit, prefetch=prefetch
+            )
+        ]
+
+    async def iter_paginated_data(
+        self,
+        url: str,
+        page_param: str = 'page',
+        limit_param: str = 'limit',
+        limit: int = 100,
+        prefetch: int = 0,
+        start_page: int = 1,
+        params: Optional[Dict] = None,
+        records_field: Optional[str] = None,
+        cursor_param: Optional[str] = None,
+        cursor_field: Optional[str] = None,
+        next_field: Optional[str] = None
+    ) -> AsyncIterator[Dict]:
+        """Yield records page by page; options match DataFetcher.iter_paginated_data."""
+        paginator = Paginator(
+            url, page_param, limit_param, limit, prefetch, start_page,
+            params, records_field, cursor_param, cursor_field, next_field
+        )
+        if paginator.linked:
+            request = paginator.first_request()
+            while request is not None:
+                url, query = request
+                data = await self.fetch_json_data(url, params=query)
+                for record in paginator.records(data) or ():
+                    yield record
+                request = paginator.follow(data, url)
+            return
+
+        async def fetch(page: int):
+            url, query = paginator.page_request(page)
+            return paginator.records(await self.fetch_json_data(url, params=query))
+
+        pending = deque()
+        next_page = paginator.start_page
+        try:
+            while True:
+                while len(pending) <= paginator.prefetch:
+                    pending.append(asyncio.ensure_future(fetch(next_page)))
+                    next_page += 1
+                records = await pending.popleft()
+                if not records:
+                    return
+                for record in records:
+                    yield record
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def fetch_pandas_data(
+        self,
+        url: str,
+        format: str = 'csv',
+        usecols: Optional[List[str]] = None,
+        dtype: Optional[Union[str, Dict]] = None,
+        optimize: bool = False,
+        **read_kwargs
+    ) -> pd.DataFrame:
+        """Fetch data and convert to DataFrame.
+
+        The body is downloaded on the event loop and parsed in a worker
+        thread so large files do not stall other requests.
+        """
+        check_format(format)
+        source: Union[str, io.IOBase] = url
+        if urlsplit(url).scheme in ('http', 'https'):
+            buffer = io.BytesIO()
+            await self.client.download(url, buffer, headers=self.headers)
+            buffer.seek(0)
+            source = io.TextIOWrapper(buffer, encoding='utf-8') if format == 'json' else buffer
+
+        def parse() -> pd.DataFrame:
+            df = next(read_frames(source, format, None, usecols, dtype, read_kwargs))
+            return PandasProcessor.optimize_dtypes(df) if optimize else df
+
+        return await asyncio.to_thread(parse)
+
+
+class SyncDataFetcher:
+    """Blocking facade that drives an AsyncDataFetcher on a private event loop.
+
+    Gives synchronous code AsyncDataFetcher's single-threaded fan-out; it
+    must not be used from inside a running event loop.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._loop = asyncio.new_event_loop()
+        self.fetcher = AsyncDataFetcher(*args, **kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        """Close the connection pool and the private event loop."""
+        if self._loop.is_closed():
+            return
+        self._run(self.fetcher.close())
+        self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+        self._loop.close()
+
+    def _run(self, coro):
+        return self._loop.run_until_complete(coro)
+
+    def _iterate(self, agen: AsyncIterator) -> Iterator:
+        try:
+            while True:
+                try:
+                    yield self._run(agen.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            if not self._loop.is_closed():
+                self._run(agen.aclose())
+
+    def fetch_json_data(self, url: str, params: Optional[Dict] = None) -> Any:
+        return self._run(self.fetcher.fetch_json_data(url, params))
+
+    def fetch_bulk_data(self, urls: List[str], **kwargs) -> List[Any]:
+        return self._run(self.fetcher.fetch_bulk_data(urls, **kwargs))
+
+    def iter_bulk_data(self, urls: List[str], **kwargs) -> Iterator[Tuple[int, Any]]:
+        return self._iterate(self.fetcher.iter_bulk_data(urls, **kwargs))
+
+    def fetch_paginated_data(self, url: str, **kwargs) -> List[Dict]:
+        return self._run(self.fetcher.fetch_paginated_data(url, **kwargs))
+
+    def iter_paginated_data(self, url: str, **kwargs) -> Iterator[Dict]:
+        return self._iterate(self.fetcher.iter_paginated_data(url, **kwargs))
+
+    def fetch_pandas_data(self, url: str, format: str = 'csv', **kwargs) -> pd.DataFrame:
+        return self._run(self.fetcher.fetch_pandas_data(url, format, **kwargs))
@@ -0,0 +1,179 @@
+import dataclasses
+import datetime
+import decimal
+import enum
+import hashlib
+import struct
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - optional speedup
+    xxhash = None
+
+# Bump whenever the canonical encoding changes so old entries are never
+# confused with keys built by the new scheme.
+KEY_SCHEME_VERSION = 2
+
+_PRIMITIVES = (type(None), bool, int, float, str, bytes)
+
+
+def _new_hasher():
+    """Fast non-cryptographic 128-bit hasher, falling back to BLAKE2b."""
+    if xxhash is not None:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=16)
+
+
+class KeyBuilder:
+    """Build stable cache keys from call arguments.
+
+    Arguments are walked into a canonical, type-tagged byte stream that is
+    fed to a streaming hash: arrays, DataFrames and Series are hashed by
+    their buffers (no JSON round trip), dicts and sets are order-independent,
+    and dataclasses are encoded field by field. Keys for calls whose
+    arguments are all flat primitives are memoized in a bounded LRU.
+    """
+
+    def __init__(self, memo_size: int = 4096):
+        self.memo_size = memo_size
+        self._memo: "OrderedDict[Tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def build(
+        self,
+        prefix: str,
+        args: Tuple = (),
+        kwargs: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Return ``prefix:v<scheme>:<digest>`` for the given arguments."""
+        kwargs = kwargs or {}
+        memo_key = self._memo_key(prefix, args, kwargs)
+        if memo_key is not None:
+            with self._lock:
+                key = self._memo.get(memo_key)
+                if key is not None:
+                    self._memo.move_to_end(memo_key)
+                    return key
+
+        hasher = _new_hasher()
+        self._encode(args, hasher.update)
+        self._encode(kwargs, hasher.update)
+        key = f"{prefix}:v{KEY_SCHEME_VERSION}:{hasher.hexdigest()}"
+
+        if memo_key is not None and self.memo_size:
+            with self._lock:
+                self._memo[memo_key] = key
+                if len(self._memo) > self.memo_size:
+                    self._memo.popitem(last=False)
+        return key
+
+    @staticmethod
+    def _memo_key(prefix: str, args: Tuple, kwargs: Dict[str, Any]) -> Optional[Tuple]:
+        # Types are part of the memo key because 1, 1.0 and True compare equal;
+        # floats go in by their bytes so 0.0/-0.0 stay apart and NaN matches.
+        values = (*args, *kwargs.values())
+        if not all(type(v) in _PRIMITIVES for v in values):
+            return None
+        return (
+            prefix, tuple(kwargs),
+            tuple((type(v), struct.pack('<d', v) if type(v) is float else v) for v in values)
+        )
+
+    def _encode(self, value: Any, write) -> None:
+        """Write a canonical, type-tagged encoding of value."""
+        if value is None:
+            write(b'N')
+        elif value is True or value is False:
+            write(b'T' if value else b'F')
+        elif isinstance(value, enum.Enum):
+            write(b'E')
+            self._encode(f"{type(value).__module__}.{type(value).__qualname__}", write)
+            self._encode(value.value, write)
+        elif isinstance(value, int):
+            write(b'i%d;' % value)
+        elif isinstance(value, float):
+            write(b'f' + struct.pack('<d', value))
+        elif isinstance(value, str):
+            data = value.encode('utf-8', 'surrogatepass')
+            write(b's%d:' % len(data))
+            write(data)
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            data = memoryview(value).cast('B')
+            write(b'b%d:' % data.nbytes)
+            write(data)
+        elif isinstance(value, (tuple, list)):
+            write(b'(%d:' % len(value) if isinstance(value, tuple) else b'[%d:' % len(value))
+            for item in value:
+                self._encode(item, write)
+        elif isinstance(value, dict):
+            write(b'{%d:' % len(value))
+            self._encode_unordered(
+                (self._digest((k, v)) for k, v in value.items()), write
+            )
+        elif isinstance(value, (set, frozenset)):
+            write(b'<%d:' % len(value))
+            self._encode_unordered((self._digest(v) for v in value), write)
+        elif isinstance(value, np.ndarray):
+            self._encode_array(value, write)
+        elif isinstance(value, np.generic):
+            self._encode_array(np.asarray(value), write)
+        elif isinstance(value, pd.DataFrame):
+            write(b'D')
+            self._encode(tuple(value.columns), write)
+            self._encode(tuple(str(t) for t in value.dtypes), write)
+            self._encode_array(
+                pd.util.hash_pandas_object(value, index=True).to_numpy(), write
+            )
+        elif isinstance(value, pd.Series):
+            write(b'S')
+            self._encode(value.name, write)
+            self._encode(str(value.dtype), write)
+            self._encode_array(
+                pd.util.hash_pandas_object(value, index=True).to_numpy(), write
+            )
+        elif isinstance(value, pd.Index):
+            write(b'I')
+            self._encode(str(value.dtype), write)
+            self._encode_array(pd.util.hash_pandas_object(value).to_numpy(), write)
+        elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+            write(b'C')
+            self._encode(f"{type(value).__module__}.{type(value).__qualname__}", write)
+            for field in dataclasses.fields(value):
+                self._encode(field.name, write)
+                self._encode(getattr(value, field.name), write)
+        elif isinstance(value, (datetime.date, datetime.time, datetime.timedelta,
+                                decimal.Decimal, uuid.UUID)):
+            write(b'X')
+            self._encode(type(value).__name__, write)
+            self._encode(str(value), write)
+        else:
+            raise TypeError(
+                f"Cannot build a cache key from {type(value).__name__} values"
+            )
+
+    def _encode_array(self, arr: np.ndarray, write) -> None:
+        if arr.dtype.hasobject:
+            write(b'O')
+            self._encode(arr.shape, write)
+            self._encode(arr.ravel().tolist(), write)
+            return
+        write(b'A')
+        self._encode(arr.dtype.str, write)
+        self._encode(arr.shape, write)
+        write(np.ascontiguousarray(arr).reshape(-1).view(np.uint8))
+
+    def _digest(self, value: Any) -> bytes:
+        hasher = _new_hasher()
+        self._encode(value, hasher.update)
+        return hasher.digest()
+
+    @staticmethod
+    def _encode_unordered(digests, write) -> None:
+        for digest in sorted(digests):
+            write(digest)
@@ -1,27 +1,280 @@
 import redis
-from typing import Any, Dict, Optional, Union
-import pickle
-import json
-import hashlib
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+import logging
+import math
+import random
+import threading
 import time
 from functools import wraps
+from . import serializers
+from .cache_keys import KeyBuilder
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class LocalCache:
+    """Bounded in-process LRU cache with per-entry expiry."""
+
+    def __init__(self, max_size: int = 1024):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a live entry and mark it most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store an entry, evicting least recently used ones when full."""
+        if ttl <= 0:
+            self.delete(key)
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> bool:
+        """Drop a single entry."""
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def invalidate_pattern(self, pattern: str) -> int:
+        """Drop all entries whose key matches a glob-style pattern."""
+        with self._lock:
+            keys = [k for k in self._entries if fnmatchcase(k, pattern)]
+            for k in keys:
+                del self._entries[k]
+            return len(keys)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+class InvalidationHandle:
+    """Progress handle for a pattern invalidation running in the background."""
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.deleted = 0
+        self.error: Optional[BaseException] = None
+        self._done = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        """Block until the invalidation finishes and return the deleted count."""
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"Invalidation of {self.pattern!r} still running")
+        if self.error is not None:
+            raise self.error
+        return self.deleted
+
+
+class _Flight:
+    """A computation shared by every caller missing on the same key."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+    def wait(self) -> Any:
+        self.event.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class BaseCacheManager:
+    """Configuration and client-independent helpers shared by cache managers."""
 
-class CacheManager:
-    """Handle complex caching operations."""
-    
     def __init__(
         self,
-        redis_url: str,
-        default_ttl: int = 3600
+        default_ttl: int = 3600,
+        local_cache_size: Optional[int] = None,
+        local_ttl: Optional[int] = None,
+        batch_size: int = 500,
+        serializer: str = 'pickle',
+        compress_threshold: Optional[int] = None,
+        key_builder: Optional[KeyBuilder] = None,
+        local_copy: bool = False
     ):
-        self.redis_client = redis.from_url(redis_url)
         self.default_ttl = default_ttl
+        self.batch_size = batch_size
+        # Default codec (see serializers.py); payloads carry a header byte so
+        # readers always pick the right decoder regardless of this setting.
+        self.serializer = serializer
+        self.compress_threshold = compress_threshold
+        self.key_builder = key_builder or KeyBuilder()
+        # Optional near-cache in front of Redis. Entries live no longer than
+        # the Redis TTL (capped by local_ttl, which bounds staleness when other
+        # processes write the same keys). By default it holds decoded values
+        # and every hit returns the same object, so a hot read costs one dict
+        # lookup: values served from it are read-only, and mutating one
+        # corrupts later hits. set() stores a decoded copy, never the
+        # caller's object. local_copy=True instead keeps encoded payloads and
+        # decodes a private copy on every hit, at the cost of a deserialize.
+        self.local_cache = LocalCache(local_cache_size) if local_cache_size else None
+        self.local_ttl = local_ttl
+        self.local_copy = local_copy
+        self._stats = {
+            'local': {'hits': 0, 'misses': 0},
+            'redis': {'hits': 0, 'misses': 0}
+        }
 
     def _generate_key(self, base_key: str, params: Dict) -> str:
         """Generate unique cache key."""
-        param_str = json.dumps(params, sort_keys=True)
-        hash_str = hashlib.md5(param_str.encode()).hexdigest()
-        return f"{base_key}:{hash_str}"
+        return self.key_builder.build(base_key, kwargs=params)
+
+    def _dumps(self, value: Any, serializer: Optional[str] = None) -> bytes:
+        return serializers.dumps(
+            value,
+            serializer or self.serializer,
+            compress_threshold=self.compress_threshold
+        )
+
+    def _record(self, tier: str, hit: bool) -> None:
+        self._stats[tier]['hits' if hit else 'misses'] += 1
+
+    def _store_local(self, key: str, payload: bytes, ttl: float, value: Any = _MISSING) -> None:
+        """Fill the local tier; value is a freshly decoded payload, when one exists."""
+        if self.local_ttl is not None:
+            ttl = min(ttl, self.local_ttl)
+        if self.local_copy:
+            stored = payload
+        else:
+            stored = serializers.loads(payload) if value is _MISSING else value
+        self.local_cache.set(key, stored, ttl)
+
+    def _get_local(self, key: str) -> Any:
+        stored = self.local_cache.get(key, _MISSING)
+        if stored is _MISSING or not self.local_copy:
+            return stored
+        return serializers.loads(stored)
+
+    def _chunks(self, items: List) -> Iterator[List]:
+        for start in range(0, len(items), self.batch_size):
+            yield items[start:start + self.batch_size]
+
+    def get_stats(self) -> Dict[str, Dict[str, Union[int, str]]]:
+        """Return hit/miss counters per cache tier.
+
+        The local tier also reports its ``mode``: ``'shared'`` (hits return
+        one read-only object) or ``'copy'`` (hits decode a private copy).
+        """
+        stats = {tier: dict(counts) for tier, counts in self._stats.items()}
+        if self.local_cache is not None:
+            stats['local']['mode'] = 'copy' if self.local_copy else 'shared'
+            stats['local']['size'] = len(self.local_cache)
+            stats['local']['evictions'] = self.local_cache.evictions
+        return stats
+
+    def _lookup_local(self, keys: List[str]) -> tuple:
+        """Split keys into local-tier hits and keys that must go to Redis."""
+        hits, misses = {}, []
+        for key in keys:
+            value = self._get_local(key)
+            if value is _MISSING:
+                misses.append(key)
+            else:
+                hits[key] = value
+        self._stats['local']['hits'] += len(hits)
+        self._stats['local']['misses'] += len(misses)
+        return hits, misses
+
+    def _decode_many(
+        self,
+        raw: Dict[str, tuple],
+        requested: int,
+        deserialize: bool
+    ) -> Dict[str, Any]:
+        """Deserialize (payload, pttl) pairs in one pass, filling the local tier."""
+        self._stats['redis']['hits'] += len(raw)
+        self._stats['redis']['misses'] += requested - len(raw)
+        results = {}
+        for key, (data, pttl) in raw.items():
+            if not deserialize:
+                results[key] = data
+                continue
+            value = serializers.loads(data)
+            if pttl is not None and pttl > 0:
+                self._store_local(key, data, pttl / 1000, value)
+            results[key] = value
+        return results
+
+    def _fill_local_after_set(
+        self,
+        mapping: Dict[str, Any],
+        payloads: Dict[str, bytes],
+        ttls: Dict[str, int],
+        default: int,
+        serialize: bool
+    ) -> None:
+        for key, value in mapping.items():
+            if serialize:
+                self._store_local(key, payloads[key], ttls.get(key) or default)
+            else:
+                self.local_cache.delete(key)
+
+    @staticmethod
+    def _refresh_key(key: str) -> str:
+        return f"{key}:xfetch"
+
+    @staticmethod
+    def _should_refresh(delta: float, expires_at: float, beta: float) -> bool:
+        # XFetch: the closer to expiry and the slower the computation, the
+        # likelier a caller is to volunteer for an early refresh.
+        return time.time() - delta * beta * math.log(1.0 - random.random()) >= expires_at
+
+
+class CacheManager(BaseCacheManager):
+    """Handle complex caching operations."""
+    
+    def __init__(
+        self,
+        redis_url: str,
+        default_ttl: int = 3600,
+        local_cache_size: Optional[int] = None,
+        local_ttl: Optional[int] = None,
+        batch_size: int = 500,
+        serializer: str = 'pickle',
+        compress_threshold: Optional[int] = None,
+        key_builder: Optional[KeyBuilder] = None,
+        local_copy: bool = False
+    ):
+        super().__init__(
+            default_ttl, local_cache_size, local_ttl,
+            batch_size, serializer, compress_threshold, key_builder, local_copy
+        )
+        self.redis_client = redis.from_url(redis_url)
+        self._inflight: Dict[str, _Flight] = {}
+        self._inflight_lock = threading.Lock()
 
     def get(
         self,
@@ -29,9 +282,26 @@ class CacheManager:
         deserialize: bool = True
     ) -> Optional[Any]:
         """Retrieve data from cache."""
-        data = self.redis_client.get(key)
+        if deserialize and self.local_cache is not None:
+            value = self._get_local(key)
+            if value is not _MISSING:
+                self._record('local', True)
+                return value
+            self._record('local', False)
+            # Fetch the remaining TTL in the same round trip so the local
+            # copy expires together with the Redis one.
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.get(key)
+            pipe.pttl(key)
+            data, pttl = pipe.execute()
+        else:
+            data, pttl = self.redis_client.get(key), None
+        self._record('redis', data is not None)
         if data and deserialize:
-            return pickle.loads(data)
+            value = serializers.loads(data)
+            if pttl is not None and pttl > 0:
+                self._store_local(key, data, pttl / 1000, value)
+            return value
         return data
 
     def set(
@@ -39,61 +309,306 @@ class CacheManager:
         key: str,
         value: Any,
         ttl: Optional[int] = None,
-        serialize: bool = True
+        serialize: bool = True,
+        serializer: Optional[str] = None
     ) -> bool:
         """Store data in cache."""
         ttl = ttl or self.default_ttl
-        if serialize:
-            value = pickle.dumps(value)
-        return self.redis_client.setex(key, ttl, value)
+        payload = self._dumps(value, serializer) if serialize else value
+        result = self.redis_client.setex(key, ttl, payload)
+        if self.local_cache is not None:
+            if serialize:
+                self._store_local(key, payload, ttl)
+            else:
+                self.local_cache.delete(key)
+        return result
 
     def delete(self, key: str) -> bool:
         """Remove data from cache."""
+        if self.local_cache is not None:
+            self.local_cache.delete(key)
         return bool(self.redis_client.delete(key))
 
+    def get_many(
+        self,
+        keys: Iterable[str],
+        deserialize: bool = True
+    ) -> Dict[str, Any]:
+        """Retrieve several keys, one MGET round trip per batch.
+
+        Missing keys are omitted from the returned mapping.
+        """
+        pending = list(dict.fromkeys(keys))
+        use_local = deserialize and self.local_cache is not None
+        results = {}
+        if use_local:
+            results, pending = self._lookup_local(pending)
+
+        raw = {}
+        for chunk in self._chunks(pending):
+            if use_local:
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.mget(chunk)
+                for key in chunk:
+                    pipe.pttl(key)
+                values, *pttls = pipe.execute()
+            else:
+                values, pttls = self.redis_client.mget(chunk), [None] * len(chunk)
+            for key, data, pttl in zip(chunk, values, pttls):
+                if data is not None:
+                    raw[key] = (data, pttl)
+
+        results.update(self._decode_many(raw, len(pending), deserialize))
+        return results
+
+    def set_many(
+        self,
+        mapping: Dict[str, Any],
+        ttl: Optional[Union[int, Dict[str, int]]] = None,
+        serialize: bool = True,
+        serializer: Optional[str] = None
+    ) -> bool:
+        """Store several keys with pipelined SETEX calls, one round trip per batch.
+
+        ``ttl`` may be a single value or a per-key mapping; keys without an
+        entry fall back to the default TTL.
+        """
+        ttls = ttl if isinstance(ttl, dict) else {}
+        default = ttl if not isinstance(ttl, dict) and ttl else self.default_ttl
+        payloads = {
+            key: self._dumps(value, serializer) if serialize else value
+            for key, value in mapping.items()
+        }
+        ok = True
+        for chunk in self._chunks(list(payloads)):
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in chunk:
+                pipe.setex(key, ttls.get(key) or default, payloads[key])
+            ok = all(pipe.execute()) and ok
+
+        if self.local_cache is not None:
+            self._fill_local_after_set(mapping, payloads, ttls, default, serialize)
+        return ok
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """Remove several keys, one DEL per batch."""
+        keys = list(keys)
+        if self.local_cache is not None:
+            for key in keys:
+                self.local_cache.delete(key)
+        return sum(
+            self.redis_client.delete(*chunk) for chunk in self._chunks(keys)
+        )
+
     def cache_decorator(
         self,
         prefix: str,
-        ttl: Optional[int] = None
+        ttl: Optional[int] = None,
+        serializer: Optional[str] = None,
+        distributed_lock: bool = False,
+        early_refresh: Optional[float] = None
     ):
-        """Decorator for automatic caching."""
+        """Decorator for automatic caching.
+
+        Misses go through get_or_compute, so the stampede options behave the
+        same way for decorated functions.
+        """
         def decorator(func):
             @wraps(func)
             def wrapper(*args, **kwargs):
                 # Generate cache key
-                cache_key = self._generate_key(
-                    prefix,
-                    {'args': args, 'kwargs': kwargs}
-                )
-                
-                # Try to get from cache
-                cached_result = self.get(cache_key)
-                if cached_result is not None:
-                    return cached_result
+                cache_key = self.key_builder.build(prefix, args, kwargs)
                 
-                # Execute function and cache result
-                result = func(*args, **kwargs)
-                self.set(cache_key, result, ttl=ttl)
-                return result
+                # Serve from cache or execute function and cache result
+                return self.get_or_compute(
+                    cache_key,
+                    lambda: func(*args, **kwargs),
+                    ttl=ttl,
+                    serializer=serializer,
+                    distributed_lock=distributed_lock,
+                    early_refresh=early_refresh
+                )
             return wrapper
         return decorator
 
-    def invalidate_pattern(self, pattern: str) -> int:
-        """Invalidate all keys matching pattern."""
-        keys = self.redis_client.keys(pattern)
-        if keys:
-            return self.redis_client.delete(*keys)
-        return 0
+    def _scan_batches(self, pattern: str, batch_size: int) -> Iterator[List]:
+        batch = []
+        for key in self.redis_client.scan_iter(match=pattern, count=batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def invalidate_pattern(
+        self,
+        pattern: str,
+        batch_size: Optional[int] = None,
+        progress: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """Invalidate all keys matching pattern.
+
+        Walks the keyspace with SCAN and removes matches with UNLINK in
+        batches, so the server is never blocked by a single KEYS call.
+        ``progress`` is called with the running deleted count after each batch.
+        """
+        if self.local_cache is not None:
+            self.local_cache.invalidate_pattern(pattern)
+        deleted = 0
+        for keys in self._scan_batches(pattern, batch_size or self.batch_size):
+            deleted += self.redis_client.unlink(*keys)
+            if progress:
+                progress(deleted)
+        return deleted
+
+    def invalidate_pattern_background(
+        self,
+        pattern: str,
+        batch_size: Optional[int] = None
+    ) -> InvalidationHandle:
+        """Run invalidate_pattern in a daemon thread and return a pollable handle."""
+        handle = InvalidationHandle(pattern)
+
+        def update(deleted: int) -> None:
+            handle.deleted = deleted
+
+        def run() -> None:
+            try:
+                handle.deleted = self.invalidate_pattern(pattern, batch_size, update)
+            except Exception as e:
+                handle.error = e
+            finally:
+                handle._done.set()
+
+        threading.Thread(
+            target=run, name=f"invalidate:{pattern}", daemon=True
+        ).start()
+        return handle
 
     def get_or_compute(
         self,
         key: str,
         compute_func: callable,
-        ttl: Optional[int] = None
+        ttl: Optional[int] = None,
+        serializer: Optional[str] = None,
+        distributed_lock: bool = False,
+        lock_timeout: float = 30.0,
+        early_refresh: Optional[float] = None
     ) -> Any:
-        """Get from cache or compute and store."""
-        result = self.get(key)
-        if result is None:
-            result = compute_func()
-            self.set(key, result, ttl=ttl)
-        return result
\ No newline at end of file
+        """Get from cache or compute and store.
+
+        Concurrent misses on the same key within this process share a single
+        computation. With ``distributed_lock`` a Redis lock elects one process
+        to recompute; the others poll the cache for up to ``lock_timeout``
+        seconds before falling back to computing themselves.
+
+        ``early_refresh`` is an XFetch beta (1.0 is a good default): entries
+        are refreshed probabilistically in a background thread before they
+        expire, while callers keep being served the current value.
+        """
+        def compute(refresh: bool = False) -> Any:
+            return self._compute_and_store(
+                key, compute_func, ttl, serializer,
+                distributed_lock, lock_timeout, early_refresh, refresh
+            )
+
+        if early_refresh is None:
+            result = self.get(key)
+        else:
+            found = self.get_many([key, self._refresh_key(key)])
+            result = found.get(key)
+            meta = found.get(self._refresh_key(key))
+            if result is not None and meta and self._should_refresh(*meta, early_refresh):
+                self._start_flight(key, lambda: compute(refresh=True), background=True)
+        if result is not None:
+            return result
+        return self._start_flight(key, compute)
+
+    def _start_flight(self, key: str, func: Callable[[], Any], background: bool = False) -> Any:
+        """Run func once per key; other callers wait for (or skip) its result."""
+        with self._inflight_lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+        if background:
+            if leader:
+                threading.Thread(
+                    target=self._run_flight, args=(key, flight, func),
+                    name=f"refresh:{key}", daemon=True
+                ).start()
+            return None
+        if leader:
+            self._run_flight(key, flight, func)
+        return flight.wait()
+
+    def _run_flight(self, key: str, flight: _Flight, func: Callable[[], Any]) -> None:
+        try:
+            flight.result = func()
+        except BaseException as e:
+            flight.error = e
+            logger.error(f"Computing cache key {key} failed: {e}")
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    def _compute_and_store(
+        self,
+        key: str,
+        compute_func: Callable[[], Any],
+        ttl: Optional[int],
+        serializer: Optional[str],
+        distributed_lock: bool,
+        lock_timeout: float,
+        early_refresh: Optional[float],
+        refresh: bool = False
+    ) -> Any:
+        if distributed_lock:
+            lock = self.redis_client.lock(f"{key}:lock", timeout=lock_timeout)
+            if not lock.acquire(blocking=False):
+                result = self._wait_for_value(key, lock_timeout)
+                if result is not None:
+                    return result
+                logger.warning(f"Timed out waiting for {key}; computing locally")
+                return self._compute_and_store(
+                    key, compute_func, ttl, serializer, False, lock_timeout, early_refresh
+                )
+            try:
+                if not refresh:
+                    # Another process may have stored the value between our
+                    # miss and the acquire; an early refresh recomputes anyway.
+                    result = self.get(key)
+                    if result is not None:
+                        return result
+                return self._compute_and_store(
+                    key, compute_func, ttl, serializer, False, lock_timeout, early_refresh
+                )
+            finally:
+                try:
+                    lock.release()
+                except redis.exceptions.LockError:
+                    # Lock expired while computing; another process may own it.
+                    pass
+
+        ttl = ttl or self.default_ttl
+        start = time.monotonic()
+        result = compute_func()
+        delta = time.monotonic() - start
+        self.set(key, result, ttl=ttl, serializer=serializer)
+        if early_refresh is not None:
+            self.set(self._refresh_key(key), (delta, time.time() + ttl), ttl=ttl, serializer='pickle')
+        return result
+
+    def _wait_for_value(self, key: str, timeout: float) -> Optional[Any]:
+        """Poll the cache with capped backoff until a value appears."""
+        deadline = time.monotonic() + timeout
+        interval = 0.01
+        while time.monotonic() < deadline:
+            time.sleep(min(interval, max(deadline - time.monotonic(), 0)))
+            result = self.get(key)
+            if result is not None:
+                return result
+            interval = min(interval * 2, 0.5)
+        return None
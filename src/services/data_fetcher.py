@@ -1,10 +1,24 @@
 import requests
-from typing import Dict, List, Optional, Union
+from requests.adapters import HTTPAdapter
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 import concurrent.futures
+import threading
 import pandas as pd
+import io
 import json
 from functools import wraps
 import time
+from collections import deque
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from ..data_processing.pandas_operations import PandasProcessor
+from .cache_keys import KeyBuilder
+from .frame_cache import FrameCache
+from .frame_reader import check_format, read_frames
+from .http_cache import HTTPCache
+from .pagination import Paginator
+from .rate_limiter import RateLimiter
+from .resilience import RetryPolicy
 
 def retry_on_failure(max_retries: int = 3, delay: int = 1):
     """Decorator for retrying failed requests."""
@@ -27,11 +41,57 @@ def retry_on_failure(max_retries: int = 3, delay: int = 1):
 class DataFetcher:
     """Handle complex data fetching operations."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        http_cache: Optional[HTTPCache] = None,
+        max_workers: int = 8,
+        frame_cache: Optional[FrameCache] = None
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
         self.api_key = api_key
+        self.rate_limiter = rate_limiter
+        self.http_cache = http_cache
+        self.frame_cache = frame_cache
+        self.max_workers = max_workers
         self.session = requests.Session()
+        # One pooled connection per worker so parallel fetches never queue
+        # on (or discard) connections to the same host.
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         if api_key:
             self.session.headers.update({'Authorization': f'Bearer {api_key}'})
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker pool and release pooled connections."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        self.session.close()
+
+    @property
+    def executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """Worker pool shared by bulk and prefetching fetches, created on first use."""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix='data-fetcher'
+                    )
+        return self._executor
     
     def process_data(self, data: Dict) -> Dict:
     # For now, do nothing fancy, just return it
@@ -44,62 +104,366 @@ class DataFetcher:
         params: Optional[Dict] = None
     ) -> Dict:
         """Fetch JSON data from API."""
-        response = self.session.get(url, params=params)
+        entry = None
+        if self.http_cache:
+            cache_key = self.http_cache.key(url, params)
+            entry = self.http_cache.lookup(cache_key)
+        if self.rate_limiter:
+            self.rate_limiter.acquire(url)
+        response = self.session.get(
+            url, params=params, headers=HTTPCache.conditional_headers(entry)
+        )
+        if self.rate_limiter:
+            self.rate_limiter.on_response(
+                url, response.status_code,
+                RetryPolicy.parse_retry_after(response.headers.get('Retry-After'))
+            )
+        if entry is not None and response.status_code == 304:
+            return json.loads(self.http_cache.revalidated(entry))
         response.raise_for_status()
+        if self.http_cache:
+            self.http_cache.store_response(cache_key, response.content, response.headers)
         return response.json()
 
     def fetch_pandas_data(
         self,
         url: str,
-        format: str = 'csv'
+        format: str = 'csv',
+        usecols: Optional[List[str]] = None,
+        dtype: Optional[Union[str, Dict]] = None,
+        optimize: bool = False,
+        **read_kwargs
     ) -> pd.DataFrame:
-        """Fetch data and convert to DataFrame."""
-        if format == 'csv':
-            return pd.read_csv(url)
-        elif format == 'excel':
-            return pd.read_excel(url)
-        elif format == 'json':
-            return pd.read_json(url)
-        raise ValueError(f"Unsupported format: {format}")
+        """Fetch data and convert to DataFrame.
+
+        With a frame cache, HTTP(S) results are stored on disk and later
+        calls revalidate them with the origin (or, without validators, reuse
+        them until they expire) instead of downloading and parsing again.
+        """
+        check_format(format)
+        if self.frame_cache is not None and urlsplit(url).scheme in ('http', 'https'):
+            key = self._frame_key('frame', url=url, format=format, usecols=usecols,
+                                  dtype=dtype, optimize=optimize, read_kwargs=read_kwargs)
+            if key is not None:
+                return self._fetch_cached_frame(key, url, format, usecols, dtype, optimize, read_kwargs)
+        with self._open_source(url, format) as source:
+            df = next(read_frames(source, format, None, usecols, dtype, read_kwargs))
+        return PandasProcessor.optimize_dtypes(df) if optimize else df
+
+    def fetch_paginated_frame(
+        self,
+        url: str,
+        cache_ttl: Optional[float] = None,
+        **paginate_kwargs
+    ) -> pd.DataFrame:
+        """Fetch every page of a paginated endpoint into one DataFrame.
+
+        Pages carry no validators for the whole result, so a frame cache
+        reuses the frame for ``cache_ttl`` seconds (default: the cache's ttl).
+        """
+        key = None
+        if self.frame_cache is not None:
+            key = self._frame_key('paginated', url=url, options=paginate_kwargs)
+            meta = self.frame_cache.meta(key) if key is not None else None
+            if meta is not None and self.frame_cache.is_fresh(meta):
+                df = self.frame_cache.get(key, meta)
+                if df is not None:
+                    return df
+        frames = list(self.iter_paginated_frames(url, **paginate_kwargs))
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        if key is not None:
+            self.frame_cache.put(key, df, ttl=cache_ttl)
+        return df
+
+    def _frame_key(self, prefix: str, **options) -> Optional[str]:
+        """Frame cache key for a request, or None if an option is unhashable."""
+        try:
+            return KeyBuilder().build(prefix, kwargs={'api_key': self.api_key, **options})
+        except TypeError:
+            return None
+
+    def _fetch_cached_frame(
+        self,
+        key: str,
+        url: str,
+        format: str,
+        usecols: Optional[List[str]],
+        dtype: Optional[Union[str, Dict]],
+        optimize: bool,
+        read_kwargs: Dict
+    ) -> pd.DataFrame:
+        meta = self.frame_cache.meta(key)
+        validated = meta is not None and (meta.get('etag') or meta.get('last_modified'))
+        if meta is not None and not validated and self.frame_cache.is_fresh(meta):
+            df = self.frame_cache.get(key, meta)
+            if df is not None:
+                return df
+
+        response = self._open_stream(url, headers=HTTPCache.conditional_headers(meta if validated else None))
+        if response.status_code == 304:
+            response.close()
+            df = self.frame_cache.get(key, meta)
+            if df is not None:
+                return df
+            # The entry was evicted between the lookup and the response.
+            response = self._open_stream(url)
+
+        with self._response_source(response, format) as source:
+            df = next(read_frames(source, format, None, usecols, dtype, read_kwargs))
+        if optimize:
+            df = PandasProcessor.optimize_dtypes(df)
+        self.frame_cache.put(
+            key, df,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified')
+        )
+        return df
+
+    def iter_pandas_data(
+        self,
+        url: str,
+        format: str = 'csv',
+        chunk_rows: int = 100000,
+        usecols: Optional[List[str]] = None,
+        dtype: Optional[Union[str, Dict]] = None,
+        optimize: bool = True,
+        downcast_floats: bool = False,
+        categorical_threshold: Optional[float] = 0.5,
+        **read_kwargs
+    ) -> Iterator[pd.DataFrame]:
+        """Stream a dataset as DataFrames of up to ``chunk_rows`` rows.
+
+        HTTP(S) URLs are read through the authenticated session as the body
+        arrives, so CSV and line-delimited JSON (``lines=True``) never hold
+        more than one chunk. Plain JSON documents and Excel workbooks cannot
+        be parsed incrementally and are split after loading. ``usecols`` and
+        ``dtype`` are passed to the parser; with ``optimize`` every chunk is
+        shrunk by PandasProcessor.optimize_dtypes, so dtypes and categories
+        may differ between chunks.
+        """
+        check_format(format)
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be positive")
+        with self._open_source(url, format) as source:
+            for chunk in read_frames(source, format, chunk_rows, usecols, dtype, read_kwargs):
+                if optimize:
+                    chunk = PandasProcessor.optimize_dtypes(
+                        chunk, downcast_floats=downcast_floats,
+                        categorical_threshold=categorical_threshold
+                    )
+                yield chunk
 
     @retry_on_failure(max_retries=3)
+    def _open_stream(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None
+    ) -> requests.Response:
+        """Send a streaming GET and return the response with its body unread."""
+        if self.rate_limiter:
+            self.rate_limiter.acquire(url)
+        response = self.session.get(url, params=params, headers=headers, stream=True)
+        if self.rate_limiter:
+            self.rate_limiter.on_response(
+                url, response.status_code,
+                RetryPolicy.parse_retry_after(response.headers.get('Retry-After'))
+            )
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()
+            raise
+        return response
+
+    @contextmanager
+    def _open_source(self, url: str, format: str):
+        """Yield something pandas can read: a response stream or a local path."""
+        if urlsplit(url).scheme not in ('http', 'https'):
+            yield url
+            return
+        with self._response_source(self._open_stream(url), format) as source:
+            yield source
+
+    @contextmanager
+    def _response_source(self, response: requests.Response, format: str):
+        """Yield a readable stream over a response body and close it afterwards."""
+        try:
+            if format == 'excel':
+                # Workbooks are zip containers and need random access.
+                yield io.BytesIO(response.content)
+            else:
+                response.raw.decode_content = True
+                if format == 'json':
+                    # The JSON reader only splits text streams into lines; keep
+                    # the raw stream open at EOF so the wrapper can see it.
+                    response.raw.auto_close = False
+                    yield io.TextIOWrapper(response.raw, encoding=response.encoding or 'utf-8')
+                else:
+                    yield response.raw
+        finally:
+            response.close()
+
     def fetch_bulk_data(
         self,
         urls: List[str],
-        parallel: bool = True
-    ) -> List[Dict]:
-        """Fetch data from multiple URLs."""
+        parallel: bool = True,
+        return_exceptions: bool = False
+    ) -> List[Union[Dict, Exception]]:
+        """Fetch data from multiple URLs.
+
+        Each URL is retried on its own by fetch_json_data. With
+        ``return_exceptions`` a URL that still fails contributes its
+        exception at its position instead of aborting the whole batch.
+        """
+        results: List[Union[Dict, Exception]] = [None] * len(urls)
         if parallel:
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                futures = [
-                    executor.submit(self.fetch_json_data, url)
-                    for url in urls
-                ]
-                return [f.result() for f in futures]
-        return [self.fetch_json_data(url) for url in urls]
+            for index, result in self.iter_bulk_data(urls, return_exceptions):
+                results[index] = result
+            return results
+        for index, url in enumerate(urls):
+            try:
+                results[index] = self.fetch_json_data(url)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results[index] = e
+        return results
+
+    def iter_bulk_data(
+        self,
+        urls: List[str],
+        return_exceptions: bool = False
+    ) -> Iterator[Tuple[int, Union[Dict, Exception]]]:
+        """Yield ``(index, data)`` for each URL as soon as its fetch completes.
+
+        Fetches run on the shared worker pool. Without ``return_exceptions``
+        the first failure is raised and fetches that have not started yet
+        are cancelled.
+        """
+        futures = {
+            self.executor.submit(self.fetch_json_data, url): index
+            for index, url in enumerate(urls)
+        }
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    result = e
+                yield futures[future], result
+        finally:
+            for future in futures:
+                future.cancel()
 
     def fetch_paginated_data(
         self,
         url: str,
         page_param: str = 'page',
         limit_param: str = 'limit',
-        limit: int = 100
+        limit: int = 100,
+        prefetch: int = 0
     ) -> List[Dict]:
         """Fetch paginated data."""
-        all_data = []
-        page = 1
-        
-        while True:
-            params = {
-                page_param: page,
-                limit_param: limit
-            }
-            
-            data = self.fetch_json_data(url, params=params)
-            if not data:
-                break
-                
-            all_data.extend(data)
-            page += 1
-            
-        return all_data
+        return list(self.iter_paginated_data(
+            url, page_param=page_param, limit_param=limit_param,
+            limit=limit, prefetch=prefetch
+        ))
+
+    def iter_paginated_data(
+        self,
+        url: str,
+        page_param: str = 'page',
+        limit_param: str = 'limit',
+        limit: int = 100,
+        prefetch: int = 0,
+        start_page: int = 1,
+        params: Optional[Dict] = None,
+        records_field: Optional[str] = None,
+        cursor_param: Optional[str] = None,
+        cursor_field: Optional[str] = None,
+        next_field: Optional[str] = None
+    ) -> Iterator[Dict]:
+        """Yield records page by page without holding the whole result set.
+
+        By default pages are numbered: ``page_param`` counts up from
+        ``start_page`` and iteration stops at the first empty page. With
+        ``prefetch`` > 0 the next ``prefetch`` pages are requested on the
+        worker pool while the current one is consumed; pages are still
+        yielded in order and queued requests are cancelled once the end is
+        reached or the generator is closed.
+
+        Setting ``cursor_field`` switches to cursor pagination: its value in
+        each response is sent back as ``cursor_param``. Setting
+        ``next_field`` follows the full URL found there instead. Both are
+        inherently sequential, so ``prefetch`` is ignored. Field names may be
+        dotted paths into nested objects, and ``records_field`` locates the
+        record list when pages are objects rather than bare lists.
+        """
+        paginator = Paginator(
+            url, page_param, limit_param, limit, prefetch, start_page,
+            params, records_field, cursor_param, cursor_field, next_field
+        )
+        if paginator.linked:
+            return self._iter_linked_pages(paginator)
+        return self._iter_numbered_pages(paginator)
+
+    def iter_paginated_frames(
+        self,
+        url: str,
+        chunk_rows: int = 10000,
+        **paginate_kwargs
+    ) -> Iterator[pd.DataFrame]:
+        """Yield DataFrames of up to ``chunk_rows`` records from a paginated endpoint."""
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be positive")
+        buffer = []
+        for record in self.iter_paginated_data(url, **paginate_kwargs):
+            buffer.append(record)
+            if len(buffer) >= chunk_rows:
+                yield pd.DataFrame.from_records(buffer)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame.from_records(buffer)
+
+    def _iter_numbered_pages(self, paginator: Paginator) -> Iterator[Dict]:
+        def fetch(page: int):
+            url, query = paginator.page_request(page)
+            return paginator.records(self.fetch_json_data(url, params=query))
+
+        prefetch = paginator.prefetch
+        if not prefetch:
+            page = paginator.start_page
+            while True:
+                records = fetch(page)
+                if not records:
+                    return
+                yield from records
+                page += 1
+
+        pending = deque()
+        next_page = paginator.start_page
+        try:
+            while True:
+                while len(pending) <= prefetch:
+                    pending.append(self.executor.submit(fetch, next_page))
+                    next_page += 1
+                records = pending.popleft().result()
+                if not records:
+                    return
+                yield from records
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _iter_linked_pages(self, paginator: Paginator) -> Iterator[Dict]:
+        request = paginator.first_request()
+        while request is not None:
+            url, query = request
+            data = self.fetch_json_data(url, params=query)
+            records = paginator.records(data)
+            if records:
+                yield from records
+            request = paginator.follow(data, url)
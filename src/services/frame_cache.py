@@ -0,0 +1,257 @@
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - optional columnar backend
+    feather = None
+
+_META = 'meta.pickle'
+# Index, column labels, categorical dtypes and non-numeric columns. Kept out
+# of the metadata so lookups and eviction scans never unpickle column data.
+_AUX = 'frame.pickle'
+
+
+class FrameCache:
+    """Size-bounded on-disk cache of DataFrames with memory-mapped reads.
+
+    Each entry is a directory holding a small metadata pickle and the frame
+    data; ``size`` in the metadata counts every data file.
+    With pyarrow installed frames are written as uncompressed Feather and
+    read back memory-mapped. Otherwise every numeric, boolean or datetime
+    column is stored as its own ``.npy`` file and loaded with
+    ``mmap_mode='c'``, so repeat loads touch no more than the pages a caller
+    reads; categorical columns keep their codes mapped and other columns are
+    pickled to a separate file. Mappings are copy-on-write: loaded frames can
+    be modified freely without changing the cache files.
+
+    Entries may carry HTTP validators (ETag / Last-Modified) for callers to
+    revalidate; entries without them expire after ``ttl`` seconds. When the
+    cache grows beyond ``max_bytes`` the least recently read entries are
+    removed.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = 3600,
+        format: str = 'auto'
+    ):
+        if format == 'auto':
+            format = 'feather' if feather is not None else 'npy'
+        if format not in ('feather', 'npy'):
+            raise ValueError(f"Unsupported format: {format}")
+        if format == 'feather' and feather is None:
+            raise ValueError("The feather format requires pyarrow")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.format = format
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest())
+
+    def meta(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored metadata for key, including its validators."""
+        try:
+            with open(os.path.join(self._path(key), _META), 'rb') as handle:
+                return pickle.load(handle)
+        except (FileNotFoundError, NotADirectoryError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def is_fresh(self, meta: Dict[str, Any]) -> bool:
+        """Whether an entry may be served without contacting the origin."""
+        expires_at = meta.get('expires_at')
+        return expires_at is None or time.time() < expires_at
+
+    def get(self, key: str, meta: Optional[Dict[str, Any]] = None) -> Optional[pd.DataFrame]:
+        """Load a cached frame regardless of freshness, or None on a miss."""
+        meta = meta or self.meta(key)
+        path = self._path(key)
+        if meta is None:
+            self.misses += 1
+            return None
+        try:
+            if meta['format'] == 'feather':
+                df = self._read_feather(path, meta)
+            else:
+                df = self._read_npy(path, meta)
+            os.utime(os.path.join(path, _META))
+        except (FileNotFoundError, ValueError, EOFError, pickle.UnpicklingError):
+            # Evicted or partially removed by another process.
+            self.misses += 1
+            return None
+        self.hits += 1
+        return df
+
+    def put(
+        self,
+        key: str,
+        df: pd.DataFrame,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        ttl: Optional[float] = None
+    ) -> None:
+        """Store df under key, replacing any previous entry atomically."""
+        validated = bool(etag or last_modified)
+        ttl = ttl if ttl is not None else self.ttl
+        meta = {
+            'key': key,
+            'format': self.format,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': time.time(),
+            'expires_at': None if validated or ttl is None else time.time() + ttl
+        }
+        tmp_dir = tempfile.mkdtemp(dir=self.directory, prefix='.tmp-')
+        try:
+            if self.format == 'feather':
+                self._write_feather(tmp_dir, df, meta)
+            else:
+                self._write_npy(tmp_dir, df, meta)
+            # Measured after every data file exists, pickled columns included.
+            meta['size'] = sum(
+                entry.stat().st_size for entry in os.scandir(tmp_dir)
+            )
+            with open(os.path.join(tmp_dir, _META), 'wb') as handle:
+                pickle.dump(meta, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            with self._lock:
+                path = self._path(key)
+                if os.path.exists(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                os.replace(tmp_dir, path)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        if self.max_bytes is not None:
+            self.evict(self.max_bytes)
+
+    def touch(self, key: str) -> None:
+        """Mark an entry as recently used after a successful revalidation."""
+        try:
+            os.utime(os.path.join(self._path(key), _META))
+        except FileNotFoundError:
+            pass
+
+    def delete(self, key: str) -> None:
+        shutil.rmtree(self._path(key), ignore_errors=True)
+
+    def clear(self) -> None:
+        for _, path, _ in self._entries():
+            shutil.rmtree(path, ignore_errors=True)
+
+    def total_bytes(self) -> int:
+        return sum(size for _, _, size in self._entries())
+
+    def evict(self, max_bytes: int) -> int:
+        """Remove least recently read entries until the cache fits max_bytes."""
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, _, size in entries)
+            removed = 0
+            for _, path, size in entries:
+                if total <= max_bytes:
+                    break
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
+                removed += 1
+            self.evictions += removed
+            return removed
+
+    def _entries(self) -> List[Tuple[float, str, int]]:
+        """(last read time, path, size) for every complete entry."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith('.tmp-') or not entry.is_dir():
+                continue
+            meta_path = os.path.join(entry.path, _META)
+            try:
+                accessed = os.stat(meta_path).st_mtime
+                with open(meta_path, 'rb') as handle:
+                    size = pickle.load(handle).get('size', 0)
+            except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+                continue
+            entries.append((accessed, entry.path, size))
+        return entries
+
+    @staticmethod
+    def _dump_aux(directory: str, aux: Dict[str, Any]) -> None:
+        with open(os.path.join(directory, _AUX), 'wb') as handle:
+            pickle.dump(aux, handle, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _load_aux(directory: str) -> Dict[str, Any]:
+        with open(os.path.join(directory, _AUX), 'rb') as handle:
+            return pickle.load(handle)
+
+    @classmethod
+    def _write_npy(cls, directory: str, df: pd.DataFrame, meta: Dict[str, Any]) -> None:
+        columns = []
+        objects = {}
+        for position in range(df.shape[1]):
+            series = df.iloc[:, position]
+            dtype = series.dtype
+            filename = f'{position}.npy'
+            if isinstance(dtype, pd.CategoricalDtype):
+                np.save(os.path.join(directory, filename), series.cat.codes.to_numpy())
+                columns.append(('categorical', filename))
+                objects[position] = dtype
+            elif isinstance(dtype, np.dtype) and not dtype.hasobject:
+                np.save(os.path.join(directory, filename), series.to_numpy())
+                columns.append(('array', filename))
+            else:
+                columns.append(('pickled', None))
+                objects[position] = series.reset_index(drop=True)
+        meta['columns'] = columns
+        cls._dump_aux(directory, {
+            'column_labels': df.columns, 'index': df.index, 'objects': objects
+        })
+
+    @classmethod
+    def _read_npy(cls, directory: str, meta: Dict[str, Any]) -> pd.DataFrame:
+        aux = cls._load_aux(directory)
+        objects = aux['objects']
+        data = {}
+        for position, (kind, filename) in enumerate(meta['columns']):
+            if kind == 'pickled':
+                extra = objects[position]
+                values = extra.to_numpy() if isinstance(extra.dtype, np.dtype) else extra.array
+            else:
+                # A plain ndarray view keeps the mapping alive without the
+                # memmap subclass leaking into pandas; writes stay private.
+                values = np.load(os.path.join(directory, filename), mmap_mode='c').view(np.ndarray)
+                if kind == 'categorical':
+                    values = pd.Categorical.from_codes(values, dtype=objects[position])
+            data[position] = values
+        df = pd.DataFrame(data, index=aux['index'], copy=False)
+        df.columns = aux['column_labels']
+        return df
+
+    @classmethod
+    def _write_feather(cls, directory: str, df: pd.DataFrame, meta: Dict[str, Any]) -> None:
+        # Feather needs unique string column names and a default index.
+        cls._dump_aux(directory, {'column_labels': df.columns, 'index': df.index})
+        table = df.set_axis([str(i) for i in range(df.shape[1])], axis=1).reset_index(drop=True)
+        feather.write_feather(table, os.path.join(directory, 'data.feather'), compression='uncompressed')
+
+    @classmethod
+    def _read_feather(cls, directory: str, meta: Dict[str, Any]) -> pd.DataFrame:
+        aux = cls._load_aux(directory)
+        df = feather.read_feather(os.path.join(directory, 'data.feather'), memory_map=True)
+        df.columns = aux['column_labels']
+        df.index = aux['index']
+        return df
@@ -0,0 +1,49 @@
+from typing import Dict, Iterator, List, Optional, Union
+import pandas as pd
+
+FORMATS = ('csv', 'excel', 'json')
+
+
+def check_format(format: str) -> None:
+    if format not in FORMATS:
+        raise ValueError(f"Unsupported format: {format}")
+
+
+def read_frames(
+    source,
+    format: str,
+    chunk_rows: Optional[int],
+    usecols: Optional[List[str]],
+    dtype: Optional[Union[str, Dict]],
+    read_kwargs: Dict
+) -> Iterator[pd.DataFrame]:
+    """Parse source into DataFrames, in chunks of chunk_rows when set.
+
+    CSV and line-delimited JSON are parsed incrementally; other JSON and
+    Excel are read whole and then sliced.
+    """
+    if format == 'csv':
+        if chunk_rows is None:
+            yield pd.read_csv(source, usecols=usecols, dtype=dtype, **read_kwargs)
+            return
+        with pd.read_csv(source, usecols=usecols, dtype=dtype,
+                         chunksize=chunk_rows, **read_kwargs) as reader:
+            yield from reader
+        return
+
+    if format == 'json':
+        if chunk_rows is not None and read_kwargs.get('lines'):
+            with pd.read_json(source, dtype=dtype, chunksize=chunk_rows, **read_kwargs) as reader:
+                for chunk in reader:
+                    yield chunk[usecols] if usecols else chunk
+            return
+        df = pd.read_json(source, dtype=dtype, **read_kwargs)
+        df = df[usecols] if usecols else df
+    else:
+        df = pd.read_excel(source, usecols=usecols, dtype=dtype, **read_kwargs)
+
+    if chunk_rows is None:
+        yield df
+        return
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
@@ -0,0 +1,147 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple, Union
+from urllib.parse import urlencode
+from .cache_manager import CacheManager, LocalCache
+
+
+class HTTPCacheStore:
+    """Backing store for HTTPCache entries."""
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class MemoryHTTPCacheStore(HTTPCacheStore):
+    """In-process LRU store."""
+
+    def __init__(self, max_size: int = 1024):
+        self._cache = LocalCache(max_size)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._cache.get(key)
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        self._cache.set(key, entry, ttl=float('inf'))
+
+    def delete(self, key: str) -> None:
+        self._cache.delete(key)
+
+
+class DiskHTTPCacheStore(HTTPCacheStore):
+    """One pickle file per entry under a directory, written atomically."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest() + '.pickle')
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), 'rb') as handle:
+                return pickle.load(handle)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as handle:
+            pickle.dump(entry, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self._path(key))
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class CacheManagerHTTPCacheStore(HTTPCacheStore):
+    """Store entries in Redis through an existing CacheManager."""
+
+    def __init__(self, cache_manager: CacheManager, ttl: Optional[int] = None, prefix: str = 'http'):
+        self.cache_manager = cache_manager
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.cache_manager.get(f"{self.prefix}:{key}")
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        self.cache_manager.set(f"{self.prefix}:{key}", entry, ttl=self.ttl)
+
+    def delete(self, key: str) -> None:
+        self.cache_manager.delete(f"{self.prefix}:{key}")
+
+
+class HTTPCache:
+    """Validator-based HTTP cache for JSON GET requests.
+
+    Responses carrying an ETag or Last-Modified header are stored with their
+    raw body. Later requests for the same URL and parameters send
+    If-None-Match / If-Modified-Since, and a 304 is answered from the stored
+    body. Bodies are re-parsed on every hit so callers never share mutable
+    results.
+    """
+
+    def __init__(self, store: Optional[HTTPCacheStore] = None):
+        self.store = store or MemoryHTTPCacheStore()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(
+        url: str,
+        params: Optional[Union[Mapping[str, Any], Iterable[Tuple[str, Any]]]] = None
+    ) -> str:
+        """Canonical cache key for a GET request."""
+        if not params:
+            return url
+        items = params.items() if hasattr(params, 'items') else params
+        query = urlencode(sorted((str(k), str(v)) for k, v in items if v is not None))
+        return f"{url}?{query}"
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(key)
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Request headers that revalidate a stored entry."""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def revalidated(self, entry: Dict[str, Any]) -> bytes:
+        """Record a 304 for entry and return its stored body."""
+        self.hits += 1
+        return entry['body']
+
+    def store_response(self, key: str, body: bytes, headers: Mapping[str, str]) -> None:
+        """Store a 200 response body if it carries validators."""
+        self.misses += 1
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if 'no-store' in headers.get('Cache-Control', ''):
+            return
+        if etag or last_modified:
+            self.store.set(key, {
+                'body': body,
+                'etag': etag,
+                'last_modified': last_modified,
+                'stored_at': time.time()
+            })
@@ -0,0 +1,94 @@
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urljoin
+
+# (url, query params) for the next page request; params is None when the URL
+# already carries its query string.
+PageRequest = Tuple[str, Optional[Dict[str, Any]]]
+
+
+def field(data: Any, path: Optional[str]) -> Any:
+    """Look up a dotted path in a decoded JSON page."""
+    if path is None:
+        return data
+    for name in path.split('.'):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(name)
+    return data
+
+
+class Paginator:
+    """Page-request state for one paginated listing, independent of transport.
+
+    The sync and async fetchers drive the same instance: for numbered pages
+    they request ``page_request(n)`` for ``n`` counting up from
+    ``start_page`` until ``records`` comes back empty; for cursor or
+    next-link pagination (``linked``) they start from ``first_request()``
+    and keep fetching whatever ``follow(page)`` returns until it is None.
+    Cursors and links already seen end the iteration, so a server that
+    repeats itself cannot loop forever.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        page_param: str = 'page',
+        limit_param: str = 'limit',
+        limit: int = 100,
+        prefetch: int = 0,
+        start_page: int = 1,
+        params: Optional[Dict] = None,
+        records_field: Optional[str] = None,
+        cursor_param: Optional[str] = None,
+        cursor_field: Optional[str] = None,
+        next_field: Optional[str] = None
+    ):
+        if cursor_field and not cursor_param:
+            raise ValueError("cursor_field requires cursor_param")
+        if prefetch < 0:
+            raise ValueError("prefetch must be non-negative")
+        self.url = url
+        self.page_param = page_param
+        self.limit_param = limit_param
+        self.limit = limit
+        self.prefetch = prefetch
+        self.start_page = start_page
+        self.params = dict(params or {})
+        self.records_field = records_field
+        self.cursor_param = cursor_param
+        self.cursor_field = cursor_field
+        self.next_field = next_field
+        self._seen = set()
+
+    @property
+    def linked(self) -> bool:
+        """Whether each request depends on the previous page."""
+        return bool(self.cursor_field or self.next_field)
+
+    def page_request(self, page: int) -> PageRequest:
+        """Request for a numbered page."""
+        return self.url, {**self.params, self.page_param: page, self.limit_param: self.limit}
+
+    def records(self, data: Any) -> Any:
+        """The record list of a decoded page (None or empty when exhausted)."""
+        return field(data, self.records_field)
+
+    def first_request(self) -> PageRequest:
+        """Request for the first page of a cursor or next-link listing."""
+        self._seen.clear()
+        return self.url, {**self.params, self.limit_param: self.limit}
+
+    def follow(self, data: Any, url: str) -> Optional[PageRequest]:
+        """Request for the page after ``data`` (fetched from url), or None at the end."""
+        if self.next_field:
+            link = field(data, self.next_field)
+            if not link or link in self._seen:
+                return None
+            self._seen.add(link)
+            # Next links already carry the query string.
+            return urljoin(url, link), None
+        cursor = field(data, self.cursor_field)
+        if cursor is None or cursor == '' or cursor in self._seen:
+            return None
+        self._seen.add(cursor)
+        return self.url, {**self.params, self.limit_param: self.limit, self.cursor_param: cursor}
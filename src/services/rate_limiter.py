@@ -0,0 +1,156 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """Thread-safe token bucket that can be awaited or blocked on.
+
+    Callers reserve tokens up front (the balance may go negative) and then
+    sleep for the deficit, so waiters are served in arrival order without
+    polling. ``pause`` stops refills until a deadline, e.g. a Retry-After.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        start = max(self._updated, self._paused_until)
+        if now > start:
+            self._tokens = min(self.capacity, self._tokens + (now - start) * self.rate)
+        self._updated = max(now, self._updated)
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens and return how long the caller must wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            wait = max(self._paused_until - now, 0.0)
+            if self._tokens < 0:
+                wait += -self._tokens / self.rate
+            return wait
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block the calling thread until tokens are available; return the wait."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """Await until tokens are available without blocking the event loop."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """Stop issuing tokens for ``seconds``."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._paused_until = max(self._paused_until, now + seconds)
+
+    def set_rate(self, rate: float) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+
+class RateLimiter:
+    """Per-host token buckets shared by the sync and async HTTP clients.
+
+    ``limits`` maps a host (``netloc`` or bare hostname) to ``(rate, burst)``
+    in requests per second; other hosts use ``default_rate`` or are
+    unlimited when it is None. With ``adaptive`` a 429 multiplies the host's
+    rate by ``decrease_factor`` and pauses it for Retry-After, and every
+    success adds back ``recovery`` of the configured rate until the
+    configured ceiling is reached again (AIMD). The decrease applies at most
+    once per ``decrease_cooldown`` or Retry-After pause, whichever is longer,
+    so a burst of 429s from requests already in flight counts as one signal.
+    """
+
+    def __init__(
+        self,
+        default_rate: Optional[float] = None,
+        default_burst: Optional[float] = None,
+        limits: Optional[Dict[str, Tuple[float, Optional[float]]]] = None,
+        adaptive: bool = True,
+        decrease_factor: float = 0.5,
+        recovery: float = 0.05,
+        min_rate: float = 0.1,
+        decrease_cooldown: float = 1.0
+    ):
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.limits = dict(limits or {})
+        self.adaptive = adaptive
+        self.decrease_factor = decrease_factor
+        self.recovery = recovery
+        self.min_rate = min_rate
+        self.decrease_cooldown = decrease_cooldown
+        self._buckets: Dict[str, Tuple[TokenBucket, float]] = {}
+        self._cooldown_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def bucket_for(self, url: str) -> Optional[TokenBucket]:
+        """Return the bucket for a URL's host, or None when it is unlimited."""
+        parts = urlsplit(url)
+        host = parts.netloc
+        entry = self._buckets.get(host)
+        if entry is not None:
+            return entry[0]
+        limit = self.limits.get(host) or self.limits.get(parts.hostname or '')
+        if limit is None and self.default_rate is None:
+            return None
+        rate, burst = limit if limit is not None else (self.default_rate, self.default_burst)
+        with self._lock:
+            entry = self._buckets.setdefault(host, (TokenBucket(rate, burst), rate))
+        return entry[0]
+
+    def acquire(self, url: str) -> float:
+        """Block until a request to url may be sent."""
+        bucket = self.bucket_for(url)
+        return bucket.acquire() if bucket else 0.0
+
+    async def acquire_async(self, url: str) -> float:
+        """Await until a request to url may be sent."""
+        bucket = self.bucket_for(url)
+        return await bucket.acquire_async() if bucket else 0.0
+
+    def on_response(self, url: str, status: int, retry_after: Optional[float] = None) -> None:
+        """Adapt the host's rate to a response status."""
+        bucket = self.bucket_for(url)
+        if bucket is None or not self.adaptive:
+            return
+        host = urlsplit(url).netloc
+        ceiling = self._buckets[host][1]
+        if status == 429:
+            now = time.monotonic()
+            with self._lock:
+                decrease = now >= self._cooldown_until.get(host, 0.0)
+                if decrease:
+                    self._cooldown_until[host] = now + max(self.decrease_cooldown, retry_after or 0.0)
+            if decrease:
+                bucket.set_rate(max(self.min_rate, bucket.rate * self.decrease_factor))
+            if retry_after:
+                bucket.pause(retry_after)
+        elif status < 400 and bucket.rate < ceiling:
+            bucket.set_rate(min(ceiling, bucket.rate + ceiling * self.recovery))
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Return the current and configured rate per host."""
+        return {
+            host: {'rate': bucket.rate, 'configured_rate': ceiling, 'capacity': bucket.capacity}
+            for host, (bucket, ceiling) in self._buckets.items()
+        }
@@ -0,0 +1,185 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Optional, Union
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is rejected by an open circuit breaker."""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"Circuit for {host} is open; retry in {retry_in:.1f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter and a per-request retry budget.
+
+    Attempt ``n`` (0-based) sleeps a random duration in
+    ``[0, min(max_delay, base_delay * 2 ** n)]`` unless the server sent a
+    ``Retry-After`` header, which takes precedence. A request gives up after
+    ``max_attempts`` or once its cumulative sleep would exceed ``budget``.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        budget: float = 60.0,
+        retry_statuses: Iterable[int] = (429, 500, 502, 503, 504),
+        respect_retry_after: bool = True
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.retry_statuses = frozenset(retry_statuses)
+        self.respect_retry_after = respect_retry_after
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number ``attempt + 1``."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def next_delay(
+        self,
+        attempt: int,
+        slept: float,
+        retry_after: Optional[float] = None
+    ) -> Optional[float]:
+        """Delay before the next attempt, or None when the request should give up."""
+        if attempt + 1 >= self.max_attempts:
+            return None
+        if retry_after is not None and self.respect_retry_after:
+            delay = retry_after
+        else:
+            delay = self.backoff(attempt)
+        if slept + delay > self.budget:
+            return None
+        return delay
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header given as seconds or an HTTP date."""
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker for a single upstream host.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail fast for ``recovery_timeout`` seconds. It then half-opens and
+    lets ``half_open_max_calls`` trial calls through: one success closes it,
+    one failure opens it again. A trial that ends without an outcome (e.g. it
+    was cancelled) must hand its slot back with ``release_trial``; slots held
+    for longer than a positive ``recovery_timeout`` are treated as abandoned.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_calls = 0
+        self._trial_started = 0.0
+        self._lock = threading.Lock()
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._trial_calls = 0
+        elif (
+            # With a zero timeout every slot would look abandoned at once and
+            # the half-open limit would no longer bound anything.
+            self._state == self.HALF_OPEN
+            and self.recovery_timeout > 0
+            and self._trial_calls >= self.half_open_max_calls
+            and time.monotonic() - self._trial_started >= self.recovery_timeout
+        ):
+            self._trial_calls = 0
+        return self._state
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit half-opens."""
+        return max(self._opened_at + self.recovery_timeout - time.monotonic(), 0.0)
+
+    def allow(self) -> bool:
+        """Return whether a call may proceed, reserving a trial slot if half-open."""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and self._trial_calls < self.half_open_max_calls:
+                self._trial_calls += 1
+                self._trial_started = time.monotonic()
+                return True
+            self.rejected += 1
+            return False
+
+    def release_trial(self) -> None:
+        """Give back a half-open trial slot whose call ended without an outcome."""
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._trial_calls > 0:
+                self._trial_calls -= 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_calls = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            state = self._current_state()
+            self._failures += 1
+            if state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if state != self.OPEN:
+                    self.trips += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_calls = 0
+
+    def stats(self) -> Dict[str, Union[str, int]]:
+        """Return the state and counters for metrics export."""
+        with self._lock:
+            return {
+                'state': self._current_state(),
+                'consecutive_failures': self._failures,
+                'trips': self.trips,
+                'rejected': self.rejected
+            }
@@ -0,0 +1,182 @@
+import pickle
+import struct
+import zlib
+from typing import Any, Dict, Optional, Union
+import numpy as np
+import pandas as pd
+
+# Every payload starts with one header byte: the low six bits carry the codec
+# id and COMPRESSED marks a zlib-compressed body. Bit 7 is never set, so
+# headerless payloads written by older versions (which start with the pickle
+# PROTO opcode 0x80) are still recognised and decoded as plain pickle.
+COMPRESSED = 0x40
+_CODEC_MASK = 0x3F
+_LEGACY_PICKLE = 0x80
+
+
+class Serializer:
+    """Base class for cache payload codecs."""
+
+    name: str = ''
+    codec_id: int = 0
+
+    def dumps(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: memoryview) -> Any:
+        raise NotImplementedError
+
+
+class PickleSerializer(Serializer):
+    """Plain in-band pickle."""
+
+    name = 'pickle'
+    codec_id = 1
+
+    def __init__(self, protocol: int = pickle.HIGHEST_PROTOCOL):
+        self.protocol = protocol
+
+    def dumps(self, value: Any) -> bytes:
+        return pickle.dumps(value, protocol=self.protocol)
+
+    def loads(self, data: memoryview) -> Any:
+        return pickle.loads(data)
+
+
+class Pickle5Serializer(Serializer):
+    """Pickle protocol 5 with out-of-band buffers.
+
+    Large contiguous buffers (ndarray data, DataFrame blocks) are written
+    once after the pickle stream instead of being copied through it.
+    Layout: buffer count, buffer lengths, stream length, stream, buffers.
+    """
+
+    name = 'pickle5'
+    codec_id = 2
+
+    def dumps(self, value: Any) -> bytes:
+        buffers = []
+        stream = pickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+        raws = [b.raw() for b in buffers]
+        head = struct.pack(
+            f'<I{len(raws)}QQ', len(raws), *(r.nbytes for r in raws), len(stream)
+        )
+        return b''.join([head, stream, *raws])
+
+    def loads(self, data: memoryview) -> Any:
+        # One writable copy so decoded arrays do not alias a read-only payload.
+        data = memoryview(bytearray(data))
+        (count,) = struct.unpack_from('<I', data)
+        *sizes, stream_len = struct.unpack_from(f'<{count}QQ', data, 4)
+        offset = 4 + 8 * (count + 1)
+        stream = data[offset:offset + stream_len]
+        offset += stream_len
+        buffers = []
+        for size in sizes:
+            buffers.append(data[offset:offset + size])
+            offset += size
+        return pickle.loads(stream, buffers=buffers)
+
+
+class NumpySerializer(Serializer):
+    """Raw-buffer codec for ndarrays with a fixed-size dtype.
+
+    Layout: dtype string length, dtype string, ndim, shape, C-ordered data.
+    """
+
+    name = 'numpy'
+    codec_id = 3
+
+    @staticmethod
+    def supports(value: Any) -> bool:
+        return (
+            type(value) is np.ndarray
+            and not value.dtype.hasobject
+            and value.dtype.fields is None
+        )
+
+    def dumps(self, value: np.ndarray) -> bytes:
+        if not self.supports(value):
+            raise TypeError(f"{self.name} serializer cannot encode {type(value).__name__}")
+        dtype = value.dtype.str.encode()
+        head = struct.pack(
+            f'<B{len(dtype)}sB{value.ndim}Q', len(dtype), dtype, value.ndim, *value.shape
+        )
+        return head + np.ascontiguousarray(value).tobytes()
+
+    def loads(self, data: memoryview) -> np.ndarray:
+        dtype_len = data[0]
+        dtype = bytes(data[1:1 + dtype_len]).decode()
+        offset = 1 + dtype_len
+        ndim = data[offset]
+        shape = struct.unpack_from(f'<{ndim}Q', data, offset + 1)
+        offset += 1 + 8 * ndim
+        return np.frombuffer(data[offset:], dtype=dtype).reshape(shape).copy()
+
+
+_REGISTRY: Dict[str, Serializer] = {}
+_BY_CODEC: Dict[int, Serializer] = {}
+
+
+def register_serializer(serializer: Serializer) -> None:
+    """Make a serializer available by name and by header codec id."""
+    if not 0 < serializer.codec_id <= _CODEC_MASK:
+        raise ValueError(f"Codec id must be between 1 and {_CODEC_MASK}")
+    existing = _BY_CODEC.get(serializer.codec_id)
+    if existing is not None and existing.name != serializer.name:
+        raise ValueError(
+            f"Codec id {serializer.codec_id} already used by {existing.name}"
+        )
+    _REGISTRY[serializer.name] = serializer
+    _BY_CODEC[serializer.codec_id] = serializer
+
+
+def get_serializer(name: str, value: Any = None) -> Serializer:
+    """Resolve a serializer name; ``auto`` picks a fast path from the value type."""
+    if name == 'auto':
+        if NumpySerializer.supports(value):
+            return _REGISTRY['numpy']
+        if isinstance(value, (np.ndarray, pd.DataFrame, pd.Series)):
+            return _REGISTRY['pickle5']
+        return _REGISTRY['pickle']
+    if name not in _REGISTRY:
+        raise ValueError(f"Unknown serializer: {name}")
+    return _REGISTRY[name]
+
+
+def dumps(
+    value: Any,
+    serializer: str = 'pickle',
+    compress_threshold: Optional[int] = None,
+    compress_level: int = 1
+) -> bytes:
+    """Encode a value and prefix it with its header byte.
+
+    Bodies larger than ``compress_threshold`` bytes are zlib-compressed.
+    """
+    codec = get_serializer(serializer, value)
+    body = codec.dumps(value)
+    header = codec.codec_id
+    if compress_threshold is not None and len(body) > compress_threshold:
+        body = zlib.compress(body, compress_level)
+        header |= COMPRESSED
+    return bytes([header]) + body
+
+
+def loads(payload: Union[bytes, bytearray, memoryview]) -> Any:
+    """Decode a payload produced by dumps (or a legacy headerless pickle)."""
+    view = memoryview(payload)
+    header = view[0]
+    if header == _LEGACY_PICKLE:
+        return pickle.loads(view)
+    codec = _BY_CODEC.get(header & _CODEC_MASK)
+    if codec is None:
+        raise ValueError(f"Unknown serializer header: {header:#04x}")
+    body = view[1:]
+    if header & COMPRESSED:
+        body = memoryview(zlib.decompress(body))
+    return codec.loads(body)
+
+
+for _serializer in (PickleSerializer(), Pickle5Serializer(), NumpySerializer()):
+    register_serializer(_serializer)
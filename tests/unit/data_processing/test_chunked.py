@@ -0,0 +1,72 @@
+import tracemalloc
+import numpy as np
+import pytest
+from src.data_processing.chunked import ChunkedProcessor
+from src.data_processing.numpy_utils import NumpyProcessor
+
+@pytest.fixture
+def matrix_path(tmp_path):
+    data = np.random.default_rng(3).normal(size=(1000, 6))
+    path = tmp_path / 'sensors.npy'
+    np.save(path, data)
+    return path, data
+
+@pytest.fixture
+def processor():
+    # 6 float64 columns -> 16 rows per block, so every operation spans many blocks.
+    return NumpyProcessor.chunked(memory_budget=3 * 16 * 48)
+
+def test_blocks_respect_memory_budget(processor, matrix_path):
+    arr = processor.open(matrix_path[0])
+
+    assert isinstance(arr, np.memmap)
+    assert processor.chunk_rows(arr) == 16
+    assert list(processor.blocks(arr))[-1] == (992, 1000)
+
+def test_cumsum_carries_across_blocks_into_output_memmap(processor, matrix_path, tmp_path):
+    path, data = matrix_path
+
+    result = processor.cumsum(path, out=tmp_path / 'cumsum.npy')
+    rowwise = processor.cumsum(path, axis=1)
+
+    assert np.allclose(np.load(tmp_path / 'cumsum.npy'), np.cumsum(data, axis=0))
+    assert isinstance(result, np.memmap)
+    assert np.allclose(rowwise, np.cumsum(data, axis=1))
+    assert processor.cumsum(np.arange(100)).tolist() == np.cumsum(np.arange(100)).tolist()
+
+@pytest.mark.parametrize('axis', [0, 1])
+def test_gradient_uses_halo_rows(processor, matrix_path, axis):
+    path, data = matrix_path
+
+    assert np.allclose(processor.gradient(path, axis=axis, spacing=0.5), np.gradient(data, 0.5, axis=axis))
+
+def test_statistics_and_standardize(processor, matrix_path):
+    path, data = matrix_path
+
+    stats = processor.statistics(path)
+    scaled = processor.standardize(path)
+
+    assert np.allclose(stats['mean'], data.mean(axis=0))
+    assert np.allclose(stats['std'], data.std(axis=0))
+    assert np.allclose(scaled, (data - data.mean(axis=0)) / data.std(axis=0))
+    assert np.allclose(processor.apply(path, np.abs), np.abs(data))
+
+@pytest.mark.parametrize('axis', [0, None])
+def test_statistics_peak_memory_stays_within_budget(tmp_path, axis):
+    data = np.random.default_rng(4).normal(size=(4000, 200))
+    path = tmp_path / 'wide.npy'
+    np.save(path, data)
+    budget = 2 ** 19
+    processor = ChunkedProcessor(memory_budget=budget)
+
+    tracemalloc.start()
+    try:
+        stats = processor.statistics(path, axis=axis)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # The file is 6.4 MB; blocks and the percentile sketch share the budget.
+    assert peak <= budget
+    assert np.allclose(stats['mean'], data.mean(axis=axis))
+    assert np.allclose(stats['percentiles'], np.percentile(data, [25, 50, 75], axis=axis), atol=0.05)
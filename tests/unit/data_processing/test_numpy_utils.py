@@ -1,6 +1,7 @@
 import pytest
 import numpy as np
-from src.data_processing.numpy_utils import NumpyProcessor, validate_array
+import pandas as pd
+from src.data_processing.numpy_utils import FFTPlan, NumpyProcessor, array_copies, validate_array
 
 def test_validate_array_decorator():
     @validate_array
@@ -42,4 +43,104 @@ def test_complex_transformations():
     assert 'fft' in result
     assert 'gradient' in result
     assert 'cumsum' in result
-    assert len(result['cumsum']) == len(arr)
\ No newline at end of file
+    assert len(result['cumsum']) == len(arr)
+def test_statistical_analysis_moments_along_any_axis():
+    arr = np.random.default_rng(0).exponential(size=(30, 20, 4))
+    for axis in (None, 0, 1, -1):
+        result = NumpyProcessor.statistical_analysis(arr, axis=axis)
+        centred = arr - arr.mean(axis=axis, keepdims=True)
+        m2 = (centred ** 2).mean(axis=axis)
+
+        assert np.allclose(result['mean'], arr.mean(axis=axis))
+        assert np.allclose(result['std'], arr.std(axis=axis))
+        assert np.allclose(result['skewness'], (centred ** 3).mean(axis=axis) / m2 ** 1.5)
+        assert np.allclose(result['kurtosis'], (centred ** 4).mean(axis=axis) / m2 ** 2 - 3)
+
+    single = NumpyProcessor.statistical_analysis(arr.astype(np.float32), axis=0, dtype=np.float32)
+    assert single['skewness'].dtype == np.float32
+    assert np.allclose(single['skewness'], NumpyProcessor.statistical_analysis(arr, axis=0)['skewness'], atol=1e-4)
+
+def test_matrix_operations_on_stacks_report_singular_items():
+    stack = np.random.default_rng(1).normal(size=(6, 3, 3))
+    stack[4] = [[1, 2, 3], [2, 4, 6], [0, 0, 1]]
+
+    result = NumpyProcessor.matrix_operations(stack, ['determinant', 'inverse', 'trace'])
+
+    assert result['singular'].tolist() == [False] * 4 + [True, False]
+    assert np.allclose(result['determinant'], np.linalg.det(stack))
+    assert np.isnan(result['inverse'][4]).all()
+    assert np.allclose(result['inverse'][0] @ stack[0], np.eye(3))
+    assert np.allclose(result['trace'], np.trace(stack, axis1=1, axis2=2))
+    assert np.isnan(NumpyProcessor.matrix_operations(stack, 'inverse')[4]).all()
+    assert NumpyProcessor.matrix_operations(stack, 'eigenvalues').shape == (6, 3)
+    with pytest.raises(ValueError):
+        NumpyProcessor.matrix_operations(stack, ['trace', 'invalid_op'])
+
+def test_matrix_operations_contract_casts_once_and_keeps_conforming_stacks():
+    operations = ['determinant', 'inverse', 'eigenvalues', 'trace']
+    name = NumpyProcessor.matrix_operations.__qualname__
+    stack = np.random.default_rng(2).normal(size=(5, 4, 4))
+    array_copies.clear()
+
+    NumpyProcessor.matrix_operations(stack, operations)
+    NumpyProcessor.matrix_operations(stack.astype(np.float32), 'inverse')
+    assert array_copies[name] == 0
+
+    result = NumpyProcessor.matrix_operations(np.array([[2, 0], [0, 3]]), operations)
+    assert array_copies[name] == 1
+    assert result['determinant'] == 6.0
+    with pytest.raises(ValueError):
+        NumpyProcessor.matrix_operations(np.ones(3), 'trace')
+
+def test_validate_array_contract_avoids_and_counts_copies(tmp_path):
+    @validate_array(dtype=[np.float64, np.float32], ndim=2)
+    def view(arr):
+        return arr
+
+    @validate_array(dtype=np.float64, order='C')
+    def contiguous(arr):
+        return arr
+
+    array_copies.clear()
+    frame = pd.DataFrame({'a': [1.0, 2.0], 'b': [3.0, 4.0]})
+    np.save(tmp_path / 'm.npy', np.ones((4, 2), dtype=np.float32))
+    mapped = np.load(tmp_path / 'm.npy', mmap_mode='r')
+
+    assert np.shares_memory(view(frame), frame.to_numpy(copy=False))
+    assert view(mapped) is mapped
+    assert array_copies[view.__qualname__] == 0
+
+    fortran = np.asfortranarray(np.ones((3, 3)))
+    assert contiguous(fortran).flags.c_contiguous
+    assert contiguous([1, 2]).dtype == np.float64
+    assert array_copies[contiguous.__qualname__] == 3
+    with pytest.raises(ValueError):
+        view(np.ones(3))
+
+@pytest.mark.parametrize('backend', ['numpy', 'scipy'])
+def test_complex_transformations_half_spectrum_along_axis(backend):
+    windows = np.random.default_rng(2).normal(size=(16, 64))
+
+    result = NumpyProcessor.complex_transformations(
+        windows.T, ['fft', 'cumsum'], axis=0, half_spectrum=True, backend=backend
+    )
+
+    assert result['fft'].shape == (33, 16)
+    assert np.allclose(result['fft'], np.fft.fft(windows, axis=1)[:, :33].T)
+    assert np.allclose(result['cumsum'], np.cumsum(windows.T, axis=0))
+    full = NumpyProcessor.complex_transformations(windows, ['fft'])['fft']
+    assert full.shape == (16, 64)
+
+def test_fft_plan_is_reusable_and_checks_length():
+    plan = FFTPlan(8, backend='scipy', workers=2)
+    signal = np.arange(8.0)
+
+    result = NumpyProcessor.complex_transformations(np.stack([signal, signal]), ['rfft'], plan=plan)
+
+    assert np.allclose(result['rfft'], np.fft.rfft(signal))
+    assert plan.frequencies() is plan.frequencies()
+    assert np.allclose(plan.frequencies(0.5), np.fft.rfftfreq(8, 0.5))
+    with pytest.raises(ValueError):
+        plan(np.arange(6.0))
+    with pytest.raises(ValueError):
+        FFTPlan(8, workers=2)
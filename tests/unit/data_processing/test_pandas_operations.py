@@ -82,3 +82,44 @@ def test_perform_merge_operations_invalid_column():
             right_df,
             merge_columns=['key']
         )
+
+def test_optimize_dtypes():
+    df = pd.DataFrame({
+        'small': [1, 2, 3, 4],
+        'signed': [-1, 400, 2, 3],
+        'value': [0.1, 0.2, 0.3, 0.4],
+        'kind': ['x', 'x', 'y', 'x'],
+        'name': ['p', 'q', 'r', 's']
+    })
+    result = PandasProcessor.optimize_dtypes(df)
+
+    assert result['small'].dtype == np.uint8
+    assert result['signed'].dtype == np.int16
+    assert result['value'].dtype == np.float64
+    assert result['kind'].dtype == 'category'
+    assert result['name'].dtype == df['name'].dtype
+    assert PandasProcessor.optimize_dtypes(df, downcast_floats=True)['value'].dtype == np.float32
+    pd.testing.assert_frame_equal(result.astype(df.dtypes.to_dict()), df)
+
+def test_optimize_dtypes_leaves_nested_json_columns_alone():
+    df = pd.json_normalize([
+        {'id': 1, 'tags': ['a', 'b'], 'meta': {'x': 1}, 'kind': 'p'},
+        {'id': 2, 'tags': ['a', 'b'], 'meta': {'x': 1}, 'kind': 'p'},
+        {'id': 3, 'tags': [], 'meta': {'x': 2}, 'kind': 'q'},
+        {'id': 4, 'tags': ['c'], 'meta': {'x': 2}, 'kind': 'p'}
+    ], max_level=0)
+    result = PandasProcessor.optimize_dtypes(df)
+
+    assert result['tags'].dtype == object
+    assert result['meta'].dtype == object
+    assert result['tags'].tolist() == df['tags'].tolist()
+    assert result['kind'].dtype == 'category'
+    assert result['id'].dtype == np.uint8
+
+def test_optimize_dtypes_keeps_duplicate_columns():
+    df = pd.DataFrame([[1, 'x', 2.5], [2, 'x', 3.5], [3, 'x', 4.5]], columns=['a', 'b', 'a'])
+    result = PandasProcessor.optimize_dtypes(df)
+
+    assert list(result.columns) == ['a', 'b', 'a']
+    assert list(result.dtypes) == [np.uint8, 'category', np.float64]
+    assert result.iloc[:, 2].tolist() == [2.5, 3.5, 4.5]
@@ -0,0 +1,44 @@
+import functools
+import numpy as np
+import pytest
+from src.data_processing.numpy_utils import NumpyProcessor
+from src.data_processing.parallel import ParallelExecutor
+
+@pytest.fixture
+def signals():
+    return np.random.default_rng(4).normal(size=(200, 64))
+
+@pytest.mark.parametrize('kind', ['thread', 'process'])
+def test_map_rows_reassembles_blocks_in_order(kind, signals):
+    with ParallelExecutor(workers=2, kind=kind) as executor:
+        result = executor.map_rows(functools.partial(np.fft.rfft, axis=-1), signals)
+
+    assert result.shape == (200, 33)
+    assert np.allclose(result, np.fft.rfft(signals))
+
+def test_process_workers_reopen_npy_memmaps(signals, tmp_path):
+    np.save(tmp_path / 'signals.npy', signals)
+    mapped = np.load(tmp_path / 'signals.npy', mmap_mode='r')
+
+    with ParallelExecutor(workers=2, kind='process') as executor:
+        result = executor.map_rows(functools.partial(np.cumsum, axis=1), mapped)
+
+    assert np.allclose(result, np.cumsum(signals, axis=1))
+
+def test_processor_methods_accept_executor(signals):
+    stack = signals.reshape(50, 4, 64)
+    with ParallelExecutor(workers=3) as executor:
+        parallel = NumpyProcessor.statistical_analysis(stack, axis=-1, executor=executor)
+        spectra = NumpyProcessor.complex_transformations(signals, ['rfft'], executor=executor)
+    serial = NumpyProcessor.statistical_analysis(stack, axis=-1)
+
+    for key in serial:
+        assert parallel[key].shape == serial[key].shape
+        assert np.allclose(parallel[key], serial[key])
+    assert np.allclose(spectra['rfft'], np.fft.rfft(signals))
+
+def test_map_rows_validates_output_rows(signals):
+    with pytest.raises(ValueError):
+        ParallelExecutor(workers=2).map_rows(lambda block: block[:1], signals)
+    with pytest.raises(ValueError):
+        ParallelExecutor(kind='gpu')
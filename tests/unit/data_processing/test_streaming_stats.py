@@ -0,0 +1,102 @@
+import pickle
+import tracemalloc
+import numpy as np
+import pytest
+from src.data_processing.numpy_utils import NumpyProcessor
+from src.data_processing.streaming_stats import (
+    ColumnDigests, MomentAccumulator, StreamingStats
+)
+
+@pytest.fixture
+def data():
+    return np.random.default_rng(0).lognormal(size=(20000, 3))
+
+def exact_moments(x):
+    centred = x - x.mean(axis=0)
+    m2 = (centred ** 2).mean(axis=0)
+    return {
+        'skewness': (centred ** 3).mean(axis=0) / m2 ** 1.5,
+        'kurtosis': (centred ** 4).mean(axis=0) / m2 ** 2 - 3
+    }
+
+def test_chunked_moments_match_full_pass(data):
+    acc = MomentAccumulator()
+    for chunk in np.array_split(data, 37):
+        acc.update(chunk)
+    expected = exact_moments(data)
+
+    assert acc.count == len(data)
+    assert np.allclose(acc.mean, data.mean(axis=0))
+    assert np.allclose(acc.std(ddof=1), data.std(axis=0, ddof=1))
+    assert np.allclose(acc.skewness(), expected['skewness'])
+    assert np.allclose(acc.kurtosis(), expected['kurtosis'])
+    assert np.array_equal(acc.max, data.max(axis=0))
+
+def test_pickled_partial_states_merge(data):
+    left = StreamingStats().update(data[:5000])
+    right = pickle.loads(pickle.dumps(StreamingStats().update(data[5000:])))
+    merged = left.merge(right).result()
+
+    assert merged['count'] == len(data)
+    assert np.allclose(merged['kurtosis'], exact_moments(data)['kurtosis'])
+    assert merged['percentiles'].shape == (3, 3)
+
+def test_digest_quantiles_are_close(data):
+    digest = ColumnDigests(1, compression=100)
+    for chunk in np.array_split(data[:, :1], 20):
+        digest.update(chunk)
+    qs = [0.01, 0.25, 0.5, 0.75, 0.99]
+
+    assert np.count_nonzero(digest.weights) <= 101
+    assert digest.count[0] == len(data)
+    assert np.allclose(digest.quantile(qs)[:, 0], np.quantile(data[:, 0], qs), rtol=0.02)
+    assert digest.quantile(0.0)[0] == data[:, 0].min()
+
+def test_column_digests_skip_nans_and_merge(data):
+    values = data.copy()
+    values[::7, 1] = np.nan
+    left = ColumnDigests(3, compression=100).update(values[:8000])
+    right = ColumnDigests(3, compression=100)
+    for chunk in np.array_split(values[8000:], 9):
+        right.update(chunk)
+    left.merge(right)
+    qs = [0.01, 0.5, 0.99]
+
+    assert np.array_equal(left.count, np.sum(~np.isnan(values), axis=0))
+    assert np.allclose(left.quantile(qs), np.nanquantile(values, qs, axis=0), rtol=0.03)
+    assert np.array_equal(left.max, np.nanmax(values, axis=0))
+
+def peak_streaming_memory(chunk, repeats):
+    stats = StreamingStats()
+    tracemalloc.start()
+    try:
+        for _ in range(repeats):
+            stats.update(chunk)
+        return tracemalloc.get_traced_memory()[1], stats
+    finally:
+        tracemalloc.stop()
+
+def test_wide_stream_memory_does_not_grow_with_rows():
+    chunk = np.random.default_rng(1).normal(size=(400, 100))
+    short, _ = peak_streaming_memory(chunk, 2)
+    long, stats = peak_streaming_memory(chunk, 40)
+
+    # 40 chunks are 12.8 MB of data; only the chunk and the centroids are held.
+    assert long < 1.1 * short
+    assert long < 4 * 2 ** 20
+    assert np.allclose(stats.result()['percentiles'][1], np.median(chunk, axis=0), atol=0.05)
+
+def test_streaming_analysis_reads_memmap_in_chunks(data, tmp_path):
+    path = tmp_path / 'data.npy'
+    np.save(path, data)
+    mapped = np.load(path, mmap_mode='r')
+
+    result = NumpyProcessor.streaming_statistical_analysis(mapped, chunk_rows=1000)
+    flat = NumpyProcessor.streaming_statistical_analysis(mapped, axis=None, chunk_rows=1000)
+
+    assert np.allclose(result['mean'], data.mean(axis=0))
+    assert np.allclose(result['percentiles'], np.percentile(data, [25, 50, 75], axis=0), rtol=0.02)
+    assert np.isclose(flat['std'], data.std())
+    assert flat['percentiles'].shape == (3,)
+    with pytest.raises(ValueError):
+        StreamingStats(axis=1)
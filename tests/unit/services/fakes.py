@@ -0,0 +1,142 @@
+"""In-memory stand-ins for the redis clients used by the cache tests."""
+import time
+from fnmatch import fnmatchcase
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        self.client.round_trips += 1
+        results = [
+            getattr(self.client, name)(*args, _count=False, **kwargs)
+            for name, args, kwargs in self.calls
+        ]
+        self.calls = []
+        return results
+
+
+class FakeLock:
+    held = set()
+
+    def __init__(self, name):
+        self.name = name
+
+    def acquire(self, blocking=True):
+        if self.name in FakeLock.held:
+            return False
+        FakeLock.held.add(self.name)
+        return True
+
+    def release(self):
+        FakeLock.held.discard(self.name)
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis client."""
+
+    def __init__(self):
+        self.store = {}
+        self.round_trips = 0
+
+    def _tick(self, count):
+        if count:
+            self.round_trips += 1
+
+    def _live(self, key):
+        entry = self.store.get(key)
+        if entry and entry[1] <= time.monotonic():
+            del self.store[key]
+            return None
+        return entry
+
+    def get(self, key, _count=True):
+        self._tick(_count)
+        entry = self._live(key)
+        return entry[0] if entry else None
+
+    def mget(self, keys, _count=True):
+        self._tick(_count)
+        return [self.get(k, _count=False) for k in keys]
+
+    def setex(self, key, ttl, value, _count=True):
+        self._tick(_count)
+        self.store[key] = (value, time.monotonic() + ttl)
+        return True
+
+    def pttl(self, key, _count=True):
+        self._tick(_count)
+        entry = self._live(key)
+        return int((entry[1] - time.monotonic()) * 1000) if entry else -2
+
+    def delete(self, *keys, _count=True):
+        self._tick(_count)
+        return sum(self.store.pop(k, None) is not None for k in keys)
+
+    def keys(self, pattern, _count=True):
+        self._tick(_count)
+        return [k for k in self.store if fnmatchcase(k, pattern)]
+
+    def scan_iter(self, match='*', count=None):
+        # Each SCAN page is one round trip.
+        matches = [k for k in list(self.store) if fnmatchcase(k, match)]
+        for start in range(0, len(matches), count or 10):
+            self.round_trips += 1
+            yield from matches[start:start + (count or 10)]
+
+    def unlink(self, *keys, _count=True):
+        return self.delete(*keys, _count=_count)
+
+    def lock(self, name, timeout=None):
+        return FakeLock(name)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class AsyncFakePipeline(FakePipeline):
+    async def execute(self):
+        return FakePipeline.execute(self)
+
+
+class AsyncFakeLock(FakeLock):
+    async def acquire(self, blocking=True):
+        return FakeLock.acquire(self, blocking)
+
+    async def release(self):
+        FakeLock.release(self)
+
+
+class AsyncFakeRedis:
+    """Coroutine facade over FakeRedis matching the redis.asyncio surface."""
+
+    def __init__(self):
+        self.sync = FakeRedis()
+
+    def __getattr__(self, name):
+        method = getattr(self.sync, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+        return call
+
+    async def scan_iter(self, match='*', count=None):
+        for key in self.sync.scan_iter(match=match, count=count):
+            yield key
+
+    def lock(self, name, timeout=None):
+        return AsyncFakeLock(name)
+
+    def pipeline(self, transaction=True):
+        return AsyncFakePipeline(self.sync)
+
+    async def aclose(self):
+        pass
@@ -0,0 +1,115 @@
+import asyncio
+import pytest
+from src.services.async_cache_manager import AsyncCacheManager
+from tests.unit.services.fakes import AsyncFakeLock, AsyncFakeRedis, FakeLock
+
+@pytest.fixture
+def cache():
+    manager = AsyncCacheManager('redis://localhost:6379', local_cache_size=10)
+    manager.redis_client = AsyncFakeRedis()
+    return manager
+
+@pytest.mark.asyncio
+async def test_set_get_delete(cache):
+    assert await cache.set('key', {'value': 1})
+    cache.local_cache.clear()
+
+    assert await cache.get('key') == {'value': 1}
+    assert await cache.get('key') == {'value': 1}
+    assert cache.get_stats()['local']['hits'] == 1
+
+    assert await cache.delete('key')
+    assert await cache.get('key') is None
+
+@pytest.mark.asyncio
+async def test_bulk_operations_and_pattern_invalidation(cache):
+    await cache.set_many({f'user:{i}': i for i in range(5)}, ttl={'user:0': 5})
+    cache.local_cache.clear()
+
+    assert await cache.get_many(['user:0', 'user:4', 'missing']) == {'user:0': 0, 'user:4': 4}
+    assert await cache.invalidate_pattern('user:*', batch_size=2) == 5
+    assert await cache.get_many([f'user:{i}' for i in range(5)]) == {}
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_compute_once(cache):
+    calls = []
+
+    @cache.cache_decorator('slow')
+    async def slow(x):
+        calls.append(x)
+        await asyncio.sleep(0.01)
+        return x * 2
+
+    results = await asyncio.gather(*(slow(21) for _ in range(10)))
+
+    assert results == [42] * 10
+    assert calls == [21]
+
+@pytest.mark.asyncio
+async def test_get_or_compute_waits_for_distributed_lock_holder(cache):
+    other_process = FakeLock('hot:lock')
+    assert other_process.acquire()
+
+    async def publish():
+        await asyncio.sleep(0.05)
+        await cache.redis_client.setex('hot', 60, cache._dumps('remote'))
+
+    async def compute():
+        return 'local'
+
+    try:
+        result, _ = await asyncio.gather(
+            cache.get_or_compute('hot', compute, distributed_lock=True, lock_timeout=5),
+            publish()
+        )
+    finally:
+        other_process.release()
+
+    assert result == 'remote'
+
+@pytest.mark.asyncio
+async def test_lock_winner_rechecks_cache_before_computing(cache, monkeypatch):
+    class LateLock(AsyncFakeLock):
+        async def acquire(self, blocking=True):
+            # Another process stores the value and releases just before us.
+            await cache.redis_client.setex('hot', 60, cache._dumps('remote'))
+            return await AsyncFakeLock.acquire(self, blocking)
+
+    monkeypatch.setattr(cache.redis_client, 'lock', lambda name, timeout=None: LateLock(name), raising=False)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return 'local'
+
+    assert await cache.get_or_compute('hot', compute, distributed_lock=True) == 'remote'
+    assert calls == []
+
+@pytest.mark.asyncio
+async def test_get_or_compute_early_refresh_serves_stale(cache, monkeypatch):
+    async def old():
+        return 'old'
+
+    async def new():
+        return 'new'
+
+    await cache.get_or_compute('hot', old, early_refresh=1.0)
+    monkeypatch.setattr(AsyncCacheManager, '_should_refresh', staticmethod(lambda *args: True))
+
+    assert await cache.get_or_compute('hot', new, early_refresh=1.0) == 'old'
+    await asyncio.gather(*cache._background)
+    assert await cache.get('hot') == 'new'
+
+@pytest.mark.asyncio
+async def test_close_falls_back_to_close_on_older_redis(cache):
+    closed = []
+
+    class LegacyClient:
+        # redis-py before 5.0.1 has close() but no aclose().
+        async def close(self):
+            closed.append(True)
+
+    cache.redis_client = LegacyClient()
+    await cache.close()
+
+    assert closed == [True]
@@ -0,0 +1,338 @@
+import asyncio
+import aiohttp
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from src.services.async_client import AsyncClient, JSONArrayParser
+from src.services.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+async def echo(request):
+    return web.json_response({'path': request.path, 'query': dict(request.query)})
+
+@pytest_asyncio.fixture
+async def server():
+    app = web.Application()
+    app.router.add_route('*', '/{tail:.*}', echo)
+    async with TestServer(app) as test_server:
+        yield test_server
+
+@pytest.mark.asyncio
+async def test_get_reuses_pooled_connection(server):
+    async with AsyncClient(str(server.make_url('')), limit=5, limit_per_host=2) as client:
+        assert await client.get('/items', params={'a': '1'}) == {'path': '/items', 'query': {'a': '1'}}
+        await client.get('/items')
+
+        stats = client.pool_stats()
+        assert stats['created'] == 1
+        assert stats['reused'] == 1
+        assert stats['idle'] == 1
+        assert stats['in_use'] == 0
+
+@pytest.mark.asyncio
+async def test_shared_session_is_reference_counted(server):
+    base_url = str(server.make_url(''))
+    first = AsyncClient(base_url, shared_session=True)
+    second = AsyncClient(base_url, shared_session=True)
+    await first.create_session()
+    await second.create_session()
+    assert first._session is second._session
+
+    await first.get('/a')
+    await second.get('/b')
+    assert second.pool_stats()['created'] == 1
+
+    session = first._session
+    await first.close_session()
+    assert not session.closed
+    await second.close_session()
+    assert session.closed
+
+def test_shared_sessions_of_closed_loops_are_pruned():
+    base_url = 'http://shared.invalid'
+
+    async def leak():
+        await AsyncClient(base_url, shared_session=True).create_session()
+
+    async def reuse():
+        client = AsyncClient(base_url, shared_session=True)
+        await client.create_session()
+        try:
+            entries = [key for key in AsyncClient._shared_sessions if key[0] == base_url]
+            return entries, client._session.closed
+        finally:
+            await client.close_session()
+
+    for _ in range(4):
+        asyncio.run(leak())
+    entries, closed = asyncio.run(reuse())
+
+    assert len(entries) == 1
+    assert not closed
+    assert not [key for key in AsyncClient._shared_sessions if key[0] == base_url]
+
+def make_slow_handler(state):
+    async def slow(request):
+        await asyncio.sleep(float(request.query.get('delay', 0)))
+        state['active'] += 1
+        state['peak'] = max(state['peak'], state['active'])
+        await asyncio.sleep(0.01)
+        state['active'] -= 1
+        if request.query.get('fail'):
+            raise web.HTTPInternalServerError()
+        return web.json_response(int(request.match_info['n']))
+    return slow
+
+@pytest_asyncio.fixture
+async def fanout_server():
+    state = {'active': 0, 'peak': 0}
+    app = web.Application()
+    app.router.add_get('/n/{n}', make_slow_handler(state))
+    async with TestServer(app) as test_server:
+        test_server.state = state
+        yield test_server
+
+@pytest.mark.asyncio
+async def test_gather_many_bounds_concurrency_and_keeps_order(fanout_server):
+    async with AsyncClient(str(fanout_server.make_url(''))) as client:
+        specs = (f'/n/{i}' for i in range(20))
+        results = await client.gather_many(specs, concurrency=3)
+
+    assert results == list(range(20))
+    assert fanout_server.state['peak'] <= 3
+
+@pytest.mark.asyncio
+async def test_map_as_completed_with_error_policies(fanout_server):
+    async with AsyncClient(
+        str(fanout_server.make_url('')),
+        retry_policy=RetryPolicy(max_attempts=1)
+    ) as client:
+        specs = [
+            {'endpoint': '/n/0', 'params': {'delay': '0.05'}},
+            ('GET', '/n/1'),
+            {'endpoint': '/n/2', 'params': {'fail': '1'}},
+        ]
+        completed = [item async for item in client.map(specs, ordered=False, on_error='skip')]
+        collected = await client.gather_many(specs, on_error='collect')
+
+        with pytest.raises(aiohttp.ClientResponseError):
+            await client.gather_many(specs)
+
+    assert completed == [(1, 1), (0, 0)]
+    assert collected[:2] == [0, 1]
+    assert isinstance(collected[2], aiohttp.ClientResponseError)
+
+async def export(request):
+    response = web.StreamResponse()
+    await response.prepare(request)
+    body = request.match_info['kind']
+    payload = {
+        'ndjson': b'{"id": 1}\n{"id": 2}\n\n{"id": 3}',
+        'array': b'[{"id": 1, "tags": ["a", "]"]}, 22, "x,y", null, 3.5]',
+    }[body]
+    for i in range(0, len(payload), 3):
+        await response.write(payload[i:i + 3])
+    await response.write_eof()
+    return response
+
+@pytest_asyncio.fixture
+async def export_server():
+    app = web.Application()
+    app.router.add_get('/export/{kind}', export)
+    async with TestServer(app) as test_server:
+        yield test_server
+
+@pytest.mark.asyncio
+async def test_stream_modes(export_server, tmp_path):
+    async with AsyncClient(str(export_server.make_url(''))) as client:
+        records = [r async for r in client.stream('/export/ndjson', mode='ndjson', chunk_size=4)]
+        items = [i async for i in client.stream('/export/array', mode='json_array', chunk_size=4)]
+        written = await client.download('/export/ndjson', tmp_path / 'out.ndjson')
+
+    assert records == [{'id': 1}, {'id': 2}, {'id': 3}]
+    assert items == [{'id': 1, 'tags': ['a', ']']}, 22, 'x,y', None, 3.5]
+    assert (tmp_path / 'out.ndjson').read_bytes().startswith(b'{"id": 1}')
+    assert written == (tmp_path / 'out.ndjson').stat().st_size
+
+def test_json_array_parser_rejects_non_arrays():
+    with pytest.raises(ValueError):
+        JSONArrayParser().feed(b'{"a": 1}')
+    with pytest.raises(ValueError):
+        JSONArrayParser().feed(b'[1, 2', final=True)
+
+@pytest.mark.parametrize('payload', [b'[1,,2]', b'[1, 2,]', b'[,1]', b'[,]', b'[1 2]', b'[1,\n ,2]'])
+def test_json_array_parser_rejects_malformed_separators(payload):
+    parser = JSONArrayParser()
+    with pytest.raises(ValueError):
+        for i in range(len(payload)):
+            parser.feed(payload[i:i + 1])
+        parser.feed(b'', final=True)
+
+def test_json_array_parser_accepts_split_separators():
+    parser = JSONArrayParser()
+    payload = b' [ 1 ,\n"a,b" , [] ,{"x": [1, 2]} ] '
+    items = [item for i in range(len(payload)) for item in parser.feed(payload[i:i + 1])]
+    items += parser.feed(b'', final=True)
+
+    assert items == [1, 'a,b', [], {'x': [1, 2]}]
+    assert JSONArrayParser().feed(b'[ ]', final=True) == []
+
+def make_flaky_handler(responses, calls):
+    async def flaky(request):
+        calls.append(request.path)
+        status, headers = responses.pop(0) if responses else (200, {})
+        if status != 200:
+            return web.Response(status=status, headers=headers)
+        return web.json_response({'ok': True})
+    return flaky
+
+async def start_flaky_server(responses, calls):
+    app = web.Application()
+    app.router.add_get('/flaky', make_flaky_handler(responses, calls))
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+@pytest.mark.asyncio
+async def test_retries_honor_retry_after_and_status_rules(monkeypatch):
+    sleeps = []
+
+    async def fake_sleep(delay, *args):
+        if delay:
+            sleeps.append(delay)
+
+    calls = []
+    server = await start_flaky_server([(503, {'Retry-After': '2'}), (502, {})], calls)
+    try:
+        policy = RetryPolicy(max_attempts=3, base_delay=0.1)
+        async with AsyncClient(str(server.make_url('')), retry_policy=policy) as client:
+            monkeypatch.setattr(asyncio, 'sleep', fake_sleep)
+            assert await client.get('/flaky') == {'ok': True}
+
+            with pytest.raises(aiohttp.ClientResponseError):
+                await client.get('/missing')
+    finally:
+        await server.close()
+
+    assert sleeps[0] == 2.0
+    assert 0 <= sleeps[1] <= 0.2
+    assert len(sleeps) == 2
+
+@pytest.mark.asyncio
+async def test_circuit_opens_and_fails_fast():
+    calls = []
+    server = await start_flaky_server([(500, {})] * 10, calls)
+    try:
+        async with AsyncClient(
+            str(server.make_url('')),
+            retry_policy=RetryPolicy(max_attempts=1),
+            failure_threshold=2,
+            recovery_timeout=60
+        ) as client:
+            for _ in range(2):
+                with pytest.raises(aiohttp.ClientResponseError):
+                    await client.get('/flaky')
+            with pytest.raises(CircuitOpenError):
+                await client.get('/flaky')
+            stats = next(iter(client.circuit_stats().values()))
+    finally:
+        await server.close()
+
+    assert len(calls) == 2
+    assert stats == {'state': 'open', 'consecutive_failures': 2, 'trips': 1, 'rejected': 1}
+
+def test_circuit_breaker_half_open_transitions():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+@pytest.mark.asyncio
+async def test_cancelled_half_open_trial_releases_its_slot():
+    responses = [503]
+
+    async def handler(request):
+        if responses:
+            return web.Response(status=responses.pop(0))
+        if request.query.get('slow'):
+            await asyncio.sleep(1)
+        return web.json_response({'ok': True})
+
+    app = web.Application()
+    app.router.add_get('/flaky', handler)
+    async with TestServer(app) as server:
+        async with AsyncClient(
+            str(server.make_url('')),
+            retry_policy=RetryPolicy(max_attempts=1),
+            failure_threshold=1,
+            recovery_timeout=0.3
+        ) as client:
+            with pytest.raises(aiohttp.ClientResponseError):
+                await client.get('/flaky')
+            await asyncio.sleep(0.3)
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(client.get('/flaky', params={'slow': '1'}), 0.1)
+            assert await client.get('/flaky') == {'ok': True}
+            stats = next(iter(client.circuit_stats().values()))
+
+    assert stats['state'] == 'closed'
+    assert stats['rejected'] == 0
+
+@pytest.mark.asyncio
+async def test_cancelled_half_open_stream_releases_its_slot():
+    responses = [503]
+
+    async def handler(request):
+        if responses:
+            return web.Response(status=responses.pop(0))
+        if request.query.get('slow'):
+            await asyncio.sleep(1)
+        return web.Response(body=b'{"id": 1}\n')
+
+    async def consume(client, **kwargs):
+        return [r async for r in client.stream('/export', mode='ndjson', **kwargs)]
+
+    app = web.Application()
+    app.router.add_get('/export', handler)
+    async with TestServer(app) as server:
+        async with AsyncClient(
+            str(server.make_url('')),
+            failure_threshold=1,
+            recovery_timeout=0.3
+        ) as client:
+            with pytest.raises(aiohttp.ClientResponseError):
+                await consume(client)
+            await asyncio.sleep(0.3)
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(consume(client, params={'slow': '1'}), 0.1)
+            assert await consume(client) == [{'id': 1}]
+            stats = next(iter(client.circuit_stats().values()))
+
+    assert stats['state'] == 'closed'
+    assert stats['rejected'] == 0
+
+def test_circuit_breaker_releases_and_expires_trial_slots(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr('src.services.resilience.time.monotonic', lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+    breaker.record_failure()
+    now[0] = 10
+    assert breaker.allow()
+    breaker.release_trial()
+    assert breaker.allow()
+    assert not breaker.allow()
+    # A reservation that never reports back is abandoned after recovery_timeout.
+    now[0] = 20
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+def test_retry_policy_budget_and_parsing():
+    policy = RetryPolicy(max_attempts=5, base_delay=1, budget=3)
+    assert policy.next_delay(0, slept=0, retry_after=2) == 2
+    assert policy.next_delay(1, slept=2, retry_after=2) is None
+    assert policy.next_delay(4, slept=0) is None
+    assert RetryPolicy.parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert RetryPolicy.parse_retry_after('soon') is None
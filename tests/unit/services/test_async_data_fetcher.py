@@ -0,0 +1,57 @@
+import pytest
+from src.services.async_data_fetcher import AsyncDataFetcher, SyncDataFetcher
+from .test_data_fetcher import http_server, json_body, paged_routes
+
+def echo_routes(request):
+    if request.path == '/bad':
+        return 404, {}, b''
+    return json_body({'path': request.path, 'auth': request.headers.get('Authorization')})
+
+@pytest.mark.asyncio
+async def test_bulk_fetch_keeps_order_and_collects_errors(http_server):
+    http_server.routes = echo_routes
+    urls = [f'{http_server.url}/{name}' for name in ('a', 'bad', 'c')]
+
+    async with AsyncDataFetcher(api_key='k', concurrency=2) as fetcher:
+        results = await fetcher.fetch_bulk_data(urls, return_exceptions=True)
+        completed = sorted([index async for index, _ in fetcher.iter_bulk_data(
+            [urls[0], urls[2]]
+        )])
+
+    assert results[0] == {'path': '/a', 'auth': 'Bearer k'}
+    assert isinstance(results[1], Exception)
+    assert results[2]['path'] == '/c'
+    assert completed == [0, 1]
+    assert sum(path == '/bad' for path, _ in http_server.requests) == 1
+
+@pytest.mark.asyncio
+async def test_paginated_prefetch_yields_in_order(http_server):
+    http_server.routes = paged_routes(total=11, per_page=3)
+
+    async with AsyncDataFetcher() as fetcher:
+        data = await fetcher.fetch_paginated_data(f'{http_server.url}/items', limit=3, prefetch=2)
+
+    assert [r['id'] for r in data] == list(range(11))
+
+@pytest.mark.asyncio
+async def test_fetch_pandas_data_parses_off_loop(http_server):
+    http_server.routes = lambda request: (200, {}, b'a,b\n1,x\n2,y\n')
+
+    async with AsyncDataFetcher() as fetcher:
+        df = await fetcher.fetch_pandas_data(f'{http_server.url}/data.csv', usecols=['a'])
+
+    assert df['a'].tolist() == [1, 2]
+    assert list(df.columns) == ['a']
+
+def test_sync_facade_drives_private_loop(http_server):
+    http_server.routes = paged_routes(total=4, per_page=2)
+
+    with SyncDataFetcher() as fetcher:
+        records = fetcher.iter_paginated_data(f'{http_server.url}/items', limit=2)
+        first = next(records)
+        records.close()
+        bulk = fetcher.fetch_bulk_data([f'{http_server.url}/items?page=1&limit=2'])
+
+    assert first == {'id': 0}
+    assert bulk == [[{'id': 0}, {'id': 1}]]
+    assert fetcher._loop.is_closed()
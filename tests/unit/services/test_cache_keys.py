@@ -0,0 +1,64 @@
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+import pytest
+from src.services.cache_keys import KEY_SCHEME_VERSION, KeyBuilder
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+@pytest.fixture
+def builder():
+    return KeyBuilder()
+
+def test_key_is_versioned_and_stable(builder):
+    key = builder.build('prefix', (1, 'a'), {'b': 2.5})
+
+    assert key.startswith(f'prefix:v{KEY_SCHEME_VERSION}:')
+    assert KeyBuilder().build('prefix', (1, 'a'), {'b': 2.5}) == key
+
+def test_types_are_distinguished(builder):
+    keys = {builder.build('p', (value,)) for value in (1, 1.0, True, '1', b'1', None)}
+    assert len(keys) == 6
+    assert builder.build('p', ([1, 2],)) != builder.build('p', ((1, 2),))
+
+def test_dicts_and_sets_are_order_independent(builder):
+    assert builder.build('p', ({'a': 1, 'b': 2},)) == builder.build('p', ({'b': 2, 'a': 1},))
+    assert builder.build('p', ({3, 1, 2},)) == builder.build('p', ({1, 2, 3},))
+    assert builder.build('p', kwargs={'a': 1, 'b': 2}) == builder.build('p', kwargs={'b': 2, 'a': 1})
+
+def test_arrays_hashed_by_content(builder):
+    arr = np.arange(10.0)
+    assert builder.build('p', (arr,)) == builder.build('p', (arr.copy(),))
+    assert builder.build('p', (arr,)) != builder.build('p', (arr.astype(np.float32),))
+    assert builder.build('p', (arr,)) != builder.build('p', (arr.reshape(2, 5),))
+    assert builder.build('p', (np.arange(4)[::2],)) == builder.build('p', (np.array([0, 2]),))
+
+def test_dataframes_and_dataclasses(builder):
+    df = pd.DataFrame({'a': [1, 2], 'b': ['x', 'y']})
+    changed = df.copy()
+    changed.loc[1, 'a'] = 3
+
+    assert builder.build('p', (df,)) == builder.build('p', (df.copy(),))
+    assert builder.build('p', (df,)) != builder.build('p', (changed,))
+    assert builder.build('p', (Point(1, 2),)) != builder.build('p', (Point(2, 1),))
+
+def test_primitive_calls_are_memoized(builder):
+    key = builder.build('p', (1, 'a'))
+    assert len(builder._memo) == 1
+    assert builder.build('p', (1, 'a')) == key
+    builder.build('p', (np.zeros(2),))
+    assert len(builder._memo) == 1
+
+def test_memoized_key_does_not_depend_on_call_order():
+    for first, second in ((0.0, -0.0), (-0.0, 0.0)):
+        builder = KeyBuilder()
+        builder.build('p', (first,), {'x': first})
+        assert builder.build('p', (second,), {'x': second}) == KeyBuilder(memo_size=0).build('p', (second,), {'x': second})
+    assert builder.build('p', (0.0,)) != builder.build('p', (-0.0,))
+
+def test_unsupported_type(builder):
+    with pytest.raises(TypeError):
+        builder.build('p', (object(),))
@@ -0,0 +1,241 @@
+import threading
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from src.services.cache_manager import CacheManager, LocalCache
+from src.services.serializers import get_serializer
+from tests.unit.services.fakes import FakeLock, FakeRedis
+
+
+@pytest.fixture
+def cache():
+    manager = CacheManager('redis://localhost:6379', local_cache_size=2)
+    manager.redis_client = FakeRedis()
+    return manager
+
+
+def test_local_cache_lru_eviction():
+    local = LocalCache(max_size=2)
+    local.set('a', 1, ttl=60)
+    local.set('b', 2, ttl=60)
+    local.get('a')
+    local.set('c', 3, ttl=60)
+
+    assert local.get('b') is None
+    assert local.get('a') == 1
+    assert local.evictions == 1
+
+def test_local_cache_expiry():
+    local = LocalCache()
+    local.set('a', 1, ttl=0.01)
+    time.sleep(0.02)
+    assert local.get('a') is None
+
+def test_hot_reads_served_locally(cache):
+    cache.set('key', {'value': 1})
+    trips = cache.redis_client.round_trips
+
+    for _ in range(10):
+        assert cache.get('key') == {'value': 1}
+
+    assert cache.redis_client.round_trips == trips
+    assert cache.get_stats()['local']['hits'] == 10
+
+def test_redis_hit_populates_local_tier(cache):
+    cache.set('key', 'value')
+    cache.local_cache.clear()
+
+    assert cache.get('key') == 'value'
+    assert cache.get('key') == 'value'
+
+    stats = cache.get_stats()
+    assert stats['redis'] == {'hits': 1, 'misses': 0}
+    assert stats['local']['hits'] == 1
+    assert stats['local']['misses'] == 1
+
+def test_delete_and_pattern_invalidate_local_tier(cache):
+    cache.set('user:1', 'a')
+    cache.set('user:2', 'b')
+
+    cache.delete('user:1')
+    assert cache.get('user:1') is None
+
+    assert cache.invalidate_pattern('user:*') == 1
+    assert cache.get('user:2') is None
+    assert len(cache.local_cache) == 0
+
+def test_set_many_and_get_many_are_batched():
+    manager = CacheManager('redis://localhost:6379', batch_size=2)
+    manager.redis_client = FakeRedis()
+
+    manager.set_many({f'k{i}': i for i in range(5)}, ttl={'k0': 10})
+    assert manager.redis_client.round_trips == 3
+    assert manager.redis_client.pttl('k0') <= 10000
+
+    trips = manager.redis_client.round_trips
+    result = manager.get_many(['k0', 'k1', 'k4', 'missing'])
+    assert result == {'k0': 0, 'k1': 1, 'k4': 4}
+    assert manager.redis_client.round_trips - trips == 2
+
+def test_get_many_uses_local_tier(cache):
+    cache.set_many({'a': 1, 'b': 2})
+    cache.local_cache.delete('b')
+
+    assert cache.get_many(['a', 'b']) == {'a': 1, 'b': 2}
+    stats = cache.get_stats()
+    assert stats['local']['hits'] == 1
+    assert stats['redis']['hits'] == 1
+    assert cache.local_cache.get('b') is not None
+
+def test_local_hits_share_one_decoded_value(cache):
+    value = {'items': [1]}
+    cache.set('key', value)
+    value['items'].append(2)
+
+    first = cache.get('key')
+    assert first == {'items': [1]}
+    assert cache.get('key') is first
+    assert cache.get_stats()['local']['mode'] == 'shared'
+
+def test_local_copy_gives_every_hit_its_own_value():
+    manager = CacheManager('redis://localhost:6379', local_cache_size=2, local_copy=True)
+    manager.redis_client = FakeRedis()
+    frame = pd.DataFrame({'a': [1, 2]})
+    manager.set('frame', frame)
+    frame.loc[0, 'a'] = 100
+    first = manager.get('frame')
+    first['b'] = 0
+
+    assert manager.get('frame').equals(pd.DataFrame({'a': [1, 2]}))
+    stats = manager.get_stats()['local']
+    assert (stats['hits'], stats['mode']) == (2, 'copy')
+
+def test_delete_many(cache):
+    cache.set_many({'a': 1, 'b': 2, 'c': 3})
+    assert cache.delete_many(['a', 'b', 'missing']) == 2
+    assert cache.get_many(['a', 'b', 'c']) == {'c': 3}
+
+def test_invalidate_pattern_scans_in_batches():
+    manager = CacheManager('redis://localhost:6379')
+    manager.redis_client = FakeRedis()
+    manager.set_many({f'user:{i}': i for i in range(7)})
+    manager.set('other', 1)
+
+    progress = []
+    deleted = manager.invalidate_pattern('user:*', batch_size=3, progress=progress.append)
+
+    assert deleted == 7
+    assert progress == [3, 6, 7]
+    assert list(manager.redis_client.store) == ['other']
+
+def test_invalidate_pattern_background(cache):
+    cache.set_many({f'user:{i}': i for i in range(5)})
+
+    handle = cache.invalidate_pattern_background('user:*', batch_size=2)
+
+    assert handle.wait(timeout=5) == 5
+    assert handle.done
+    assert cache.get_many([f'user:{i}' for i in range(5)]) == {}
+
+def test_cache_decorator_with_serializer(cache):
+    calls = []
+
+    @cache.cache_decorator('arrays', serializer='auto')
+    def make_array(n):
+        calls.append(n)
+        return np.arange(n)
+
+    assert np.array_equal(make_array(3), np.arange(3))
+    cache.local_cache.clear()
+    assert np.array_equal(make_array(3), np.arange(3))
+    assert calls == [3]
+    payload = next(iter(cache.redis_client.store.values()))[0]
+    assert payload[0] == get_serializer('numpy').codec_id
+
+def test_get_or_compute_single_flight(cache):
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'value'
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute('hot', compute)))
+        for _ in range(5)
+    ]
+    threads[0].start()
+    started.wait(5)
+    for t in threads[1:]:
+        t.start()
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert calls == [1]
+    assert results == ['value'] * 5
+
+def test_get_or_compute_waits_for_distributed_lock_holder(cache):
+    other_process = FakeLock('hot:lock')
+    assert other_process.acquire()
+    timer = threading.Timer(0.05, lambda: cache.redis_client.setex('hot', 60, cache._dumps('remote')))
+    timer.start()
+    try:
+        result = cache.get_or_compute('hot', lambda: 'local', distributed_lock=True, lock_timeout=5)
+    finally:
+        other_process.release()
+        timer.join()
+
+    assert result == 'remote'
+
+def test_lock_winner_rechecks_cache_before_computing(cache, monkeypatch):
+    class LateLock(FakeLock):
+        def acquire(self, blocking=True):
+            # Another process stores the value and releases just before us.
+            cache.redis_client.setex('hot', 60, cache._dumps('remote'))
+            return FakeLock.acquire(self, blocking)
+
+    monkeypatch.setattr(cache.redis_client, 'lock', lambda name, timeout=None: LateLock(name))
+    calls = []
+
+    result = cache.get_or_compute('hot', lambda: calls.append(1) or 'local', distributed_lock=True)
+
+    assert result == 'remote'
+    assert calls == []
+    assert 'hot:lock' not in FakeLock.held
+
+def test_get_or_compute_early_refresh_serves_stale(cache, monkeypatch):
+    cache.get_or_compute('hot', lambda: 'old', early_refresh=1.0)
+    monkeypatch.setattr(CacheManager, '_should_refresh', staticmethod(lambda *args: True))
+    refreshed = threading.Event()
+
+    def compute():
+        refreshed.set()
+        return 'new'
+
+    assert cache.get_or_compute('hot', compute, early_refresh=1.0) == 'old'
+    assert refreshed.wait(5)
+    for _ in range(100):
+        if not cache._inflight:
+            break
+        time.sleep(0.01)
+    assert cache.get('hot') == 'new'
+
+def test_cache_decorator_accepts_dataframes(cache):
+    calls = []
+
+    @cache.cache_decorator('frames')
+    def total(df):
+        calls.append(1)
+        return int(df['a'].sum())
+
+    df = pd.DataFrame({'a': [1, 2, 3]})
+    assert total(df) == 6
+    assert total(df.copy()) == 6
+    assert calls == [1]
@@ -0,0 +1,228 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import pandas as pd
+import pytest
+import requests
+from src.services.data_fetcher import DataFetcher
+from src.services.frame_cache import FrameCache
+from src.services.http_cache import HTTPCache
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+        status, headers, body = self.server.routes(self)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def http_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.requests = []
+    server.url = f'http://127.0.0.1:{server.server_port}'
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def json_body(data, status=200, headers=None):
+    return status, {'Content-Type': 'application/json', **(headers or {})}, json.dumps(data).encode()
+
+def test_fetch_json_data_revalidates_with_last_modified(http_server):
+    stamp = 'Wed, 21 Oct 2015 07:28:00 GMT'
+
+    def routes(request):
+        if request.headers.get('If-Modified-Since') == stamp:
+            return 304, {}, b''
+        return json_body({'value': 1}, headers={'Last-Modified': stamp})
+
+    http_server.routes = routes
+    cache = HTTPCache()
+    fetcher = DataFetcher(http_cache=cache)
+
+    assert fetcher.fetch_json_data(f'{http_server.url}/data', params={'a': 1}) == {'value': 1}
+    assert fetcher.fetch_json_data(f'{http_server.url}/data', params={'a': 1}) == {'value': 1}
+    assert [r[1].get('If-Modified-Since') for r in http_server.requests] == [None, stamp]
+    assert cache.hits == 1
+
+def paged_routes(total, per_page):
+    def routes(request):
+        query = parse_qs(urlsplit(request.path).query)
+        page = int(query['page'][0])
+        start = (page - 1) * per_page
+        return json_body([{'id': i} for i in range(start, min(start + per_page, total))])
+    return routes
+
+@pytest.mark.parametrize('prefetch', [0, 3])
+def test_iter_paginated_data_yields_pages_in_order(http_server, prefetch):
+    http_server.routes = paged_routes(total=25, per_page=4)
+    fetcher = DataFetcher()
+
+    records = list(fetcher.iter_paginated_data(f'{http_server.url}/items', limit=4, prefetch=prefetch))
+
+    assert [r['id'] for r in records] == list(range(25))
+
+def test_fetch_paginated_data_still_returns_list(http_server):
+    http_server.routes = paged_routes(total=5, per_page=2)
+
+    data = DataFetcher().fetch_paginated_data(f'{http_server.url}/items', limit=2, prefetch=2)
+
+    assert data == [{'id': i} for i in range(5)]
+
+def test_iter_paginated_data_follows_cursor(http_server):
+    pages = {None: ([1, 2], 'b'), 'b': ([3], 'c'), 'c': ([], None)}
+
+    def routes(request):
+        cursor = parse_qs(urlsplit(request.path).query).get('after', [None])[0]
+        items, next_cursor = pages[cursor]
+        return json_body({'data': items, 'meta': {'next': next_cursor}})
+
+    http_server.routes = routes
+    records = list(DataFetcher().iter_paginated_data(
+        f'{http_server.url}/items', records_field='data',
+        cursor_param='after', cursor_field='meta.next'
+    ))
+
+    assert records == [1, 2, 3]
+
+def test_iter_paginated_data_follows_next_links(http_server):
+    def routes(request):
+        if request.path.startswith('/items'):
+            return json_body({'results': ['a'], 'next': '/more?token=x'})
+        return json_body({'results': ['b'], 'next': None})
+
+    http_server.routes = routes
+    records = list(DataFetcher().iter_paginated_data(
+        f'{http_server.url}/items', records_field='results', next_field='next'
+    ))
+
+    assert records == ['a', 'b']
+    assert http_server.requests[1][0] == '/more?token=x'
+
+def test_iter_paginated_frames_chunks_rows(http_server):
+    http_server.routes = paged_routes(total=10, per_page=3)
+
+    frames = list(DataFetcher().iter_paginated_frames(
+        f'{http_server.url}/items', chunk_rows=4, limit=3, prefetch=1
+    ))
+
+    assert [len(f) for f in frames] == [4, 4, 2]
+    assert frames[-1]['id'].tolist() == [8, 9]
+
+def test_fetch_bulk_data_isolates_failures(http_server, monkeypatch):
+    monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+
+    def routes(request):
+        if request.path == '/bad':
+            return 404, {}, b''
+        return json_body({'path': request.path})
+
+    http_server.routes = routes
+    urls = [f'{http_server.url}/a', f'{http_server.url}/bad', f'{http_server.url}/b']
+
+    with DataFetcher(max_workers=2) as fetcher:
+        results = fetcher.fetch_bulk_data(urls, return_exceptions=True)
+        with pytest.raises(requests.HTTPError):
+            fetcher.fetch_bulk_data(urls)
+
+    assert results[0] == {'path': '/a'}
+    assert isinstance(results[1], requests.HTTPError)
+    assert results[2] == {'path': '/b'}
+    # Only the failing URL is retried; the others are fetched once per batch.
+    paths = [path for path, _ in http_server.requests]
+    assert paths.count('/bad') == 6
+    assert paths.count('/a') <= 2
+
+def test_iter_bulk_data_yields_as_completed(http_server):
+    release = threading.Event()
+
+    def routes(request):
+        if request.path == '/slow':
+            release.wait(5)
+        return json_body({'path': request.path})
+
+    http_server.routes = routes
+    with DataFetcher(max_workers=2) as fetcher:
+        results = fetcher.iter_bulk_data([f'{http_server.url}/slow', f'{http_server.url}/fast'])
+        first = next(results)
+        release.set()
+        rest = list(results)
+
+    assert first == (1, {'path': '/fast'})
+    assert rest == [(0, {'path': '/slow'})]
+
+def test_iter_pandas_data_streams_csv_through_session(http_server):
+    rows = ''.join(f'{i},{"ab"[i % 2]},{i * 0.5},x\n' for i in range(10))
+    http_server.routes = lambda request: (200, {'Content-Type': 'text/csv'}, ('id,kind,value,extra\n' + rows).encode())
+
+    fetcher = DataFetcher(api_key='secret')
+    chunks = list(fetcher.iter_pandas_data(
+        f'{http_server.url}/data.csv', chunk_rows=4, usecols=['id', 'kind', 'value']
+    ))
+
+    assert [len(c) for c in chunks] == [4, 4, 2]
+    assert list(chunks[0].columns) == ['id', 'kind', 'value']
+    assert chunks[0]['id'].dtype == 'uint8'
+    assert chunks[0]['kind'].dtype == 'category'
+    assert chunks[0]['value'].dtype == 'float64'
+    assert http_server.requests[0][1]['Authorization'] == 'Bearer secret'
+
+def test_iter_pandas_data_streams_json_lines(http_server):
+    body = ''.join(json.dumps({'a': i, 'b': str(i)}) + '\n' for i in range(5)).encode()
+    http_server.routes = lambda request: (200, {}, body)
+
+    chunks = list(DataFetcher().iter_pandas_data(
+        f'{http_server.url}/data.jsonl', format='json', lines=True,
+        chunk_rows=2, usecols=['a'], optimize=False
+    ))
+
+    assert [c['a'].tolist() for c in chunks] == [[0, 1], [2, 3], [4]]
+
+def test_fetch_pandas_data_reads_local_paths(tmp_path):
+    path = tmp_path / 'data.csv'
+    path.write_text('a,b\n1,2\n3,4\n')
+
+    df = DataFetcher().fetch_pandas_data(str(path), dtype={'b': 'float32'})
+
+    assert df['a'].tolist() == [1, 3]
+    assert df['b'].dtype == 'float32'
+    with pytest.raises(ValueError):
+        DataFetcher().fetch_pandas_data(str(path), format='parquet')
+
+def test_fetch_pandas_data_revalidates_frame_cache(http_server, tmp_path):
+    def routes(request):
+        if request.headers.get('If-None-Match') == '"v1"':
+            return 304, {}, b''
+        return 200, {'ETag': '"v1"'}, b'a,b\n1,x\n2,y\n'
+
+    http_server.routes = routes
+    fetcher = DataFetcher(frame_cache=FrameCache(str(tmp_path)))
+
+    first = fetcher.fetch_pandas_data(f'{http_server.url}/data.csv')
+    second = fetcher.fetch_pandas_data(f'{http_server.url}/data.csv')
+
+    pd.testing.assert_frame_equal(first, second)
+    assert [r[1].get('If-None-Match') for r in http_server.requests] == [None, '"v1"']
+    assert fetcher.frame_cache.hits == 1
+
+def test_fetch_paginated_frame_reuses_cached_frame(http_server, tmp_path):
+    http_server.routes = paged_routes(total=5, per_page=2)
+    fetcher = DataFetcher(frame_cache=FrameCache(str(tmp_path), ttl=60))
+
+    first = fetcher.fetch_paginated_frame(f'{http_server.url}/items', limit=2)
+    requests_made = len(http_server.requests)
+    second = fetcher.fetch_paginated_frame(f'{http_server.url}/items', limit=2)
+
+    assert first['id'].tolist() == list(range(5))
+    pd.testing.assert_frame_equal(first, second)
+    assert len(http_server.requests) == requests_made
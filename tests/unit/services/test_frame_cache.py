@@ -0,0 +1,92 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from src.services.frame_cache import FrameCache
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        'value': np.arange(6, dtype=np.float64),
+        'count': np.arange(6, dtype=np.int32),
+        'kind': pd.Categorical(list('ababab')),
+        'name': list('uvwxyz'),
+        'when': pd.date_range('2024-01-01', periods=6)
+    }, index=pd.Index(list('ABCDEF'), name='key'))
+
+def test_round_trip_preserves_frame(tmp_path, frame):
+    cache = FrameCache(str(tmp_path), format='npy')
+    cache.put('k', frame)
+
+    pd.testing.assert_frame_equal(cache.get('k'), frame)
+    assert cache.hits == 1
+    assert cache.get('missing') is None
+
+def test_numeric_columns_are_memory_mapped(tmp_path, frame):
+    cache = FrameCache(str(tmp_path), format='npy')
+    cache.put('k', frame)
+
+    values = cache.get('k')['value'].to_numpy()
+    base = values
+    while getattr(base, 'base', None) is not None and not isinstance(base, np.memmap):
+        base = base.base
+    assert isinstance(base, np.memmap)
+    assert base.mode == 'c'
+
+def test_frames_from_hits_are_writable_without_touching_the_cache(tmp_path, frame):
+    cache = FrameCache(str(tmp_path), format='npy')
+    cache.put('k', frame)
+
+    hit = cache.get('k')
+    hit.loc['A', 'value'] = 9.0
+    hit.loc['B', 'count'] = 7
+    hit.loc['C', 'kind'] = 'b'
+    hit['value'] += 1
+
+    assert hit.loc['A', 'value'] == 10.0
+    assert hit.loc['B', 'count'] == 7
+    pd.testing.assert_frame_equal(cache.get('k'), frame)
+
+def test_entries_without_validators_expire(tmp_path, frame):
+    cache = FrameCache(str(tmp_path), ttl=60)
+    cache.put('plain', frame)
+    cache.put('short', frame, ttl=-1)
+    cache.put('validated', frame, etag='"v1"')
+
+    assert cache.is_fresh(cache.meta('plain'))
+    assert not cache.is_fresh(cache.meta('short'))
+    assert cache.is_fresh(cache.meta('validated'))
+    assert cache.meta('validated')['etag'] == '"v1"'
+
+def test_evicts_least_recently_read(tmp_path, frame):
+    cache = FrameCache(str(tmp_path))
+    for key in ('a', 'b', 'c'):
+        cache.put(key, frame)
+    entry_size = cache.total_bytes() // 3
+    past = time.time() - 100
+    for key, age in (('a', 10), ('b', 20), ('c', 30)):
+        os.utime(os.path.join(cache._path(key), 'meta.pickle'), (past + age, past + age))
+    cache.get('a')
+
+    assert cache.evict(2 * entry_size) == 1
+    assert cache.meta('b') is None
+    assert cache.meta('a') is not None and cache.meta('c') is not None
+    assert cache.evictions == 1
+
+def test_object_columns_count_toward_size_and_stay_out_of_meta(tmp_path):
+    strings = pd.DataFrame({'name': [f'row-{i:06d}' for i in range(20000)]})
+    cache = FrameCache(str(tmp_path), format='npy')
+    cache.put('first', strings)
+    meta = cache.meta('first')
+
+    assert meta['size'] > 100000
+    assert cache.total_bytes() == meta['size']
+    assert 'objects' not in meta and 'index' not in meta
+
+    cache.max_bytes = 2 * meta['size']
+    for key in ('a', 'b', 'c'):
+        cache.put(key, strings)
+    assert cache.evictions == 2
+    assert cache.total_bytes() <= cache.max_bytes
+    pd.testing.assert_frame_equal(cache.get('c'), strings)
@@ -0,0 +1,75 @@
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from src.services.async_client import AsyncClient
+from src.services.cache_manager import CacheManager
+from src.services.http_cache import (
+    CacheManagerHTTPCacheStore,
+    DiskHTTPCacheStore,
+    HTTPCache,
+    MemoryHTTPCacheStore
+)
+from tests.unit.services.fakes import FakeRedis
+
+ENTRY = {'body': b'[1, 2]', 'etag': '"v1"', 'last_modified': None, 'stored_at': 0}
+
+def make_store(kind, tmp_path):
+    if kind == 'memory':
+        return MemoryHTTPCacheStore()
+    if kind == 'disk':
+        return DiskHTTPCacheStore(str(tmp_path))
+    manager = CacheManager('redis://localhost:6379')
+    manager.redis_client = FakeRedis()
+    return CacheManagerHTTPCacheStore(manager, ttl=60)
+
+@pytest.mark.parametrize('kind', ['memory', 'disk', 'cache_manager'])
+def test_stores_roundtrip(kind, tmp_path):
+    store = make_store(kind, tmp_path)
+
+    assert store.get('k') is None
+    store.set('k', ENTRY)
+    assert store.get('k') == ENTRY
+    store.delete('k')
+    assert store.get('k') is None
+
+def test_key_and_conditional_headers():
+    assert HTTPCache.key('http://x/a', {'b': 2, 'a': 1}) == HTTPCache.key('http://x/a', [('a', 1), ('b', 2)])
+    assert HTTPCache.conditional_headers(None) == {}
+    headers = HTTPCache.conditional_headers({'etag': '"v1"', 'last_modified': 'Wed, 21 Oct 2015 07:28:00 GMT'})
+    assert headers == {'If-None-Match': '"v1"', 'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT'}
+
+def test_responses_without_validators_are_not_stored():
+    cache = HTTPCache()
+    cache.store_response('k', b'[]', {})
+    cache.store_response('n', b'[]', {'ETag': '"v"', 'Cache-Control': 'no-store'})
+    assert cache.lookup('k') is None
+    assert cache.lookup('n') is None
+
+@pytest_asyncio.fixture
+async def etag_server():
+    seen = []
+
+    async def handler(request):
+        seen.append(request.headers.get('If-None-Match'))
+        if request.headers.get('If-None-Match') == '"v1"':
+            return web.Response(status=304)
+        return web.json_response({'items': [1, 2]}, headers={'ETag': '"v1"'})
+
+    app = web.Application()
+    app.router.add_get('/items', handler)
+    async with TestServer(app) as server:
+        server.seen = seen
+        yield server
+
+@pytest.mark.asyncio
+async def test_async_client_revalidates_with_etag(etag_server):
+    cache = HTTPCache()
+    async with AsyncClient(str(etag_server.make_url('')), http_cache=cache) as client:
+        first = await client.get('/items')
+        first['items'].append(3)
+        second = await client.get('/items')
+
+    assert second == {'items': [1, 2]}
+    assert etag_server.seen == [None, '"v1"']
+    assert (cache.hits, cache.misses) == (1, 1)
@@ -0,0 +1,39 @@
+import pytest
+from src.services.pagination import Paginator, field
+
+def test_field_follows_dotted_paths():
+    page = {'data': {'items': [1, 2]}, 'next': None}
+
+    assert field(page, 'data.items') == [1, 2]
+    assert field(page, 'next.cursor') is None
+    assert field([1], None) == [1]
+
+def test_numbered_page_requests():
+    paginator = Paginator('https://api/items', limit=10, params={'q': 'x'}, start_page=3)
+
+    assert not paginator.linked
+    assert paginator.page_request(4) == ('https://api/items', {'q': 'x', 'page': 4, 'limit': 10})
+
+def test_cursor_stops_on_missing_or_repeated_cursor():
+    paginator = Paginator('https://api/items', limit=2, cursor_param='after', cursor_field='meta.cursor')
+    url, query = paginator.first_request()
+
+    assert query == {'limit': 2}
+    assert paginator.follow({'meta': {'cursor': 'c1'}}, url) == (url, {'limit': 2, 'after': 'c1'})
+    assert paginator.follow({'meta': {'cursor': 'c1'}}, url) is None
+    assert paginator.follow({'meta': {}}, url) is None
+
+def test_next_links_resolve_against_the_current_url():
+    paginator = Paginator('https://api/v1/items', next_field='links.next')
+    url, _ = paginator.first_request()
+
+    assert paginator.follow({'links': {'next': '/v1/items?page=2'}}, url) == (
+        'https://api/v1/items?page=2', None
+    )
+    assert paginator.follow({'links': {'next': ''}}, url) is None
+
+def test_invalid_options():
+    with pytest.raises(ValueError):
+        Paginator('https://api/items', cursor_field='cursor')
+    with pytest.raises(ValueError):
+        Paginator('https://api/items', prefetch=-1)
@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+from src.services.rate_limiter import RateLimiter, TokenBucket
+
+def test_token_bucket_burst_then_paced():
+    bucket = TokenBucket(rate=10, capacity=3)
+
+    waits = [bucket.reserve() for _ in range(5)]
+
+    assert waits[:3] == [0, 0, 0]
+    assert waits[3] == pytest.approx(0.1, abs=0.01)
+    assert waits[4] == pytest.approx(0.2, abs=0.01)
+
+def test_token_bucket_pause_delays_tokens():
+    bucket = TokenBucket(rate=100, capacity=1)
+    bucket.pause(0.5)
+
+    assert bucket.reserve() == pytest.approx(0.5, abs=0.01)
+
+@pytest.mark.asyncio
+async def test_acquire_async_paces_requests():
+    bucket = TokenBucket(rate=50, capacity=1)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    await asyncio.gather(*(bucket.acquire_async() for _ in range(6)))
+
+    assert loop.time() - start >= 0.09
+
+def test_rate_limiter_per_host_limits():
+    limiter = RateLimiter(limits={'api.example.com': (5, 2)})
+
+    assert limiter.bucket_for('https://other.example.com/x') is None
+    bucket = limiter.bucket_for('https://api.example.com/a')
+    assert bucket is limiter.bucket_for('https://api.example.com/b?page=2')
+    assert (bucket.rate, bucket.capacity) == (5, 2)
+
+def test_rate_limiter_adapts_to_429_and_recovers():
+    limiter = RateLimiter(default_rate=10, recovery=0.5)
+    url = 'https://api.example.com/items'
+    bucket = limiter.bucket_for(url)
+
+    limiter.on_response(url, 429, retry_after=1)
+    assert bucket.rate == 5
+    assert bucket.reserve() >= 0.9
+
+    limiter.on_response(url, 200)
+    limiter.on_response(url, 200)
+    assert limiter.stats()['api.example.com']['rate'] == 10
+
+@pytest.mark.asyncio
+async def test_burst_of_429s_decreases_rate_once_per_window(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr('src.services.rate_limiter.time.monotonic', lambda: now[0])
+    limiter = RateLimiter(default_rate=100, decrease_cooldown=1.0)
+    url = 'https://api.example.com/items'
+    bucket = limiter.bucket_for(url)
+
+    async def respond():
+        await asyncio.sleep(0)
+        limiter.on_response(url, 429)
+
+    await asyncio.gather(*(respond() for _ in range(20)))
+    assert bucket.rate == 50
+
+    now[0] += 1.0
+    limiter.on_response(url, 429, retry_after=3)
+    now[0] += 2.0
+    limiter.on_response(url, 429)
+    assert bucket.rate == 25
+    now[0] += 1.0
+    limiter.on_response(url, 429)
+    assert bucket.rate == 12.5
@@ -0,0 +1,47 @@
+import pickle
+import numpy as np
+import pandas as pd
+import pytest
+from src.services import serializers
+from src.services.serializers import COMPRESSED, get_serializer
+
+def test_numpy_roundtrip():
+    arr = np.arange(12, dtype=np.float32).reshape(3, 4)[:, ::2]
+    payload = serializers.dumps(arr, 'numpy')
+
+    assert payload[0] == get_serializer('numpy').codec_id
+    result = serializers.loads(payload)
+    assert result.dtype == np.float32
+    assert np.array_equal(result, arr)
+    assert result.flags.writeable
+
+def test_pickle5_roundtrip_dataframe():
+    df = pd.DataFrame({'a': np.arange(1000), 'b': np.random.randn(1000), 'c': ['x'] * 1000})
+    result = serializers.loads(serializers.dumps(df, 'pickle5'))
+
+    pd.testing.assert_frame_equal(result, df)
+
+def test_auto_selects_fast_paths():
+    assert get_serializer('auto', np.zeros(3)).name == 'numpy'
+    assert get_serializer('auto', np.array(['a', None], dtype=object)).name == 'pickle5'
+    assert get_serializer('auto', pd.DataFrame({'a': [1]})).name == 'pickle5'
+    assert get_serializer('auto', {'a': 1}).name == 'pickle'
+
+def test_compression_above_threshold():
+    value = {'data': 'x' * 10000}
+    small = serializers.dumps({'a': 1}, compress_threshold=1000)
+    large = serializers.dumps(value, compress_threshold=1000)
+
+    assert not small[0] & COMPRESSED
+    assert large[0] & COMPRESSED
+    assert len(large) < 1000
+    assert serializers.loads(large) == value
+
+def test_legacy_pickle_payloads_still_decode():
+    assert serializers.loads(pickle.dumps({'a': 1})) == {'a': 1}
+
+def test_unknown_header_and_serializer():
+    with pytest.raises(ValueError):
+        serializers.loads(b'\x3f')
+    with pytest.raises(ValueError):
+        serializers.dumps(1, 'invalid')